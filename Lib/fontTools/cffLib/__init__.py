@@ -23,6 +23,7 @@ from fontTools.misc.textTools import (
     safeEval,
 )
 from fontTools.ttLib import TTFont
+from fontTools.ttLib.fontMetrics import getFontMetrics
 from fontTools.ttLib.tables.otBase import OTTableWriter
 from fontTools.ttLib.tables.otBase import OTTableReader
 from fontTools.ttLib.tables import otTables as ot
@@ -161,8 +162,9 @@ class CFFFontSet(object):
             isCFF2 = self.major == 2
 
         if otFont.recalcBBoxes and not isCFF2:
+            fontMetrics = getFontMetrics(otFont)
             for topDict in self.topDictIndex:
-                topDict.recalcFontBBox()
+                topDict.recalcFontBBox(fontMetrics)
 
         if not isCFF2:
             strings = IndexedStrings()
@@ -323,6 +325,11 @@ class CFFFontSet(object):
 
         remove_unused_subroutines(self)
 
+    def subroutinize(self, **kwargs):
+        from .subroutinizer import subroutinize
+
+        subroutinize(self, **kwargs)
+
 
 class CFFWriter(object):
     """Helper class for serializing CFF data to binary. Used by
@@ -550,9 +557,14 @@ class GlobalSubrsCompiler(IndexCompiler):
 
     def getItems(self, items, strings):
         out = []
-        for cs in items:
-            cs.compile(self.isCFF2)
-            out.append(cs.bytecode)
+        for i in range(len(items)):
+            # Subroutines that were never loaded are copied from the source data.
+            data = items.getItemData(i)
+            if data is None:
+                cs = items[i]
+                cs.compile(self.isCFF2)
+                data = cs.bytecode
+            out.append(data)
         return out
 
 
@@ -572,6 +584,10 @@ class CharStringsCompiler(GlobalSubrsCompiler):
     def getItems(self, items, strings):
         out = []
         for cs in items:
+            if isinstance(cs, bytes):
+                # charstring that was never loaded, see TopDictCompiler
+                out.append(cs)
+                continue
             cs.compile(self.isCFF2)
             out.append(cs.bytecode)
         return out
@@ -633,6 +649,20 @@ class Index(object):
         self.items[index] = item
         return item
 
+    def getItemData(self, index):
+        """Return the binary data of an item as read from the file, without
+        producing the item, or None if the item was already loaded (and may
+        have been modified since) or the INDEX was not read from a file."""
+        if self.items[index] is not None or not hasattr(self, "file"):
+            return None
+        offset = self.offsets[index] + self.offsetBase
+        size = self.offsets[index + 1] - self.offsets[index]
+        file = self.file
+        file.seek(offset)
+        data = file.read(size)
+        assert len(data) == size
+        return data
+
     def __setitem__(self, index, item):
         self.items[index] = item
 
@@ -1053,6 +1083,13 @@ class CharStrings(object):
         else:
             self.charStrings[name] = charString
 
+    def getItemData(self, name):
+        """Return the bytecode of a charstring as read from the file, if the
+        charstring was never loaded; otherwise, return None."""
+        if self.charStringsAreIndexed:
+            return self.charStringsIndex.getItemData(self.charStrings[name])
+        return None
+
     def getItemAndSelector(self, name):
         if self.charStringsAreIndexed:
             index = self.charStrings[name]
@@ -2388,7 +2425,8 @@ class TopDictCompiler(DictCompiler):
             items = []
             charStrings = self.dictObj.CharStrings
             for name in self.dictObj.charset:
-                items.append(charStrings[name])
+                data = charStrings.getItemData(name)
+                items.append(charStrings[name] if data is None else data)
             charStringsComp = CharStringsCompiler(items, strings, self, isCFF2=isCFF2)
             children.append(charStringsComp)
         if hasattr(self.dictObj, "FDArray"):
@@ -2633,15 +2671,24 @@ class TopDict(BaseDict):
                 log.error("Error in charstring %s", i)
                 raise
 
-    def recalcFontBBox(self):
-        fontBBox = None
-        for charString in self.CharStrings.values():
-            bounds = charString.calcBounds(self.CharStrings)
-            if bounds is not None:
-                if fontBBox is not None:
-                    fontBBox = unionRect(fontBBox, bounds)
-                else:
-                    fontBBox = bounds
+    def recalcFontBBox(self, fontMetrics=None):
+        """Recalculate the FontBBox from the bounds of the CharStrings.
+
+        If ``fontMetrics`` is a :class:`fontTools.ttLib.fontMetrics.FontMetrics`
+        of the font of these CharStrings, the bounds are taken from it, and
+        shared with the other tables of the font.
+        """
+        if fontMetrics is not None and fontMetrics.charStrings is self.CharStrings:
+            fontBBox = fontMetrics.fontBounds()
+        else:
+            fontBBox = None
+            for charString in self.CharStrings.values():
+                bounds = charString.calcBounds(self.CharStrings)
+                if bounds is not None:
+                    if fontBBox is not None:
+                        fontBBox = unionRect(fontBBox, bounds)
+                    else:
+                        fontBBox = bounds
 
         if fontBBox is None:
             self.FontBBox = self.defaults["FontBBox"][:]
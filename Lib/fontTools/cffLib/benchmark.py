@@ -0,0 +1,98 @@
+"""Benchmark the performance of CFF/CFF2 charstring processing.
+
+Usage: python -m fontTools.cffLib.benchmark FONT.otf [REPEAT]
+"""
+
+from fontTools.cffLib import maxStackLimit
+from fontTools.cffLib import specializer
+from fontTools.cffLib.specializer import (
+    generalizeCommands,
+    programToCommands,
+    specializeCommands,
+)
+from fontTools.misc.psCharStrings import COMPILED
+from fontTools.pens.basePen import NullPen
+from fontTools.ttLib import TTFont
+import sys
+import timeit
+
+
+def setup_cff(path):
+    font = TTFont(path)
+    tableTag = "CFF2" if "CFF2" in font else "CFF "
+    return font[tableTag].cff
+
+
+def setup_charstrings(path):
+    charStrings = setup_cff(path).topDictIndex[0].CharStrings
+    # Load all charstrings up front, still as bytecode, so that only the
+    # interpretation of the programs is measured.
+    return [charStrings[glyphName] for glyphName in charStrings.keys()]
+
+
+def setup_commands(path):
+    cff = setup_cff(path)
+    charStrings = cff.topDictIndex[0].CharStrings
+    commandsList = []
+    for glyphName in charStrings.keys():
+        charString = charStrings[glyphName]
+        charString.decompile()
+        commands = programToCommands(
+            charString.program, getNumRegions=charString.private.getNumRegions
+        )
+        commandsList.append(generalizeCommands(commands))
+    # Same stack limits as T2CharStringPen and varLib use when building.
+    maxstack = maxStackLimit if cff.major > 1 else 48
+    return commandsList, maxstack
+
+
+def decompile_charstrings(charStrings):
+    for charString in charStrings:
+        charString.decompile()
+
+
+def draw_charstrings(charStrings):
+    pen = NullPen()
+    for charString in charStrings:
+        charString.draw(pen)
+
+
+def specialize_commands(data):
+    commandsList, maxstack = data
+    for commands in commandsList:
+        specializeCommands(commands, generalizeFirst=False, maxstack=maxstack)
+
+
+def subroutinize_cff(cff):
+    cff.subroutinize()
+
+
+def run_benchmark(path, function, setup, repeat=5):
+    print("%s:" % function, end="")
+    function = globals()[function]
+    setup = globals()["setup_" + setup]
+    results = []
+    for _ in range(repeat):
+        data = setup(path)
+        results.append(timeit.timeit(lambda: function(data), number=1))
+    print("\t%8.1fms" % (min(results) * 1000.0))
+
+
+def main(args=None):
+    if args is None:
+        args = sys.argv[1:]
+    if not args:
+        print(__doc__, file=sys.stderr)
+        return 2
+    path = args[0]
+    repeat = int(args[1]) if len(args) > 1 else 5
+    print("psCharStrings compiled: %s" % COMPILED)
+    print("specializer compiled: %s" % specializer.COMPILED)
+    run_benchmark(path, "decompile_charstrings", "charstrings", repeat)
+    run_benchmark(path, "draw_charstrings", "charstrings", repeat)
+    run_benchmark(path, "specialize_commands", "commands", repeat)
+    run_benchmark(path, "subroutinize_cff", "cff", repeat)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -13,7 +13,16 @@ and specific forms of the operation.
 
 """
 
+try:
+    import cython
+except (AttributeError, ImportError):
+    # if cython not installed, use mock module with no-op decorators and types
+    from fontTools.misc import cython
+COMPILED = cython.compiled
+
 from fontTools.cffLib import maxStackLimit
+from itertools import chain
+from operator import itemgetter
 
 
 def stringToProgram(string):
@@ -144,8 +153,10 @@ def commandsToProgram(commands):
     it back to a T2CharString program list."""
     program = []
     for op, args in commands:
-        if any(isinstance(arg, list) for arg in args):
-            args = _flattenBlendArgs(args)
+        for arg in args:
+            if isinstance(arg, list):
+                args = _flattenBlendArgs(args)
+                break
         program.extend(args)
         if op:
             program.append(op)
@@ -576,6 +587,9 @@ def specializeCommands(
     else:
         commands = list(commands)  # Make copy since we modify in-place later.
 
+    argTypes = set(map(type, chain.from_iterable(map(itemgetter(1), commands))))
+    hasBlends = any(issubclass(t, list) for t in argTypes)
+
     # 1. Combine successive rmoveto operations.
     for i in range(len(commands) - 1, 0, -1):
         if "rmoveto" == commands[i][0] == commands[i - 1][0]:
@@ -632,17 +646,42 @@ def specializeCommands(
     # only hvcurveto and vhcurveto operators can encode a spline ending with 'r'.
     # This limits our merge opportunities later.
     #
+    # This is the hottest loop when building whole fonts, so _categorizeVector
+    # is inlined here.
     for i in range(len(commands)):
         op, args = commands[i]
 
-        if op in {"rmoveto", "rlineto"}:
-            c, args = _categorizeVector(args)
-            commands[i] = c + op[1:], args
+        if op == "rlineto" or op == "rmoveto":
+            if args[0]:
+                if args[1]:
+                    commands[i] = "r" + op[1:], args
+                else:
+                    commands[i] = "h" + op[1:], args[:1]
+            elif args[1]:
+                commands[i] = "v" + op[1:], args[1:]
+            else:
+                commands[i] = "0" + op[1:], args[:1]
             continue
 
         if op == "rrcurveto":
-            c1, args1 = _categorizeVector(args[:2])
-            c2, args2 = _categorizeVector(args[-2:])
+            if args[0]:
+                if args[1]:
+                    c1, args1 = "r", args[:2]
+                else:
+                    c1, args1 = "h", args[:1]
+            elif args[1]:
+                c1, args1 = "v", args[1:2]
+            else:
+                c1, args1 = "0", args[:1]
+            if args[-2]:
+                if args[-1]:
+                    c2, args2 = "r", args[-2:]
+                else:
+                    c2, args2 = "h", args[-2:-1]
+            elif args[-1]:
+                c2, args2 = "v", args[-1:]
+            else:
+                c2, args2 = "0", args[-2:-1]
             commands[i] = c1 + c2 + "curveto", args1 + args[2:4] + args2
             continue
 
@@ -727,10 +766,17 @@ def specializeCommands(
             continue
 
     # 5. Combine adjacent operators when possible, minding not to go over max stack size.
-    stackUse = _argsStackUse(commands[-1][1]) if commands else 0
+    #
+    # Without blends, the stack use of an argument list is just its length.
+    argsStackUse = _argsStackUse if hasBlends else len
+    # Commands are merged back-to-front into a new list, rather than deleted from
+    # the middle of the existing one.
+    merged = []
+    if commands:
+        op2, args2 = commands[-1]
+        stackUse = argsStackUse(args2)
     for i in range(len(commands) - 1, 0, -1):
         op1, args1 = commands[i - 1]
-        op2, args2 = commands[i]
         new_op = None
 
         # Merge logic...
@@ -755,37 +801,51 @@ def specializeCommands(
             d2, d3 = op2[:2]
 
             if d1 == "r" or d2 == "r" or d0 == d3 == "r":
-                continue
-
-            d = _mergeCategories(d1, d2)
-            if d is None:
-                continue
-            if d0 == "r":
-                d = _mergeCategories(d, d3)
-                if d is None:
-                    continue
-                new_op = "r" + d + "curveto"
-            elif d3 == "r":
-                d0 = _mergeCategories(d0, _negateCategory(d))
-                if d0 is None:
-                    continue
-                new_op = d0 + "r" + "curveto"
+                new_op = False
             else:
-                d0 = _mergeCategories(d0, d3)
-                if d0 is None:
-                    continue
-                new_op = d0 + d + "curveto"
+                d = _mergeCategories(d1, d2)
+                if d is None:
+                    new_op = False
+                elif d0 == "r":
+                    d = _mergeCategories(d, d3)
+                    if d is None:
+                        new_op = False
+                    else:
+                        new_op = "r" + d + "curveto"
+                elif d3 == "r":
+                    d0 = _mergeCategories(d0, _negateCategory(d))
+                    if d0 is None:
+                        new_op = False
+                    else:
+                        new_op = d0 + "r" + "curveto"
+                else:
+                    d0 = _mergeCategories(d0, d3)
+                    if d0 is None:
+                        new_op = False
+                    else:
+                        new_op = d0 + d + "curveto"
+
+        if new_op is False:
+            # Curves that cannot be merged leave the stack use untouched.
+            merged.append((op2, args2))
+            op2, args2 = op1, args1
+            continue
 
         # Make sure the stack depth does not exceed (maxstack - 1), so
         # that subroutinizer can insert subroutine calls at any point.
-        args1StackUse = _argsStackUse(args1)
+        args1StackUse = argsStackUse(args1)
         combinedStackUse = max(args1StackUse, len(args1) + stackUse)
         if new_op and combinedStackUse < maxstack:
-            commands[i - 1] = (new_op, args1 + args2)
-            del commands[i]
+            op2, args2 = new_op, args1 + args2
             stackUse = combinedStackUse
         else:
+            merged.append((op2, args2))
+            op2, args2 = op1, args1
             stackUse = args1StackUse
+    if commands:
+        merged.append((op2, args2))
+        merged.reverse()
+    commands = merged
 
     # 6. Resolve any remaining made-up operators into real operators.
     for i in range(len(commands)):
@@ -825,10 +885,11 @@ def specializeCommands(
             continue
 
     # 7. For any series of args which are blend lists, convert the series to a single blend arg.
-    for i in range(len(commands)):
-        op, args = commands[i]
-        if any(isinstance(arg, list) for arg in args):
-            commands[i] = op, _convertToBlendCmds(args)
+    if hasBlends:
+        for i in range(len(commands)):
+            op, args = commands[i]
+            if any(isinstance(arg, list) for arg in args):
+                commands[i] = op, _convertToBlendCmds(args)
 
     return commands
 
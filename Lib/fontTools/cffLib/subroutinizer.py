@@ -0,0 +1,431 @@
+"""T2CharString subroutinizer.
+
+Moves sequences of charstring operations that are repeated across the glyphs
+of a CFF or CFF2 font into subroutines, to reduce the size of the font.
+
+The charstrings are first desubroutinized, and split into *units*: runs of
+operands terminated by a stack-clearing operator (``blend`` doesn't clear the
+stack, so its results stay in the same unit as the operator consuming them).
+Since units start and end with an empty argument stack, calling a subroutine
+made of whole units never overflows the stack, nor changes which operator
+consumes which argument.
+
+Repeated runs of units are found with a suffix array over the units of all
+glyphs. The most promising repeats become candidate subroutines, and each
+glyph is then encoded with the cheapest combination of subroutine calls,
+using dynamic programming. Subroutines used by glyphs of a single Font DICT
+go to that Font DICT's local subroutines, the others to the global ones.
+Finally, subroutines are themselves encoded using shorter subroutines, within
+the nesting depth limit.
+
+Hints (including hint masks, whose length depends on the stems defined so
+far), ``endchar``, ``vsindex`` and the arithmetic operators are never moved
+into subroutines.
+"""
+
+from fontTools.misc.psCharStrings import (
+    T2CharString,
+    calcSubrBias,
+    encodeFixed,
+    encodeIntT2,
+)
+from fontTools.cffLib.transforms import desubroutinize
+import logging
+
+__all__ = ["subroutinize"]
+
+
+log = logging.getLogger(__name__)
+
+
+# Operators that can be moved into a subroutine. They all clear the stack.
+_pathOperators = frozenset(
+    [
+        "rmoveto",
+        "hmoveto",
+        "vmoveto",
+        "rlineto",
+        "hlineto",
+        "vlineto",
+        "rrcurveto",
+        "hhcurveto",
+        "vvcurveto",
+        "hvcurveto",
+        "vhcurveto",
+        "rcurveline",
+        "rlinecurve",
+        "flex",
+        "hflex",
+        "flex1",
+        "hflex1",
+    ]
+)
+
+# The subroutine nesting limit of the Type 2 charstring format.
+MAX_NESTING = 10
+
+# Maximum number of subroutines in a subroutine INDEX that can be called.
+MAX_SUBRS = 65535
+
+# Estimated cost, in bytes, of a subroutine call before subroutines are numbered:
+# the operator, plus a two-byte subroutine number.
+_CALL_COST_ESTIMATE = 3
+
+# Cost, in bytes, of an entry in a subroutine INDEX: its offset.
+_INDEX_ENTRY_COST = 2
+
+
+def _programToUnits(program):
+    units = []
+    unit = []
+    i = 0
+    end = len(program)
+    while i < end:
+        token = program[i]
+        i += 1
+        unit.append(token)
+        if isinstance(token, str):
+            if token in ("hintmask", "cntrmask"):
+                unit.append(program[i])
+                i += 1
+            if token != "blend":
+                units.append(tuple(unit))
+                unit = []
+    if unit:
+        # CFF2 charstrings may end with operands on the stack
+        units.append(tuple(unit))
+    return units
+
+
+def _isMovableUnit(unit):
+    if unit[-1] not in _pathOperators:
+        return False
+    for token in unit[:-1]:
+        if isinstance(token, str) and token != "blend":
+            return False
+    return True
+
+
+def _unitCost(unit, opcodes):
+    cost = 0
+    for token in unit:
+        if isinstance(token, str):
+            cost += len(opcodes[token])
+        elif isinstance(token, int):
+            cost += len(encodeIntT2(token))
+        elif isinstance(token, float):
+            cost += len(encodeFixed(token))
+        else:
+            cost += len(token)  # hint mask
+    return cost
+
+
+def _numberCost(value):
+    return len(encodeIntT2(value))
+
+
+def _suffixArray(seq):
+    """Return the suffix array of the integer sequence, and its inverse,
+    using prefix doubling."""
+    n = len(seq)
+    rankOf = {v: i for i, v in enumerate(sorted(set(seq)))}
+    rank = [rankOf[v] for v in seq]
+    sa = sorted(range(n), key=rank.__getitem__)
+    k = 1
+    while n:
+        second = rank[k:] + [-1] * min(k, n)
+        sa.sort(key=lambda i: (rank[i], second[i]))
+        newRank = [0] * n
+        r = 0
+        last = sa[0]
+        for i in sa:
+            if rank[i] != rank[last] or second[i] != second[last]:
+                r += 1
+            newRank[i] = r
+            last = i
+        rank = newRank
+        if r == n - 1:
+            break
+        k *= 2
+    return sa, rank
+
+
+def _lcpArray(seq, sa, rank):
+    """Return the longest-common-prefix array (Kasai's algorithm):
+    lcp[i] is the length of the common prefix of suffixes sa[i-1] and sa[i]."""
+    n = len(seq)
+    lcp = [0] * n
+    h = 0
+    for i in range(n):
+        r = rank[i]
+        if r == 0:
+            h = 0
+            continue
+        j = sa[r - 1]
+        while i + h < n and j + h < n and seq[i + h] == seq[j + h]:
+            h += 1
+        lcp[r] = h
+        if h:
+            h -= 1
+    return lcp
+
+
+def _repeats(seq):
+    """Yield (start, length, count) for each repeated substring of seq that is
+    not always followed by the same element (the LCP intervals)."""
+    sa, rank = _suffixArray(seq)
+    lcp = _lcpArray(seq, sa, rank)
+    n = len(seq)
+    stack = [(0, 0)]
+    for i in range(1, n + 1):
+        h = lcp[i] if i < n else 0
+        lb = i - 1
+        while h < stack[-1][0]:
+            length, lb = stack.pop()
+            yield sa[lb], length, i - lb
+        if h > stack[-1][0]:
+            stack.append((h, lb))
+
+
+class _Subroutine(object):
+    def __init__(self, key, cost):
+        self.key = key  # tuple of unit ids
+        self.cost = cost  # bytes of the subroutinized program
+        self.usage = 0
+        self.fontDicts = set()
+        self.isGlobal = False
+        self.index = None
+        self.callCost = _CALL_COST_ESTIMATE
+        self.height = 1
+        self.encoding = None
+
+
+def _encode(ids, unitCosts, matches, accept=None):
+    """Return the cheapest encoding of the sequence of unit ids, as a list of
+    unit ids and subroutines to call."""
+    n = len(ids)
+    costs = [0] * (n + 1)
+    choices = [None] * n
+    for i in range(n - 1, -1, -1):
+        uid = ids[i]
+        best = costs[i + 1] + (unitCosts[uid] if uid >= 0 else 0)
+        choice = None
+        for length, key, subr in matches.get(uid, ()):
+            j = i + length
+            if j > n or ids[i:j] != key:
+                continue
+            if accept is not None and not accept(subr):
+                continue
+            cost = costs[j] + subr.callCost
+            if cost < best:
+                best = cost
+                choice = subr
+        costs[i] = best
+        choices[i] = choice
+    encoding = []
+    i = 0
+    while i < n:
+        subr = choices[i]
+        if subr is None:
+            encoding.append(ids[i])
+            i += 1
+        else:
+            encoding.append(subr)
+            i += len(subr.key)
+    return encoding
+
+
+def _buildMatches(subrs):
+    matches = {}
+    for subr in subrs:
+        key = subr.key
+        matches.setdefault(key[0], []).append((len(key), key, subr))
+    return matches
+
+
+def _numberSubroutines(subrs):
+    """Sort subroutines by usage, so that the most used get the cheapest numbers,
+    and update their call cost."""
+    subrs.sort(key=lambda subr: (-subr.usage, subr.key))
+    bias = calcSubrBias(subrs)
+    for i, subr in enumerate(subrs):
+        subr.index = i
+        subr.callCost = 1 + _numberCost(i - bias)
+    return subrs
+
+
+def _poolSubroutines(subrs):
+    """Group subroutines by the Font DICT whose local subroutines they belong to,
+    or None for global subroutines."""
+    pools = {}
+    for subr in subrs:
+        fontDictKey = None if subr.isGlobal else next(iter(subr.fontDicts))
+        pools.setdefault(fontDictKey, []).append(subr)
+    return pools
+
+
+def subroutinize(cff, *, maxNesting=MAX_NESTING, maxSubrs=MAX_SUBRS):
+    """Subroutinize all the charstrings of a CFF or CFF2 font set in-place.
+
+    Any existing subroutines are expanded first. ``maxNesting`` limits the
+    depth of nested subroutine calls, and ``maxSubrs`` the total number of
+    subroutines created.
+    """
+    desubroutinize(cff)
+    isCFF2 = cff.major > 1
+    opcodes = T2CharString.opcodes
+    returnCost = 0 if isCFF2 else len(opcodes["return"])
+    subrOverhead = returnCost + _INDEX_ENTRY_COST
+
+    # Split all charstrings into units, and number the movable ones;
+    # unmovable units and glyph ends get unique negative numbers, so that they
+    # never take part in any repeat.
+    unitIds = {}
+    units = []
+    unitCosts = []
+    unmovableUnits = {}
+    glyphs = []  # (charString, fontDictKey, ids)
+    privates = {}
+    seq = []
+    unique = -1
+    for fontName in cff.fontNames:
+        charStrings = cff[fontName].CharStrings
+        for glyphName in charStrings.keys():
+            cs = charStrings[glyphName]
+            privates[id(cs.private)] = cs.private
+            ids = []
+            for unit in _programToUnits(cs.program):
+                if _isMovableUnit(unit):
+                    uid = unitIds.get(unit)
+                    if uid is None:
+                        uid = unitIds[unit] = len(units)
+                        units.append(unit)
+                        unitCosts.append(_unitCost(unit, opcodes))
+                else:
+                    uid = unique
+                    unique -= 1
+                    unmovableUnits[uid] = unit
+                ids.append(uid)
+            glyphs.append((cs, id(cs.private), tuple(ids)))
+            seq.extend(ids)
+            seq.append(unique)
+            unique -= 1
+    if not units:
+        return
+
+    # Candidate subroutines, from the repeats with the best estimated savings.
+    candidates = []
+    for start, length, count in _repeats(seq):
+        key = tuple(seq[start : start + length])
+        cost = sum(unitCosts[uid] for uid in key)
+        savings = (count - 1) * cost - count * _CALL_COST_ESTIMATE - subrOverhead
+        if savings > 0:
+            candidates.append((savings, key, cost))
+    candidates.sort(key=lambda c: c[0], reverse=True)
+    subrs = [_Subroutine(key, cost) for _, key, cost in candidates[:maxSubrs]]
+    del seq, candidates
+
+    # Encode the glyphs, and drop the subroutines that don't pay for themselves,
+    # until only profitable ones remain. The first pass uses estimated call
+    # costs, so always do a second one with the actual subroutine numbers.
+    firstPass = True
+    while subrs:
+        matches = _buildMatches(subrs)
+        for subr in subrs:
+            subr.usage = 0
+            subr.fontDicts.clear()
+        glyphEncodings = []
+        for cs, fontDictKey, ids in glyphs:
+            encoding = _encode(ids, unitCosts, matches)
+            for item in encoding:
+                if isinstance(item, _Subroutine):
+                    item.usage += 1
+                    item.fontDicts.add(fontDictKey)
+            glyphEncodings.append(encoding)
+        kept = [
+            subr
+            for subr in subrs
+            if subr.usage * (subr.cost - subr.callCost) > subr.cost + subrOverhead
+        ]
+        # Subroutines used by the glyphs of a single Font DICT go to its local
+        # subroutines, the others to the global subroutines.
+        for subr in kept:
+            subr.isGlobal = len(subr.fontDicts) > 1
+        for pool in _poolSubroutines(kept).values():
+            _numberSubroutines(pool)
+        if len(kept) == len(subrs) and not firstPass:
+            break
+        subrs = kept
+        firstPass = False
+    if not subrs:
+        return
+
+    # Encode the subroutines themselves using shorter ones. Global subroutines
+    # can only call other global subroutines, since which local subroutines
+    # are called depends on the calling glyph's Font DICT.
+    subrs.sort(key=lambda subr: len(subr.key))
+    matches = {}
+    for subr in subrs:
+
+        def accept(callee, subr=subr):
+            if callee.height >= maxNesting:
+                return False
+            if callee.isGlobal:
+                return True
+            return not subr.isGlobal and callee.fontDicts == subr.fontDicts
+
+        subr.encoding = _encode(subr.key, unitCosts, matches, accept)
+        for item in subr.encoding:
+            if isinstance(item, _Subroutine):
+                item.usage += 1
+                subr.height = max(subr.height, item.height + 1)
+        key = subr.key
+        matches.setdefault(key[0], []).append((len(key), key, subr))
+
+    pools = _poolSubroutines(subrs)
+    for pool in pools.values():
+        _numberSubroutines(pool)
+    biases = {fontDictKey: calcSubrBias(pool) for fontDictKey, pool in pools.items()}
+
+    def toProgram(encoding, fontDictKey):
+        program = []
+        for item in encoding:
+            if isinstance(item, _Subroutine):
+                if item.isGlobal:
+                    program.extend([item.index - biases[None], "callgsubr"])
+                else:
+                    program.extend([item.index - biases[fontDictKey], "callsubr"])
+            elif item >= 0:
+                program.extend(units[item])
+            else:
+                program.extend(unmovableUnits[item])
+        return program
+
+    from fontTools.cffLib import SubrsIndex
+
+    for (cs, fontDictKey, ids), encoding in zip(glyphs, glyphEncodings):
+        cs.program = toProgram(encoding, fontDictKey)
+
+    globalSubrs = cff.GlobalSubrs
+    for fontDictKey, pool in pools.items():
+        if fontDictKey is None:
+            subrsIndex = globalSubrs
+            private = None
+        else:
+            private = privates[fontDictKey]
+            subrsIndex = SubrsIndex(globalSubrs=globalSubrs, private=private)
+            private.Subrs = subrsIndex
+        for subr in pool:
+            program = toProgram(subr.encoding, fontDictKey)
+            if not isCFF2:
+                program.append("return")
+            subrsIndex.append(
+                T2CharString(program=program, private=private, globalSubrs=globalSubrs)
+            )
+    log.debug(
+        "created %d global and %d local subroutines",
+        len(pools.get(None, ())),
+        sum(
+            len(pool) for fontDictKey, pool in pools.items() if fontDictKey is not None
+        ),
+    )
@@ -0,0 +1,204 @@
+"""Benchmark the DesignSpaceDocument queries against those of a DesignSpaceIndex.
+
+A synthetic document is used, with four continuous axes with non-linear maps,
+one discrete axis, a source at each corner and at the default location of
+each sub-space, and as many instances as requested.
+
+Usage: python -m fontTools.designspaceLib.benchmark [INSTANCES] [REPEAT]
+"""
+
+from fontTools.designspaceLib import (
+    AxisDescriptor,
+    DesignSpaceDocument,
+    DiscreteAxisDescriptor,
+    InstanceDescriptor,
+    LocationLabelDescriptor,
+    SourceDescriptor,
+)
+from fontTools.designspaceLib.index import DesignSpaceIndex
+from fontTools.designspaceLib.split import splitInterpolable
+import itertools
+import random
+import sys
+import timeit
+
+
+def makeDocument(instanceCount):
+    rnd = random.Random(0)
+    doc = DesignSpaceDocument()
+    for tag in ("wght", "wdth", "opsz", "GRAD"):
+        users = sorted(rnd.sample(range(100, 1000), 10))
+        designs = sorted(rnd.sample(range(0, 1000), 10))
+        doc.addAxis(
+            AxisDescriptor(
+                tag=tag,
+                name=tag,
+                minimum=users[0],
+                default=users[len(users) // 2],
+                maximum=users[-1],
+                map=list(zip(users, designs)),
+            )
+        )
+    doc.addAxis(
+        DiscreteAxisDescriptor(
+            tag="ital", name="ital", values=[0, 1], default=0, map=[(0, 0), (1, 10)]
+        )
+    )
+    continuousAxes = doc.axes[:-1]
+    for italic in (0, 1):
+        corners = itertools.product(*[(a.minimum, a.maximum) for a in continuousAxes])
+        for corner in [[a.default for a in continuousAxes]] + list(corners):
+            userLocation = dict(zip((a.name for a in continuousAxes), corner))
+            userLocation["ital"] = italic
+            doc.addSource(
+                SourceDescriptor(
+                    filename="source%d.ufo" % len(doc.sources),
+                    designLocation=doc.map_forward(userLocation),
+                )
+            )
+    for i in range(100):
+        doc.addLocationLabel(
+            LocationLabelDescriptor(
+                name="label%d" % i,
+                userLocation={
+                    a.name: rnd.randint(a.minimum, a.maximum) for a in continuousAxes
+                },
+            )
+        )
+    for i in range(instanceCount):
+        userLocation = {
+            a.name: rnd.randint(a.minimum, a.maximum) for a in continuousAxes
+        }
+        userLocation["ital"] = rnd.choice([0, 1])
+        if i % 10 == 0:
+            # some instances are at a source location
+            source = rnd.choice(doc.sources)
+            doc.addInstance(
+                InstanceDescriptor(
+                    name="instance%d" % i, designLocation=dict(source.designLocation)
+                )
+            )
+        else:
+            doc.addInstance(
+                InstanceDescriptor(name="instance%d" % i, userLocation=userLocation)
+            )
+    return doc
+
+
+_documents = {}
+
+
+def setup_document(instanceCount):
+    if instanceCount not in _documents:
+        _documents[instanceCount] = makeDocument(instanceCount)
+    return _documents[instanceCount]
+
+
+def setup_index(instanceCount):
+    doc = setup_document(instanceCount)
+    return doc, DesignSpaceIndex(doc)
+
+
+def build_index(doc):
+    DesignSpaceIndex(doc)
+
+
+def full_locations_document(doc):
+    for instance in doc.instances:
+        instance.getFullUserLocation(doc)
+
+
+def full_locations_index(data):
+    doc, index = data
+    for instance in doc.instances:
+        index.getFullUserLocation(instance)
+
+
+def _interpolable(location):
+    # only the continuous axes can be normalized
+    return {name: value for name, value in location.items() if name != "ital"}
+
+
+def normalize_document(doc):
+    for instance in doc.instances:
+        doc.normalizeLocation(_interpolable(instance.getFullDesignLocation(doc)))
+
+
+def normalize_index(data):
+    doc, index = data
+    for instance in doc.instances:
+        index.normalizeLocation(_interpolable(index.getFullDesignLocation(instance)))
+
+
+def find_sources_document(doc):
+    for instance in doc.instances:
+        designLocation = instance.getFullDesignLocation(doc)
+        next(
+            (
+                source
+                for source in doc.sources
+                if source.getFullDesignLocation(doc) == designLocation
+            ),
+            None,
+        )
+
+
+def find_sources_index(data):
+    doc, index = data
+    for instance in doc.instances:
+        index.findSource(index.getFullDesignLocation(instance))
+
+
+def find_labels_document(doc):
+    for instance in doc.instances:
+        doc.labelForUserLocation(instance.userLocation)
+
+
+def find_labels_index(data):
+    doc, index = data
+    for instance in doc.instances:
+        index.labelForUserLocation(instance.userLocation)
+
+
+def split_document(doc):
+    list(splitInterpolable(doc, makeNames=False))
+
+
+def split_index(data):
+    doc, index = data
+    list(DesignSpaceIndex(doc).splitInterpolable(makeNames=False))
+
+
+def run_benchmark(instanceCount, function, setup, repeat=3):
+    print("%s:" % function, end="")
+    function = globals()[function]
+    setup = globals()["setup_" + setup]
+    results = []
+    for _ in range(repeat):
+        data = setup(instanceCount)
+        results.append(timeit.timeit(lambda: function(data), number=1))
+    print("\t%8.1fms" % (min(results) * 1000.0))
+
+
+def main(args=None):
+    if args is None:
+        args = sys.argv[1:]
+    if args and not args[0].isdigit():
+        print(__doc__, file=sys.stderr)
+        return 2
+    instanceCount = int(args[0]) if args else 10000
+    repeat = int(args[1]) if len(args) > 1 else 3
+    run_benchmark(instanceCount, "build_index", "document", repeat)
+    for query in (
+        "full_locations",
+        "normalize",
+        "find_sources",
+        "find_labels",
+        "split",
+    ):
+        run_benchmark(instanceCount, query + "_document", "document", repeat)
+        run_benchmark(instanceCount, query + "_index", "index", repeat)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,322 @@
+"""A compiled, indexed view of a :class:`DesignSpaceDocument`, to speed up
+queries on large documents with many axes, sources and instances.
+
+The :class:`DesignSpaceDocument` methods recompute everything on each call,
+with linear scans of the axes, labels and sources, and by re-validating and
+re-sorting the axis maps. A :class:`DesignSpaceIndex` does all that once,
+when it is created, and then answers the same queries with dict lookups and
+binary searches. It gives the same results as the document methods.
+
+The index is a snapshot: it must be created again after the document is
+modified.
+
+.. code:: python
+
+    doc = DesignSpaceDocument.fromfile("path/to/my.designspace")
+    index = DesignSpaceIndex(doc)
+    for instance in doc.instances:
+        userLocation = index.getFullUserLocation(instance)
+        source = index.findSource(index.getFullDesignLocation(instance))
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from fontTools.designspaceLib import (
+    AnisotropicLocationDict,
+    DesignSpaceDocument,
+    InstanceDescriptor,
+    LocationLabelDescriptor,
+    SimpleLocationDict,
+    SourceDescriptor,
+    VariableFontDescriptor,
+)
+from fontTools.varLib.models import normalizeValue
+
+__all__ = ["DesignSpaceIndex"]
+
+
+class _AxisMap:
+    """The map of an axis, compiled to sorted lists for binary searches."""
+
+    def __init__(self, axis):
+        axisMap = axis.get_validated_map()
+        self.discrete = hasattr(axis, "values")
+        if self.discrete:
+            self.forwardMap = dict(axisMap)
+            self.backwardMap: Dict[float, float] = {}
+            for user, design in axisMap:
+                self.backwardMap.setdefault(design, user)
+            return
+        self.forwardMap = dict(axisMap)
+        self.users = sorted(self.forwardMap)
+        self.designsForUsers = [self.forwardMap[user] for user in self.users]
+        backward = sorted((design, user) for user, design in axisMap)
+        self.designs = [design for design, _ in backward]
+        self.usersForDesigns = [user for _, user in backward]
+
+    def forward(self, v):
+        # same as AxisDescriptor.map_forward, i.e. piecewiseLinearMap
+        forwardMap = self.forwardMap
+        if not forwardMap:
+            return v
+        if self.discrete:
+            return forwardMap.get(v, v)
+        if v in forwardMap:
+            return forwardMap[v]
+        users = self.users
+        if v < users[0]:
+            return v + self.designsForUsers[0] - users[0]
+        if v > users[-1]:
+            return v + self.designsForUsers[-1] - users[-1]
+        i = bisect_left(users, v)
+        a, b = users[i - 1], users[i]
+        va, vb = self.designsForUsers[i - 1], self.designsForUsers[i]
+        return va + (vb - va) * (v - a) / (b - a)
+
+    def backward(self, v):
+        # same as AxisDescriptor.map_backward
+        if isinstance(v, tuple):
+            v = v[0]
+        if not self.forwardMap:
+            return v
+        if self.discrete:
+            return self.backwardMap.get(v, v)
+        designs = self.designs
+        users = self.usersForDesigns
+        if v <= designs[0]:
+            return v + users[0] - designs[0]
+        if v > designs[-1]:
+            return v + users[-1] - designs[-1]
+        # the first segment that contains v ends at the first design value
+        # that is greater than or equal to v
+        i = bisect_left(designs, v)
+        design1, design2 = designs[i - 1], designs[i]
+        user1, user2 = users[i - 1], users[i]
+        if design1 == design2:
+            return user1
+        return user1 + (user2 - user1) * (v - design1) / (design2 - design1)
+
+
+class DesignSpaceIndex:
+    """A compiled, read-only view of ``doc``.
+
+    The methods have the same names and results as the corresponding
+    :class:`DesignSpaceDocument` and descriptor methods, but don't modify
+    the document (e.g. :meth:`findDefault` doesn't set ``doc.default``).
+    """
+
+    def __init__(self, doc: DesignSpaceDocument):
+        self.doc = doc
+        self.axes = list(doc.axes)
+        self._axesByName = {}
+        self._axesByTag = {}
+        for axis in self.axes:
+            self._axesByName.setdefault(axis.name, axis)
+            self._axesByTag.setdefault(axis.tag, axis)
+        self._axisMaps = {axis.name: _AxisMap(axis) for axis in self.axes}
+        self._defaultDesignLocation = {
+            axis.name: self._axisMaps[axis.name].forward(axis.default)
+            for axis in self.axes
+        }
+        # the normalization triples, in design space
+        self._triples = {}
+        for axis in self.axes:
+            if not hasattr(axis, "values"):
+                axisMap = self._axisMaps[axis.name]
+                self._triples[axis.name] = [
+                    axisMap.forward(v)
+                    for v in (axis.minimum, axis.default, axis.maximum)
+                ]
+
+        self._locationLabels: Dict[str, LocationLabelDescriptor] = {}
+        self._labelsByUserLocation: Dict[Any, LocationLabelDescriptor] = {}
+        for label in doc.locationLabels:
+            self._locationLabels.setdefault(label.name, label)
+            key = _locationKey(label.userLocation)
+            if key is not None:
+                self._labelsByUserLocation.setdefault(key, label)
+
+        self._default: Optional[SourceDescriptor] = None
+        self._sourcesByLocation: Dict[Tuple[float, ...], SourceDescriptor] = {}
+        for source in doc.sources:
+            designLocation = self.getFullDesignLocation(source)
+            if self._default is None and designLocation == self._defaultDesignLocation:
+                self._default = source
+            self._sourcesByLocation.setdefault(
+                self._normalizedKey(designLocation), source
+            )
+
+        self._variableFonts: Optional[List[VariableFontDescriptor]] = None
+        self._subSpaces: Dict[
+            Tuple[bool, bool, Any],
+            List[Tuple[SimpleLocationDict, DesignSpaceDocument]],
+        ] = {}
+
+    # axes and labels
+
+    def getAxisOrder(self) -> List[str]:
+        return [axis.name for axis in self.axes]
+
+    def getAxis(self, name: str):
+        return self._axesByName.get(name)
+
+    def getAxisByTag(self, tag: str):
+        return self._axesByTag.get(tag)
+
+    def getLocationLabel(self, name: str) -> Optional[LocationLabelDescriptor]:
+        return self._locationLabels.get(name)
+
+    def labelForUserLocation(
+        self, userLocation: SimpleLocationDict
+    ) -> Optional[LocationLabelDescriptor]:
+        key = _locationKey(userLocation)
+        if key is None:
+            return self.doc.labelForUserLocation(userLocation)
+        return self._labelsByUserLocation.get(key)
+
+    # locations
+
+    def map_forward(self, userLocation: SimpleLocationDict) -> SimpleLocationDict:
+        axisMaps = self._axisMaps
+        return {
+            axis.name: axisMaps[axis.name].forward(
+                userLocation.get(axis.name, axis.default)
+            )
+            for axis in self.axes
+        }
+
+    def map_backward(
+        self, designLocation: AnisotropicLocationDict
+    ) -> SimpleLocationDict:
+        axisMaps = self._axisMaps
+        return {
+            axis.name: (
+                axisMaps[axis.name].backward(designLocation[axis.name])
+                if axis.name in designLocation
+                else axis.default
+            )
+            for axis in self.axes
+        }
+
+    def newDefaultLocation(self) -> SimpleLocationDict:
+        return dict(self._defaultDesignLocation)
+
+    def normalizeLocation(self, location: AnisotropicLocationDict) -> Dict[str, float]:
+        new = {}
+        for axis in self.axes:
+            if axis.name not in location:
+                continue
+            value = location[axis.name]
+            # 'anisotropic' location, take first coord only
+            if isinstance(value, tuple):
+                value = value[0]
+            triple = self._triples.get(axis.name)
+            if triple is None:
+                # discrete axes have no minimum and maximum
+                axisMap = self._axisMaps[axis.name]
+                triple = [
+                    axisMap.forward(v)
+                    for v in (axis.minimum, axis.default, axis.maximum)
+                ]
+            new[axis.name] = normalizeValue(value, triple)
+        return new
+
+    def getFullDesignLocation(self, descriptor) -> AnisotropicLocationDict:
+        """Same as the ``getFullDesignLocation`` method of sources and
+        instances."""
+        if isinstance(descriptor, InstanceDescriptor):
+            label = descriptor.getLocationLabelDescriptor(self)  # type: ignore
+            if label is not None:
+                return self.map_forward(label.userLocation)
+            userLocation = descriptor.userLocation
+        else:
+            userLocation = {}
+        designLocation = descriptor.designLocation
+        result = {}
+        for axis in self.axes:
+            name = axis.name
+            if name in designLocation:
+                result[name] = designLocation[name]
+            elif name in userLocation:
+                result[name] = self._axisMaps[name].forward(userLocation[name])
+            else:
+                result[name] = self._defaultDesignLocation[name]
+        return result
+
+    def getFullUserLocation(self, descriptor) -> SimpleLocationDict:
+        """Same as the ``getFullUserLocation`` method of instances and
+        location labels."""
+        if isinstance(descriptor, LocationLabelDescriptor):
+            return {
+                axis.name: descriptor.userLocation.get(axis.name, axis.default)
+                for axis in self.axes
+            }
+        return self.map_backward(self.getFullDesignLocation(descriptor))
+
+    # sources
+
+    def findDefault(self) -> Optional[SourceDescriptor]:
+        """Return the source at the default location, or None."""
+        return self._default
+
+    def findSource(
+        self, designLocation: AnisotropicLocationDict
+    ) -> Optional[SourceDescriptor]:
+        """Return the first source at the given design location, or None.
+        Locations are compared after normalization, missing axes are at
+        their default location.
+        """
+        return self._sourcesByLocation.get(
+            self._normalizedKey({**self._defaultDesignLocation, **designLocation})
+        )
+
+    def _normalizedKey(self, designLocation):
+        try:
+            location = self.normalizeLocation(designLocation)
+        except AttributeError:
+            # discrete axes: compare the design values as is
+            location = {
+                name: value[0] if isinstance(value, tuple) else value
+                for name, value in designLocation.items()
+            }
+        return tuple(location.get(axis.name) for axis in self.axes)
+
+    # variable fonts
+
+    def getVariableFonts(self) -> List[VariableFontDescriptor]:
+        if self._variableFonts is None:
+            self._variableFonts = self.doc.getVariableFonts()
+        return self._variableFonts
+
+    def splitInterpolable(
+        self, makeNames: bool = True, expandLocations: bool = True, **kwargs
+    ) -> Iterator[Tuple[SimpleLocationDict, DesignSpaceDocument]]:
+        """Same as :func:`fontTools.designspaceLib.split.splitInterpolable`,
+        but the sub-spaces are extracted only once, and shared between calls
+        with the same arguments: don't modify them.
+        """
+        from fontTools.designspaceLib.split import _splitInterpolable
+
+        key = (makeNames, expandLocations, tuple(sorted(kwargs.items())))
+        if key not in self._subSpaces:
+            self._subSpaces[key] = list(
+                _splitInterpolable(
+                    self.doc,
+                    makeNames=makeNames,
+                    expandLocations=expandLocations,
+                    index=self,
+                    **kwargs,
+                )
+            )
+        return iter(self._subSpaces[key])
+
+
+def _locationKey(location):
+    try:
+        return frozenset(location.items())
+    except TypeError:
+        # unhashable values
+        return None
@@ -7,7 +7,17 @@ from __future__ import annotations
 import itertools
 import logging
 import math
-from typing import Any, Callable, Dict, Iterator, List, Tuple, cast
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    cast,
+)
 
 from fontTools.designspaceLib import (
     AxisDescriptor,
@@ -31,6 +41,9 @@ from fontTools.designspaceLib.types import (
     userRegionToDesignRegion,
 )
 
+if TYPE_CHECKING:
+    from fontTools.designspaceLib.index import DesignSpaceIndex
+
 LOGGER = logging.getLogger(__name__)
 
 MakeInstanceFilenameCallable = Callable[
@@ -85,6 +98,21 @@ def splitInterpolable(
 
     .. versionadded:: 5.0
     """
+    return _splitInterpolable(
+        doc,
+        makeNames=makeNames,
+        expandLocations=expandLocations,
+        makeInstanceFilename=makeInstanceFilename,
+    )
+
+
+def _splitInterpolable(
+    doc: DesignSpaceDocument,
+    makeNames: bool = True,
+    expandLocations: bool = True,
+    makeInstanceFilename: MakeInstanceFilenameCallable = defaultMakeInstanceFilename,
+    index: Optional[DesignSpaceIndex] = None,
+) -> Iterator[Tuple[SimpleLocationDict, DesignSpaceDocument]]:
     discreteAxes = []
     interpolableUserRegion: Region = {}
     for axis in doc.axes:
@@ -114,6 +142,7 @@ def splitInterpolable(
             makeNames=makeNames,
             expandLocations=expandLocations,
             makeInstanceFilename=makeInstanceFilename,
+            index=index,
         )
         yield discreteUserLocation, subDoc
 
@@ -180,7 +209,10 @@ def _extractSubSpace(
     makeNames: bool,
     expandLocations: bool,
     makeInstanceFilename: MakeInstanceFilenameCallable,
+    index: Optional[DesignSpaceIndex] = None,
 ) -> DesignSpaceDocument:
+    # the optional index of 'doc' speeds up the location queries
+    locations = doc if index is None else index
     subDoc = DesignSpaceDocument()
     # Don't include STAT info
     # FIXME: (Jany) let's think about it. Not include = OK because the point of
@@ -193,10 +225,17 @@ def _extractSubSpace(
 
     def maybeExpandDesignLocation(object):
         if expandLocations:
+            if index is not None:
+                return index.getFullDesignLocation(object)
             return object.getFullDesignLocation(doc)
         else:
             return object.designLocation
 
+    def getFullUserLocation(instance):
+        if index is not None:
+            return index.getFullUserLocation(instance)
+        return instance.getFullUserLocation(doc)
+
     for axis in doc.axes:
         range = userRegion[axis.name]
         if isinstance(range, Range) and hasattr(axis, "minimum"):
@@ -274,7 +313,9 @@ def _extractSubSpace(
 
     # Sources: keep only the ones that fall within the kept axis ranges
     for source in doc.sources:
-        if not locationInRegion(doc.map_backward(source.designLocation), userRegion):
+        if not locationInRegion(
+            locations.map_backward(source.designLocation), userRegion
+        ):
             continue
 
         subDoc.addSource(
@@ -304,7 +345,7 @@ def _extractSubSpace(
     # Variable fonts: keep only the ones that fall within the kept axis ranges
     if keepVFs:
         # Note: call getVariableFont() to make the implicit VFs explicit
-        for vf in doc.getVariableFonts():
+        for vf in locations.getVariableFonts():
             vfUserRegion = getVFUserRegion(doc, vf)
             if regionInRegion(vfUserRegion, userRegion):
                 subDoc.addVariableFont(
@@ -322,11 +363,12 @@ def _extractSubSpace(
 
     # Instances: same as Sources + compute missing names
     for instance in doc.instances:
-        if not locationInRegion(instance.getFullUserLocation(doc), userRegion):
+        instanceUserLocation = getFullUserLocation(instance)
+        if not locationInRegion(instanceUserLocation, userRegion):
             continue
 
         if makeNames:
-            statNames = getStatNames(doc, instance.getFullUserLocation(doc))
+            statNames = getStatNames(doc, instanceUserLocation)
             familyName = instance.familyName or statNames.familyNames.get("en")
             styleName = instance.styleName or statNames.styleNames.get("en")
             subDoc.addInstance(
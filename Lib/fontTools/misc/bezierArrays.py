@@ -0,0 +1,430 @@
+"""fontTools.misc.bezierArrays.py -- batched versions of some of the
+:mod:`fontTools.misc.bezierTools` functions, working on many segments at once.
+
+The segments are given as an array-like of shape ``(N, 3, 2)`` for quadratic
+segments or ``(N, 4, 2)`` for cubic segments, i.e. a sequence of segments
+that are each a sequence of 2D points. If NumPy is installed, the functions
+compute all the segments with a few vectorized operations and return NumPy
+arrays; otherwise they loop over the segments with the scalar ``*C``
+functions of :mod:`fontTools.misc.bezierTools` (which are compiled with
+Cython when it is available, see ``bezierTools.COMPILED``) and return lists.
+
+The results are the same as those of the corresponding scalar functions,
+up to floating point rounding.
+
+.. code:: python
+
+    >>> from fontTools.misc.bezierArrays import calcCubicBoundsArray
+    >>> [tuple(float(v) for v in bounds) for bounds in calcCubicBoundsArray(
+    ...     [[(0, 0), (25, 100), (75, 100), (100, 0)],
+    ...      [(0, 0), (50, 0), (100, 50), (100, 100)]]
+    ... )]
+    [(0.0, 0.0, 100.0, 75.0), (0.0, 0.0, 100.0, 100.0)]
+"""
+
+from fontTools.misc.bezierTools import (
+    EPSILON,
+    approximateCubicArcLengthC,
+    approximateQuadraticArcLengthC,
+    calcCubicArcLengthC,
+    calcCubicBounds,
+    calcQuadraticBounds,
+    cubicPointAtTC,
+    epsilon,
+    quadraticPointAtT,
+    splitCubicIntoTwoAtTC,
+)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+__all__ = [
+    "approximateCubicArcLengthArray",
+    "approximateQuadraticArcLengthArray",
+    "calcCubicArcLengthArray",
+    "calcCubicBoundsArray",
+    "calcQuadraticBoundsArray",
+    "cubicPointAtTArray",
+    "quadraticPointAtTArray",
+    "splitCubicAtTArray",
+    "splitQuadraticAtTArray",
+]
+
+
+def _asSegments(segments, pointCount):
+    return np.asarray(segments, dtype=float).reshape(-1, pointCount, 2)
+
+
+def _asComplex(segments, pointCount):
+    segments = _asSegments(segments, pointCount)
+    return segments[..., 0] + 1j * segments[..., 1]
+
+
+def _fromComplex(points):
+    return np.stack((points.real, points.imag), axis=-1)
+
+
+def _asTs(ts, segmentCount):
+    return np.broadcast_to(np.asarray(ts, dtype=float), (segmentCount,))
+
+
+def _complexSegments(segments):
+    return [[complex(*pt) for pt in segment] for segment in segments]
+
+
+def _tsList(ts, segmentCount):
+    if isinstance(ts, (int, float)):
+        return [ts] * segmentCount
+    return list(ts)
+
+
+def _solveQuadraticArray(a, b, c):
+    # Same as bezierTools.solveQuadratic, for arrays of coefficients; returns
+    # two arrays of roots, NaN where there is no root.
+    nan = np.nan
+    linear = np.abs(a) < epsilon
+    with np.errstate(divide="ignore", invalid="ignore"):
+        DD = b * b - 4.0 * a * c
+        rDD = np.sqrt(np.where(DD >= 0.0, DD, nan))
+        root1 = (-b + rDD) / 2.0 / a
+        root2 = (-b - rDD) / 2.0 / a
+        linearRoot = np.where(np.abs(b) < epsilon, nan, -c / b)
+    return np.where(linear, linearRoot, root1), np.where(linear, nan, root2)
+
+
+def _boundsFromCandidates(ts, evaluate, first, last):
+    # ts is an (N, K) array of candidate extrema, NaN or out of range ones are
+    # ignored; first and last are the (N, 2) arrays of the end points.
+    valid = (ts >= 0) & (ts < 1)
+    ts = np.where(valid, ts, 0.0)
+    xs, ys = evaluate(ts)
+    inf = np.inf
+    xMin = np.minimum(np.min(np.where(valid, xs, inf), axis=1), first[:, 0])
+    yMin = np.minimum(np.min(np.where(valid, ys, inf), axis=1), first[:, 1])
+    xMax = np.maximum(np.max(np.where(valid, xs, -inf), axis=1), first[:, 0])
+    yMax = np.maximum(np.max(np.where(valid, ys, -inf), axis=1), first[:, 1])
+    return np.stack(
+        (
+            np.minimum(xMin, last[:, 0]),
+            np.minimum(yMin, last[:, 1]),
+            np.maximum(xMax, last[:, 0]),
+            np.maximum(yMax, last[:, 1]),
+        ),
+        axis=1,
+    )
+
+
+def calcQuadraticBoundsArray(segments):
+    """Calculates the bounding rectangles of quadratic Bezier segments.
+
+    Args:
+        segments: An array-like of shape ``(N, 3, 2)``.
+
+    Returns:
+        An ``(N, 4)`` array of ``(xMin, yMin, xMax, yMax)`` rectangles
+        (a list of tuples without NumPy).
+    """
+    if np is None:
+        return [calcQuadraticBounds(*segment) for segment in segments]
+    segments = _asSegments(segments, 3)
+    pt1, pt2, pt3 = segments[:, 0], segments[:, 1], segments[:, 2]
+    # same as calcQuadraticParameters
+    c = pt1
+    b = (pt2 - c) * 2.0
+    a = pt3 - c - b
+    a2 = a * 2.0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ts = np.where(a2 != 0, -b / a2, np.nan)
+
+    def evaluate(ts):
+        ax, ay = a[:, 0:1], a[:, 1:2]
+        bx, by = b[:, 0:1], b[:, 1:2]
+        cx, cy = c[:, 0:1], c[:, 1:2]
+        return ax * ts * ts + bx * ts + cx, ay * ts * ts + by * ts + cy
+
+    return _boundsFromCandidates(ts, evaluate, pt1, pt3)
+
+
+def calcCubicBoundsArray(segments):
+    """Calculates the bounding rectangles of cubic Bezier segments.
+
+    Args:
+        segments: An array-like of shape ``(N, 4, 2)``.
+
+    Returns:
+        An ``(N, 4)`` array of ``(xMin, yMin, xMax, yMax)`` rectangles
+        (a list of tuples without NumPy).
+    """
+    if np is None:
+        return [calcCubicBounds(*segment) for segment in segments]
+    segments = _asSegments(segments, 4)
+    pt1, pt2, pt3, pt4 = (segments[:, i] for i in range(4))
+    # same as calcCubicParameters
+    d = pt1
+    c = (pt2 - d) * 3.0
+    b = (pt3 - pt2) * 3.0 - c
+    a = pt4 - d - c - b
+    # the roots of the first derivative, in x and y
+    roots = _solveQuadraticArray(a * 3.0, b * 2.0, c)
+    ts = np.concatenate(
+        (roots[0][:, 0:1], roots[1][:, 0:1], roots[0][:, 1:2], roots[1][:, 1:2]),
+        axis=1,
+    )
+
+    def evaluate(ts):
+        ax, ay = a[:, 0:1], a[:, 1:2]
+        bx, by = b[:, 0:1], b[:, 1:2]
+        cx, cy = c[:, 0:1], c[:, 1:2]
+        dx, dy = d[:, 0:1], d[:, 1:2]
+        return (
+            ax * ts * ts * ts + bx * ts * ts + cx * ts + dx,
+            ay * ts * ts * ts + by * ts * ts + cy * ts + dy,
+        )
+
+    return _boundsFromCandidates(ts, evaluate, pt1, pt4)
+
+
+def calcCubicArcLengthArray(segments, tolerance=0.005):
+    """Calculates the arc lengths of cubic Bezier segments.
+
+    Like :func:`fontTools.misc.bezierTools.calcCubicArcLength`, the segments
+    are recursively divided until the divided segments are shorter than
+    ``tolerance``; all the pieces of the same depth are divided at once.
+
+    Args:
+        segments: An array-like of shape ``(N, 4, 2)``.
+        tolerance: Controls the precision of the calcuation.
+
+    Returns:
+        An ``(N,)`` array of arc lengths (a list without NumPy).
+    """
+    if np is None:
+        return [
+            calcCubicArcLengthC(*segment, tolerance)
+            for segment in _complexSegments(segments)
+        ]
+    points = _asComplex(segments, 4)
+    mult = 1.0 + 1.5 * tolerance  # same empirical hack as calcCubicArcLengthC
+    result = np.zeros(len(points))
+    # segments with NaNs or infinities would be divided forever
+    finite = np.isfinite(points).all(axis=1)
+    result[~finite] = np.nan
+    indices = np.flatnonzero(finite)
+    points = points[finite]
+    while len(points):
+        p0, p1, p2, p3 = points[:, 0], points[:, 1], points[:, 2], points[:, 3]
+        arch = np.abs(p0 - p3)
+        box = np.abs(p0 - p1) + np.abs(p1 - p2) + np.abs(p2 - p3)
+        done = arch * mult + EPSILON >= box
+        np.add.at(result, indices[done], (arch[done] + box[done]) * 0.5)
+        todo = ~done
+        if not todo.any():
+            break
+        p0, p1, p2, p3 = p0[todo], p1[todo], p2[todo], p3[todo]
+        # same as bezierTools._split_cubic_into_two
+        mid = (p0 + 3 * (p1 + p2) + p3) * 0.125
+        deriv3 = (p3 + p2 - p1 - p0) * 0.125
+        one = np.stack((p0, (p0 + p1) * 0.5, mid - deriv3, mid), axis=1)
+        two = np.stack((mid, mid + deriv3, (p2 + p3) * 0.5, p3), axis=1)
+        points = np.concatenate((one, two))
+        indices = np.concatenate((indices[todo], indices[todo]))
+    return result
+
+
+def approximateQuadraticArcLengthArray(segments):
+    """Approximates the arc lengths of quadratic Bezier segments, like
+    :func:`fontTools.misc.bezierTools.approximateQuadraticArcLength`.
+
+    Args:
+        segments: An array-like of shape ``(N, 3, 2)``.
+
+    Returns:
+        An ``(N,)`` array of arc lengths (a list without NumPy).
+    """
+    if np is None:
+        return [
+            approximateQuadraticArcLengthC(*segment)
+            for segment in _complexSegments(segments)
+        ]
+    points = _asComplex(segments, 3)
+    pt1, pt2, pt3 = points[:, 0], points[:, 1], points[:, 2]
+    v0 = np.abs(
+        -0.492943519233745 * pt1 + 0.430331482911935 * pt2 + 0.0626120363218102 * pt3
+    )
+    v1 = np.abs(pt3 - pt1) * 0.4444444444444444
+    v2 = np.abs(
+        -0.0626120363218102 * pt1 - 0.430331482911935 * pt2 + 0.492943519233745 * pt3
+    )
+    return v0 + v1 + v2
+
+
+def approximateCubicArcLengthArray(segments):
+    """Approximates the arc lengths of cubic Bezier segments, like
+    :func:`fontTools.misc.bezierTools.approximateCubicArcLength`.
+
+    Args:
+        segments: An array-like of shape ``(N, 4, 2)``.
+
+    Returns:
+        An ``(N,)`` array of arc lengths (a list without NumPy).
+    """
+    if np is None:
+        return [
+            approximateCubicArcLengthC(*segment)
+            for segment in _complexSegments(segments)
+        ]
+    points = _asComplex(segments, 4)
+    pt1, pt2, pt3, pt4 = points[:, 0], points[:, 1], points[:, 2], points[:, 3]
+    v0 = np.abs(pt2 - pt1) * 0.15
+    v1 = np.abs(
+        -0.558983582205757 * pt1
+        + 0.325650248872424 * pt2
+        + 0.208983582205757 * pt3
+        + 0.024349751127576 * pt4
+    )
+    v2 = np.abs(pt4 - pt1 + pt3 - pt2) * 0.26666666666666666
+    v3 = np.abs(
+        -0.024349751127576 * pt1
+        - 0.208983582205757 * pt2
+        - 0.325650248872424 * pt3
+        + 0.558983582205757 * pt4
+    )
+    v4 = np.abs(pt4 - pt3) * 0.15
+    return v0 + v1 + v2 + v3 + v4
+
+
+def splitQuadraticAtTArray(segments, ts):
+    """Splits quadratic Bezier segments in two.
+
+    Args:
+        segments: An array-like of shape ``(N, 3, 2)``.
+        ts: The position at which to split each segment: a number, or an
+            array-like of shape ``(N,)``.
+
+    Returns:
+        A tuple of two ``(N, 3, 2)`` arrays, the first and the second halves
+        of the segments (two lists of segments without NumPy).
+    """
+    if np is None:
+        first, second = [], []
+        for (pt1, pt2, pt3), t in zip(segments, _tsList(ts, len(segments))):
+            pointAtT = quadraticPointAtT(pt1, pt2, pt3, t)
+            first.append(
+                (
+                    pt1,
+                    (pt1[0] + (pt2[0] - pt1[0]) * t, pt1[1] + (pt2[1] - pt1[1]) * t),
+                    pointAtT,
+                )
+            )
+            second.append(
+                (
+                    pointAtT,
+                    (pt2[0] + (pt3[0] - pt2[0]) * t, pt2[1] + (pt3[1] - pt2[1]) * t),
+                    pt3,
+                )
+            )
+        return first, second
+    segments = _asSegments(segments, 3)
+    t = _asTs(ts, len(segments))[:, None]
+    pt1, pt2, pt3 = segments[:, 0], segments[:, 1], segments[:, 2]
+    off1 = pt1 + (pt2 - pt1) * t
+    off2 = pt2 + (pt3 - pt2) * t
+    pointAtT = off1 + (off2 - off1) * t
+    return (
+        np.stack((pt1, off1, pointAtT), axis=1),
+        np.stack((pointAtT, off2, pt3), axis=1),
+    )
+
+
+def splitCubicAtTArray(segments, ts):
+    """Splits cubic Bezier segments in two, like
+    :func:`fontTools.misc.bezierTools.splitCubicIntoTwoAtTC`.
+
+    Args:
+        segments: An array-like of shape ``(N, 4, 2)``.
+        ts: The position at which to split each segment: a number, or an
+            array-like of shape ``(N,)``.
+
+    Returns:
+        A tuple of two ``(N, 4, 2)`` arrays, the first and the second halves
+        of the segments (two lists of segments without NumPy).
+    """
+    if np is None:
+        first, second = [], []
+        for segment, t in zip(_complexSegments(segments), _tsList(ts, len(segments))):
+            one, two = splitCubicIntoTwoAtTC(*segment, t)
+            first.append(tuple((p.real, p.imag) for p in one))
+            second.append(tuple((p.real, p.imag) for p in two))
+        return first, second
+    points = _asComplex(segments, 4)
+    t = _asTs(ts, len(points))
+    pt1, pt2, pt3, pt4 = points[:, 0], points[:, 1], points[:, 2], points[:, 3]
+    # same as splitCubicIntoTwoAtTC
+    t2 = t * t
+    _1_t = 1 - t
+    _1_t_2 = _1_t * _1_t
+    _2_t_1_t = 2 * t * _1_t
+    pointAtT = (
+        _1_t_2 * _1_t * pt1 + 3 * (_1_t_2 * t * pt2 + _1_t * t2 * pt3) + t2 * t * pt4
+    )
+    off1 = _1_t_2 * pt1 + _2_t_1_t * pt2 + t2 * pt3
+    off2 = _1_t_2 * pt2 + _2_t_1_t * pt3 + t2 * pt4
+    pt2 = pt1 + (pt2 - pt1) * t
+    pt3 = pt4 + (pt3 - pt4) * _1_t
+    return (
+        _fromComplex(np.stack((pt1, pt2, off1, pointAtT), axis=1)),
+        _fromComplex(np.stack((pointAtT, off2, pt3, pt4), axis=1)),
+    )
+
+
+def quadraticPointAtTArray(segments, ts):
+    """Finds the points at time ``t`` on quadratic Bezier segments, like
+    :func:`fontTools.misc.bezierTools.quadraticPointAtT`.
+
+    Args:
+        segments: An array-like of shape ``(N, 3, 2)``.
+        ts: The time along each segment: a number, or an array-like of shape
+            ``(N,)``.
+
+    Returns:
+        An ``(N, 2)`` array of points (a list of tuples without NumPy).
+    """
+    if np is None:
+        return [
+            quadraticPointAtT(*segment, t)
+            for segment, t in zip(segments, _tsList(ts, len(segments)))
+        ]
+    segments = _asSegments(segments, 3)
+    t = _asTs(ts, len(segments))[:, None]
+    pt1, pt2, pt3 = segments[:, 0], segments[:, 1], segments[:, 2]
+    return (1 - t) * (1 - t) * pt1 + 2 * (1 - t) * t * pt2 + t * t * pt3
+
+
+def cubicPointAtTArray(segments, ts):
+    """Finds the points at time ``t`` on cubic Bezier segments, like
+    :func:`fontTools.misc.bezierTools.cubicPointAtT`.
+
+    Args:
+        segments: An array-like of shape ``(N, 4, 2)``.
+        ts: The time along each segment: a number, or an array-like of shape
+            ``(N,)``.
+
+    Returns:
+        An ``(N, 2)`` array of points (a list of tuples without NumPy).
+    """
+    if np is None:
+        points = []
+        for segment, t in zip(_complexSegments(segments), _tsList(ts, len(segments))):
+            p = cubicPointAtTC(*segment, t)
+            points.append((p.real, p.imag))
+        return points
+    segments = _asSegments(segments, 4)
+    t = _asTs(ts, len(segments))[:, None]
+    pt1, pt2, pt3, pt4 = (segments[:, i] for i in range(4))
+    t2 = t * t
+    _1_t = 1 - t
+    _1_t_2 = _1_t * _1_t
+    return _1_t_2 * _1_t * pt1 + 3 * (_1_t_2 * t * pt2 + _1_t * t2 * pt3) + t2 * t * pt4
@@ -1,17 +1,24 @@
 from __future__ import annotations
 
 import io
+import mmap
 import os
-import shutil
 import stat
+import struct
 import typing
 import zipfile
+import zlib
 from datetime import datetime
 
 from ._base import FS
-from ._errors import FileExpected, ResourceNotFound, ResourceReadOnly
+from ._errors import (
+    DirectoryExpected,
+    FileExpected,
+    ResourceNotFound,
+    ResourceReadOnly,
+)
 from ._info import Info
-from ._path import dirname, forcedir, normpath, relpath
+from ._path import basename, forcedir, normpath, relpath
 from ._tempfs import TempFS
 
 if typing.TYPE_CHECKING:
@@ -20,35 +27,64 @@ if typing.TYPE_CHECKING:
 
     from ._subfs import SubFS
 
+# size of the fixed part of a zip local file header
+_LOCAL_HEADER_SIZE = 30
+
 
 class ZipFS(FS):
-    """Read and write zip files."""
+    """Read and write zip files.
+
+    The 'compression' method of the zipfile module is used when writing,
+    e.g. zipfile.ZIP_STORED to write the files uncompressed, which is faster.
+    """
 
     def __new__(
-        cls, file: str | os.PathLike, write: bool = False, encoding: str = "utf-8"
+        cls,
+        file: str | os.PathLike,
+        write: bool = False,
+        compression: int = zipfile.ZIP_DEFLATED,
+        encoding: str = "utf-8",
     ):
         if write:
-            return WriteZipFS(file, encoding)
+            return WriteZipFS(file, compression, encoding)
         else:
             return ReadZipFS(file, encoding)
 
     if typing.TYPE_CHECKING:
 
         def __init__(
-            self, file: str | os.PathLike, write: bool = False, encoding: str = "utf-8"
+            self,
+            file: str | os.PathLike,
+            write: bool = False,
+            compression: int = zipfile.ZIP_DEFLATED,
+            encoding: str = "utf-8",
         ):
             pass
 
 
 class ReadZipFS(FS):
-    """A readable zip file."""
+    """A readable zip file.
+
+    The directory tree of the archive is indexed in memory once, from the
+    zip central directory. The archive file is memory-mapped, so that
+    members stored or deflated without encryption can be read concurrently
+    from multiple threads, without seeking a shared file object.
+    """
 
     def __init__(self, file: str | os.PathLike, encoding: str = "utf-8"):
         super().__init__()
         self._file = os.fspath(file)
         self.encoding = encoding  # unused
         self._zip = zipfile.ZipFile(file, "r")
-        self._directory_fs = None
+        self._files: dict[str, zipfile.ZipInfo] = {}
+        self._dirs: dict[str, dict[str, None]] = {"": {}}
+        for zip_info in self._zip.infolist():
+            self._add_to_index(zip_info)
+        try:
+            with open(self._file, "rb") as f:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            self._mmap = None
 
     def __repr__(self) -> str:
         return f"ReadZipFS({self._file!r})"
@@ -56,77 +92,86 @@ class ReadZipFS(FS):
     def __str__(self) -> str:
         return f"<zipfs '{self._file}'>"
 
-    def _path_to_zip_name(self, path: str) -> str:
-        """Convert a path to a zip file name."""
-        path = relpath(normpath(path))
-        if self._directory.isdir(path):
-            path = forcedir(path)
-        return path
-
-    @property
-    def _directory(self) -> TempFS:
-        if self._directory_fs is None:
-            self._directory_fs = _fs = TempFS()
-            for zip_name in self._zip.namelist():
-                resource_name = zip_name
-                if resource_name.endswith("/"):
-                    _fs.makedirs(resource_name, recreate=True)
-                else:
-                    _fs.makedirs(dirname(resource_name), recreate=True)
-                    _fs.create(resource_name)
-        return self._directory_fs
+    def _add_to_index(self, zip_info: zipfile.ZipInfo):
+        parts = [part for part in zip_info.filename.split("/") if part]
+        if not parts:
+            return
+        parent = ""
+        for i, part in enumerate(parts):
+            path = f"{parent}/{part}" if parent else part
+            if i < len(parts) - 1 or zip_info.is_dir():
+                if path not in self._dirs:
+                    self._dirs[path] = {}
+                    self._dirs[parent][part] = None
+            else:
+                self._files[path] = zip_info
+                self._dirs[parent][part] = None
+            parent = path
+
+    @staticmethod
+    def _key(path: str) -> str:
+        """Convert a path to a key of the directory tree index."""
+        key = relpath(normpath(path))
+        return "" if key == "." else key
 
     def close(self):
         super(ReadZipFS, self).close()
         self._zip.close()
-        if self._directory_fs is not None:
-            self._directory_fs.close()
+        if self._mmap is not None:
+            self._mmap.close()
 
     def getinfo(self, path: str, namespaces: Collection[str] | None = None) -> Info:
         namespaces = namespaces or ()
         raw_info = {}
 
-        if path == "/":
+        key = self._key(path)
+        if key == "":
             raw_info["basic"] = {"name": "", "is_dir": True}
             if "details" in namespaces:
                 raw_info["details"] = {"type": stat.S_IFDIR}
         else:
-            basic_info = self._directory.getinfo(path)
-            raw_info["basic"] = {"name": basic_info.name, "is_dir": basic_info.is_dir}
-
-            if "details" in namespaces:
-                zip_name = self._path_to_zip_name(path)
+            is_dir = key in self._dirs
+            if is_dir:
                 try:
-                    zip_info = self._zip.getinfo(zip_name)
+                    zip_info = self._zip.getinfo(forcedir(key))
                 except KeyError:
-                    pass
-                else:
-                    if "details" in namespaces:
-                        raw_info["details"] = {
-                            "size": zip_info.file_size,
-                            "type": int(
-                                stat.S_IFDIR if basic_info.is_dir else stat.S_IFREG
-                            ),
-                            "modified": datetime(*zip_info.date_time).timestamp(),
-                        }
+                    zip_info = None
+            elif key in self._files:
+                zip_info = self._files[key]
+            else:
+                raise ResourceNotFound(path)
+            raw_info["basic"] = {"name": basename(key), "is_dir": is_dir}
+
+            if "details" in namespaces and zip_info is not None:
+                raw_info["details"] = {
+                    "size": zip_info.file_size,
+                    "type": int(stat.S_IFDIR if is_dir else stat.S_IFREG),
+                    "modified": datetime(*zip_info.date_time).timestamp(),
+                }
 
         return Info(raw_info)
 
     def exists(self, path: str) -> bool:
         self.check()
-        return self._directory.exists(path)
+        key = self._key(path)
+        return key in self._files or key in self._dirs
 
     def isdir(self, path: str) -> bool:
         self.check()
-        return self._directory.isdir(path)
+        return self._key(path) in self._dirs
 
     def isfile(self, path: str) -> bool:
         self.check()
-        return self._directory.isfile(path)
+        return self._key(path) in self._files
 
-    def listdir(self, path: str) -> str:
+    def listdir(self, path: str) -> list[str]:
         self.check()
-        return self._directory.listdir(path)
+        key = self._key(path)
+        if key in self._dirs:
+            return list(self._dirs[key])
+        if key in self._files:
+            raise DirectoryExpected(path)
+        raise ResourceNotFound(path)
 
     def makedir(self, path: str, recreate: bool = False) -> SubFS:
         self.check()
@@ -154,26 +199,44 @@ class ReadZipFS(FS):
 
     def readbytes(self, path: str) -> bytes:
         self.check()
-        if not self._directory.isfile(path):
+        zip_info = self._files.get(self._key(path))
+        if zip_info is None:
             raise ResourceNotFound(path)
-        zip_name = self._path_to_zip_name(path)
-        zip_bytes = self._zip.read(zip_name)
-        return zip_bytes
+        if (
+            self._mmap is None
+            or zip_info.flag_bits & 0x1  # encrypted
+            or zip_info.compress_type not in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED)
+        ):
+            return self._zip.read(zip_info)
+        # skip the local file header, whose name and extra fields may differ
+        # in length from those in the central directory
+        offset = zip_info.header_offset
+        header = self._mmap[offset : offset + _LOCAL_HEADER_SIZE]
+        if len(header) != _LOCAL_HEADER_SIZE or header[:4] != b"PK\x03\x04":
+            raise zipfile.BadZipFile("Bad magic number for file header")
+        nameLength, extraLength = struct.unpack("<HH", header[26:])
+        offset += _LOCAL_HEADER_SIZE + nameLength + extraLength
+        data = self._mmap[offset : offset + zip_info.compress_size]
+        if zip_info.compress_type == zipfile.ZIP_DEFLATED:
+            data = zlib.decompress(data, -zlib.MAX_WBITS, zip_info.file_size)
+        if zlib.crc32(data) != zip_info.CRC:
+            raise zipfile.BadZipFile(f"Bad CRC-32 for file {zip_info.filename!r}")
+        return data
 
     def open(self, path: str, mode: str = "rb", **kwargs) -> IO[Any]:
         self.check()
-        if self._directory.isdir(path):
+        key = self._key(path)
+        if key in self._dirs:
             raise FileExpected(f"{path!r} is a directory")
 
         zip_mode = mode[0]
-        if zip_mode == "r" and not self._directory.exists(path):
+        if zip_mode == "r" and key not in self._files:
             raise ResourceNotFound(f"No such file or directory: {path!r}")
 
         if any(m in mode for m in "wax+"):
             raise ResourceReadOnly(path)
 
-        zip_name = self._path_to_zip_name(path)
-        stream = self._zip.open(zip_name, zip_mode)
+        stream = self._zip.open(self._files[key], zip_mode)
         if "b" in mode:
             if kwargs:
                 raise ValueError("encoding args invalid for binary operation")
@@ -185,9 +248,15 @@ class ReadZipFS(FS):
 class WriteZipFS(TempFS):
     """A writable zip file."""
 
-    def __init__(self, file: str | os.PathLike, encoding: str = "utf-8"):
+    def __init__(
+        self,
+        file: str | os.PathLike,
+        compression: int = zipfile.ZIP_DEFLATED,
+        encoding: str = "utf-8",
+    ):
         super().__init__()
         self._file = os.fspath(file)
+        self.compression = compression
         self.encoding = encoding  # unused
 
     def __repr__(self) -> str:
@@ -197,8 +266,18 @@ class WriteZipFS(TempFS):
         return f"<zipfs-write '{self._file}'>"
 
     def close(self):
-        base_name = os.path.splitext(self._file)[0]
-        shutil.make_archive(base_name, format="zip", root_dir=self._temp_dir)
-        if self._file != base_name + ".zip":
-            shutil.move(base_name + ".zip", self._file)
+        if not self.isclosed():
+            self._write_zip()
         super().close()
+
+    def _write_zip(self):
+        with zipfile.ZipFile(self._file, "w", compression=self.compression) as zf:
+            for root, dirs, files in os.walk(self._temp_dir):
+                dirs.sort()
+                arc_root = os.path.relpath(root, self._temp_dir)
+                if arc_root != os.curdir:
+                    zf.write(root, arc_root)
+                else:
+                    arc_root = ""
+                for name in sorted(files):
+                    zf.write(os.path.join(root, name), os.path.join(arc_root, name))
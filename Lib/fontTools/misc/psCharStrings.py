@@ -2,6 +2,13 @@
 CFF dictionary data and Type1/Type2 CharStrings.
 """
 
+try:
+    import cython
+except (AttributeError, ImportError):
+    # if cython not installed, use mock module with no-op decorators and types
+    from fontTools.misc import cython
+COMPILED = cython.compiled
+
 from fontTools.misc.fixedTools import (
     fixedToFloat,
     floatToFixed,
@@ -319,6 +326,12 @@ class CharStringCompileError(Exception):
     pass
 
 
+def _programHash(program):
+    # Hash the repr rather than the tokens themselves: tokens that compare or
+    # hash equal (1 and 1.0, or -1 and -2) can still encode differently.
+    return hash(repr(program))
+
+
 class SimpleT2Decompiler(object):
     def __init__(self, localSubrs, globalSubrs, private=None, blender=None):
         self.localSubrs = localSubrs
@@ -337,6 +350,7 @@ class SimpleT2Decompiler(object):
         self.numRegions = 0
         self.vsIndex = 0
 
+    @cython.locals(index=cython.int)
     def execute(self, charString, *, pushToStack=None):
         self.callingStack.append(charString)
         needsDecompilation = charString.needsDecompilation()
@@ -366,7 +380,11 @@ class SimpleT2Decompiler(object):
             else:
                 pushToStack(token)
         if needsDecompilation:
+            bytecode = charString.bytecode
             charString.setProgram(program)
+            # Remember what the program was decompiled from, so that it can be
+            # written back as is if it's left unchanged (see T2CharString.compile).
+            charString._decompiledFrom = (bytecode, _programHash(program))
         del self.callingStack[-1]
 
     def pop(self):
@@ -753,21 +771,17 @@ class T2OutlineExtractor(T2WidthExtractor):
         """{dxa dya dxb dyb dxc dyc}+ rrcurveto"""
         args = self.popall()
         for i in range(0, len(args), 6):
-            (
-                dxa,
-                dya,
-                dxb,
-                dyb,
-                dxc,
-                dyc,
-            ) = args[i : i + 6]
+            # Unpacking args[i : i + 6] directly crashes recent Cython versions
+            segment = args[i : i + 6]
+            dxa, dya, dxb, dyb, dxc, dyc = segment
             self.rCurveTo((dxa, dya), (dxb, dyb), (dxc, dyc))
 
     def op_rcurveline(self, index):
         """{dxa dya dxb dyb dxc dyc}+ dxd dyd rcurveline"""
         args = self.popall()
         for i in range(0, len(args) - 2, 6):
-            dxb, dyb, dxc, dyc, dxd, dyd = args[i : i + 6]
+            segment = args[i : i + 6]
+            dxb, dyb, dxc, dyc, dxd, dyd = segment
             self.rCurveTo((dxb, dyb), (dxc, dyc), (dxd, dyd))
         self.rLineTo(args[-2:])
 
@@ -789,7 +803,8 @@ class T2OutlineExtractor(T2WidthExtractor):
         else:
             dx1 = 0
         for i in range(0, len(args), 4):
-            dya, dxb, dyb, dyc = args[i : i + 4]
+            segment = args[i : i + 4]
+            dya, dxb, dyb, dyc = segment
             self.rCurveTo((dx1, dya), (dxb, dyb), (0, dyc))
             dx1 = 0
 
@@ -802,7 +817,8 @@ class T2OutlineExtractor(T2WidthExtractor):
         else:
             dy1 = 0
         for i in range(0, len(args), 4):
-            dxa, dxb, dyb, dxc = args[i : i + 4]
+            segment = args[i : i + 4]
+            dxa, dxb, dyb, dxc = segment
             self.rCurveTo((dxa, dy1), (dxb, dyb), (dxc, 0))
             dy1 = 0
 
@@ -1193,6 +1209,17 @@ class T2CharString(object):
         opcodes = self.opcodes
         program = self.program
 
+        decompiledFrom = self.__dict__.pop("_decompiledFrom", None)
+        if (
+            decompiledFrom is not None
+            and decompiledFrom[1] == _programHash(program)
+            and not (isCFF2 and program and program[-1] in ("return", "endchar"))
+        ):
+            # The program was not modified since it was decompiled: reuse the
+            # original bytecode instead of encoding it again.
+            self.setBytecode(decompiledFrom[0])
+            return
+
         if isCFF2:
             # If present, remove return and endchar operators.
             if program and program[-1] in ("return", "endchar"):
@@ -1242,14 +1269,20 @@ class T2CharString(object):
         self.bytecode = bytecode
         self.program = None
 
+    @cython.locals(index=cython.int, b0=cython.int)
     def getToken(self, index, len=len, byteord=byteord, isinstance=isinstance):
-        if self.bytecode is not None:
-            if index >= len(self.bytecode):
+        bytecode = self.bytecode
+        if bytecode is not None:
+            if index >= len(bytecode):
                 return None, 0, 0
-            b0 = byteord(self.bytecode[index])
+            b0 = byteord(bytecode[index])
             index = index + 1
+            if 32 <= b0 <= 246:
+                # Fast path for single-byte operands, by far the most common
+                # tokens; they are encoded the same in Type1 and Type2 charstrings.
+                return b0 - 139, False, index
             handler = self.operandEncoding[b0]
-            token, index = handler(self, b0, self.bytecode, index)
+            token, index = handler(self, b0, bytecode, index)
         else:
             if index >= len(self.program):
                 return None, 0, 0
@@ -0,0 +1,141 @@
+"""Benchmark a chain of filter pens against the same chain compiled with
+fontTools.pens.pipelinePen.compilePenPipeline, or the statistics of all the
+glyphs of a font computed with StatisticsPen and StatisticsControlPen against
+fontTools.pens.statisticsPen.calcGlyphStatistics.
+
+For the pipelines, a synthetic outline is drawn through two TransformPens, a
+Cu2QuPen (unless disabled), a ReverseContourPen and a RoundingPen onto a
+TTGlyphPen.
+
+Usage: python -m fontTools.pens.benchmark [CONTOURS] [REPEAT]
+       python -m fontTools.pens.benchmark FONT [REPEAT]
+"""
+
+from fontTools.pens.cu2quPen import Cu2QuPen
+from fontTools.pens.pipelinePen import compilePenPipeline
+from fontTools.pens.recordingPen import RecordingPen
+from fontTools.pens.reverseContourPen import ReverseContourPen
+from fontTools.pens.roundingPen import RoundingPen
+from fontTools.pens.statisticsPen import (
+    StatisticsControlPen,
+    StatisticsPen,
+    calcGlyphStatistics,
+)
+from fontTools.pens.transformPen import TransformPen
+from fontTools.pens.ttGlyphPen import TTGlyphPen
+from fontTools.ttLib import TTFont
+import random
+import sys
+import timeit
+
+
+def makeOutline(contourCount):
+    rnd = random.Random(0)
+    pen = RecordingPen()
+    for _ in range(contourCount):
+        pen.moveTo((rnd.randint(0, 1000), rnd.randint(0, 1000)))
+        for i in range(20):
+            if i % 2:
+                pen.lineTo((rnd.randint(0, 1000), rnd.randint(0, 1000)))
+            else:
+                pen.curveTo(
+                    *[(rnd.randint(0, 1000), rnd.randint(0, 1000)) for _ in range(3)]
+                )
+        pen.closePath()
+    return pen
+
+
+_outlines = {}
+
+
+def setup_outline(contourCount):
+    if contourCount not in _outlines:
+        _outlines[contourCount] = makeOutline(contourCount)
+    return _outlines[contourCount]
+
+
+def makePen(cu2qu):
+    pen = ReverseContourPen(RoundingPen(TTGlyphPen(None)))
+    if cu2qu:
+        pen = Cu2QuPen(pen, 1.0)
+    pen = TransformPen(pen, (0.5, 0, 0, 0.5, 0, 0))
+    return TransformPen(pen, (1, 0, 0, 1, 10, 10))
+
+
+def draw_chain(outline):
+    outline.replay(makePen(cu2qu=False))
+
+
+def draw_compiled(outline):
+    outline.replay(compilePenPipeline(makePen(cu2qu=False)))
+
+
+def cu2qu_chain(outline):
+    outline.replay(makePen(cu2qu=True))
+
+
+def cu2qu_compiled(outline):
+    outline.replay(compilePenPipeline(makePen(cu2qu=True)))
+
+
+def setup_glyphset(path):
+    font = TTFont(path)
+    return font.getGlyphSet(), font.getGlyphOrder()
+
+
+def statistics_pens(data):
+    glyphset, glyphNames = data
+    for glyphName in glyphNames:
+        glyphset[glyphName].draw(StatisticsPen(glyphset=glyphset))
+
+
+def statistics_batch(data):
+    glyphset, glyphNames = data
+    calcGlyphStatistics(glyphset, glyphNames)
+
+
+def control_statistics_pens(data):
+    glyphset, glyphNames = data
+    for glyphName in glyphNames:
+        glyphset[glyphName].draw(StatisticsControlPen(glyphset=glyphset))
+
+
+def control_statistics_batch(data):
+    glyphset, glyphNames = data
+    calcGlyphStatistics(glyphset, glyphNames, control=True)
+
+
+def run_benchmark(arg, function, setup, repeat=3):
+    print("%s:" % function, end="")
+    function = globals()[function]
+    setup = globals()["setup_" + setup]
+    results = []
+    for _ in range(repeat):
+        data = setup(arg)
+        results.append(timeit.timeit(lambda: function(data), number=1))
+    print("\t%8.1fms" % (min(results) * 1000.0))
+
+
+def main(args=None):
+    if args is None:
+        args = sys.argv[1:]
+    if args and args[0] in ("-h", "--help"):
+        print(__doc__, file=sys.stderr)
+        return 2
+    repeat = int(args[1]) if len(args) > 1 else 3
+    if args and not args[0].isdigit():
+        for function in (
+            "statistics_pens",
+            "statistics_batch",
+            "control_statistics_pens",
+            "control_statistics_batch",
+        ):
+            run_benchmark(args[0], function, "glyphset", repeat)
+        return
+    contourCount = int(args[0]) if args else 1000
+    for function in ("draw_chain", "draw_compiled", "cu2qu_chain", "cu2qu_compiled"):
+        run_benchmark(contourCount, function, "outline", repeat)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
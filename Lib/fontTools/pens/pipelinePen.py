@@ -0,0 +1,249 @@
+"""Fuse chains of filter pens into a single pen that filters whole contours.
+
+A glyph conversion pipeline like::
+
+    pen = TransformPen(Cu2QuPen(ReverseContourPen(TTGlyphPen(None)), 1.0), t)
+
+goes through several Python method calls for every segment of an outline.
+:func:`compilePenPipeline` turns the chain of known filter pens at the start
+of such a pipeline into a single :class:`PipelinePen`, which records each
+contour and passes it through the filters of all the pens at once, before
+drawing it with the first pen of the chain that it doesn't know (here the
+``TTGlyphPen``). Consecutive transformations are fused into a single one.
+
+The pens that are compiled are the :class:`FilterPen`,
+:class:`fontTools.pens.transformPen.TransformPen`,
+:class:`fontTools.pens.cu2quPen.Cu2QuPen`,
+:class:`fontTools.pens.reverseContourPen.ReverseContourPen` and
+:class:`fontTools.pens.roundingPen.RoundingPen` classes, but not their
+subclasses, which may override their behavior.
+"""
+
+from fontTools.cu2qu import curve_to_quadratic
+from fontTools.misc.transform import Transform
+from fontTools.pens.basePen import decomposeSuperBezierSegment
+from fontTools.pens.cu2quPen import Cu2QuPen
+from fontTools.pens.filterPen import ContourFilterPen, FilterPen
+from fontTools.pens.reverseContourPen import ReverseContourPen, reversedContour
+from fontTools.pens.roundingPen import RoundingPen
+from fontTools.pens.transformPen import TransformPen
+
+__all__ = ["PipelinePen", "compilePenPipeline"]
+
+
+class PipelinePen(ContourFilterPen):
+    """A filter pen that passes each contour through a sequence of contour
+    filters, then draws the result with the output pen.
+
+    A contour filter has a ``filterContour(contour)`` method that returns the
+    filtered list of the (operator, operands) tuples of a contour (see
+    :meth:`ContourFilterPen.filterContour`), and a
+    ``filterComponent(glyphName, transformation)`` method that returns the
+    filtered (glyphName, transformation) tuple of a component.
+
+    Use :func:`compilePenPipeline` to build one from a chain of filter pens.
+    """
+
+    def __init__(self, outPen, filters):
+        super().__init__(outPen)
+        self.filters = list(filters)
+
+    def filterContour(self, contour):
+        for contourFilter in self.filters:
+            contour = contourFilter.filterContour(contour)
+        return contour
+
+    def addComponent(self, glyphName, transformation, **kwargs):
+        for contourFilter in self.filters:
+            glyphName, transformation = contourFilter.filterComponent(
+                glyphName, transformation
+            )
+        self._outPen.addComponent(glyphName, transformation, **kwargs)
+
+
+def compilePenPipeline(pen):
+    """Return a pen drawing the same outlines as ``pen``, with the chain of
+    known filter pens starting at ``pen`` compiled into a :class:`PipelinePen`.
+
+    The pens of the chain must not have been drawn onto yet. They are not
+    modified, and must not be used together with the returned pen; the
+    ``stats`` dictionary of a ``Cu2QuPen`` is updated by the returned pen.
+
+    Fusing the transformations changes the order of the floating point
+    operations, so the coordinates may differ from those drawn through the
+    ``TransformPen`` objects in the last bits.
+
+    >>> from fontTools.pens.recordingPen import RecordingPen
+    >>> rec = RecordingPen()
+    >>> pen = TransformPen(TransformPen(ReverseContourPen(rec), (2, 0, 0, 2, 0, 0)), (1, 0, 0, 1, 5, 5))
+    >>> pen = compilePenPipeline(pen)
+    >>> pen.filters
+    [<_TransformFilter <Transform [2 0 0 2 10 10]>>, <_ReverseFilter>]
+    >>> pen.moveTo((0, 0))
+    >>> pen.lineTo((10, 0))
+    >>> pen.lineTo((10, 10))
+    >>> pen.closePath()
+    >>> rec.value
+    [('moveTo', ((10, 10),)), ('lineTo', ((30, 30),)), ('lineTo', ((30, 10),)), ('closePath', ())]
+    """
+    filters = []
+    while True:
+        compileFilter = _filterCompilers.get(type(pen))
+        if compileFilter is None:
+            break
+        contourFilter = compileFilter(pen)
+        if contourFilter is not None:
+            if (
+                filters
+                and type(contourFilter) is _TransformFilter
+                and type(filters[-1]) is _TransformFilter
+            ):
+                # the outer transformation applies first
+                contourFilter = _TransformFilter(
+                    contourFilter.transformation.transform(filters.pop().transformation)
+                )
+            filters.append(contourFilter)
+        pen = pen._outPen
+    if not filters:
+        return pen
+    return PipelinePen(pen, filters)
+
+
+class _TransformFilter:
+    def __init__(self, transformation):
+        if not isinstance(transformation, Transform):
+            transformation = Transform(*transformation)
+        self.transformation = transformation
+
+    def __repr__(self):
+        return "<%s %r>" % (self.__class__.__name__, self.transformation)
+
+    def filterContour(self, contour):
+        xx, xy, yx, yy, dx, dy = self.transformation
+        return [
+            (
+                operator,
+                tuple(
+                    (
+                        (xx * pt[0] + yx * pt[1] + dx, xy * pt[0] + yy * pt[1] + dy)
+                        if pt is not None
+                        else None
+                    )
+                    for pt in points
+                ),
+            )
+            for operator, points in contour
+        ]
+
+    def filterComponent(self, glyphName, transformation):
+        return glyphName, self.transformation.transform(transformation)
+
+
+class _Cu2QuFilter:
+    def __init__(self, max_err, stats, all_quadratic):
+        self.max_err = max_err
+        self.stats = stats
+        self.all_quadratic = all_quadratic
+
+    def __repr__(self):
+        return "<%s %r>" % (self.__class__.__name__, self.max_err)
+
+    def filterContour(self, contour):
+        max_err = self.max_err
+        stats = self.stats
+        all_quadratic = self.all_quadratic
+        result = []
+        current_pt = None
+        for operator, points in contour:
+            if operator != "curveTo" or len(points) < 3:
+                if operator == "curveTo":
+                    operator = "qCurveTo"
+                result.append((operator, points))
+                current_pt = points[-1] if points else None
+                continue
+            if len(points) == 3:
+                segments = (points,)
+            else:
+                segments = decomposeSuperBezierSegment(points)
+            for pt1, pt2, pt3 in segments:
+                quad = curve_to_quadratic(
+                    (current_pt, pt1, pt2, pt3), max_err, all_quadratic
+                )
+                if stats is not None:
+                    n = str(len(quad) - 2)
+                    stats[n] = stats.get(n, 0) + 1
+                if all_quadratic or len(quad) == 3:
+                    result.append(("qCurveTo", tuple(quad[1:])))
+                else:
+                    result.append(("curveTo", tuple(quad[1:])))
+                current_pt = quad[-1]
+        return result
+
+    def filterComponent(self, glyphName, transformation):
+        return glyphName, transformation
+
+
+class _ReverseFilter:
+    def __init__(self, outputImpliedClosingLine):
+        self.outputImpliedClosingLine = outputImpliedClosingLine
+
+    def __repr__(self):
+        return "<%s>" % self.__class__.__name__
+
+    def filterContour(self, contour):
+        return list(reversedContour(contour, self.outputImpliedClosingLine))
+
+    def filterComponent(self, glyphName, transformation):
+        return glyphName, transformation
+
+
+class _RoundingFilter:
+    def __init__(self, roundFunc, transformRoundFunc):
+        self.roundFunc = roundFunc
+        self.transformRoundFunc = transformRoundFunc
+
+    def __repr__(self):
+        return "<%s>" % self.__class__.__name__
+
+    def filterContour(self, contour):
+        roundFunc = self.roundFunc
+        return [
+            (
+                operator,
+                tuple(
+                    (roundFunc(pt[0]), roundFunc(pt[1])) if pt is not None else None
+                    for pt in points
+                ),
+            )
+            for operator, points in contour
+        ]
+
+    def filterComponent(self, glyphName, transformation):
+        xx, xy, yx, yy, dx, dy = transformation
+        transformRoundFunc = self.transformRoundFunc
+        return glyphName, Transform(
+            transformRoundFunc(xx),
+            transformRoundFunc(xy),
+            transformRoundFunc(yx),
+            transformRoundFunc(yy),
+            self.roundFunc(dx),
+            self.roundFunc(dy),
+        )
+
+
+# The functions returning the contour filter of each known filter pen class,
+# or None if the pen doesn't modify the outline.
+_filterCompilers = {
+    FilterPen: lambda pen: None,
+    TransformPen: lambda pen: _TransformFilter(pen._transformation),
+    Cu2QuPen: lambda pen: _Cu2QuFilter(pen.max_err, pen.stats, pen.all_quadratic),
+    ReverseContourPen: lambda pen: _ReverseFilter(pen.outputImpliedClosingLine),
+    RoundingPen: lambda pen: _RoundingFilter(pen.roundFunc, pen.transformRoundFunc),
+}
+
+
+if __name__ == "__main__":
+    import doctest
+    import sys
+
+    sys.exit(doctest.testmod().failed)
@@ -1,12 +1,16 @@
 """Pen recording operations that can be accessed or replayed."""
 
+from fontTools.misc.transform import Transform
 from fontTools.pens.basePen import AbstractPen, DecomposingPen
 from fontTools.pens.pointPen import AbstractPointPen, DecomposingPointPen
+from array import array
 
 __all__ = [
     "replayRecording",
     "RecordingPen",
     "DecomposingRecordingPen",
+    "CompactRecordingPen",
+    "DecomposingCompactRecordingPen",
     "DecomposingRecordingPointPen",
     "RecordingPointPen",
     "lerpRecordings",
@@ -139,6 +143,223 @@ class DecomposingRecordingPen(DecomposingPen, RecordingPen):
     skipMissingComponents = False
 
 
+# The operators of CompactRecordingPen; a qCurveTo whose last point is None
+# (a closed contour without on-curve points) has its own operator, and the
+# None isn't stored.
+_MOVE_TO = 0
+_LINE_TO = 1
+_QCURVE_TO = 2
+_QCURVE_TO_IMPLIED = 3
+_CURVE_TO = 4
+_CLOSE_PATH = 5
+_END_PATH = 6
+_ADD_COMPONENT = 7
+_ADD_VAR_COMPONENT = 8
+
+_OPERATOR_NAMES = (
+    "moveTo",
+    "lineTo",
+    "qCurveTo",
+    "qCurveTo",
+    "curveTo",
+    "closePath",
+    "endPath",
+    "addComponent",
+    "addVarComponent",
+)
+
+
+class CompactRecordingPen(AbstractPen):
+    """Same as RecordingPen, but with a much smaller memory footprint.
+
+    Instead of a list of tuples, the operators are stored in a bytearray,
+    the number of points of each operator in an ``array('L')`` and all the
+    coordinates in a single flat ``array('d')``; only the arguments of the
+    components are kept as Python objects.
+
+    The ``value`` property returns (and can be assigned) a recording in the
+    same format as ``RecordingPen.value``, except that the coordinates are
+    floats. The recordings can be replayed, transformed, interpolated and
+    compared without building that list::
+
+        >>> pen = CompactRecordingPen()
+        >>> pen.moveTo((0, 0))
+        >>> pen.curveTo((1, 1), (2, 2), (3, 3))
+        >>> pen.closePath()
+        >>> pen.value
+        [('moveTo', ((0.0, 0.0),)), ('curveTo', ((1.0, 1.0), (2.0, 2.0), (3.0, 3.0))), ('closePath', ())]
+        >>> pen.transform((2, 0, 0, 2, 10, 0)).value[1]
+        ('curveTo', ((12.0, 2.0), (14.0, 4.0), (16.0, 6.0)))
+        >>> pen.lerp(pen.transform((2, 0, 0, 2, 10, 0))).value[1]
+        ('curveTo', ((6.5, 1.5), (8.0, 3.0), (9.5, 4.5)))
+        >>> pen == pen.transform((1, 0, 0, 1, 0, 0))
+        True
+    """
+
+    def __init__(self):
+        self.operators = bytearray()
+        self.pointCounts = array("L")
+        self.coordinates = array("d")
+        self.components = []
+
+    def _addPoints(self, operator, points):
+        self.operators.append(operator)
+        self.pointCounts.append(len(points))
+        coordinates = self.coordinates
+        for x, y in points:
+            coordinates.append(x)
+            coordinates.append(y)
+
+    def moveTo(self, p0):
+        self._addPoints(_MOVE_TO, (p0,))
+
+    def lineTo(self, p1):
+        self._addPoints(_LINE_TO, (p1,))
+
+    def qCurveTo(self, *points):
+        if points and points[-1] is None:
+            self._addPoints(_QCURVE_TO_IMPLIED, points[:-1])
+        else:
+            self._addPoints(_QCURVE_TO, points)
+
+    def curveTo(self, *points):
+        self._addPoints(_CURVE_TO, points)
+
+    def closePath(self):
+        self.operators.append(_CLOSE_PATH)
+        self.pointCounts.append(0)
+
+    def endPath(self):
+        self.operators.append(_END_PATH)
+        self.pointCounts.append(0)
+
+    def addComponent(self, glyphName, transformation):
+        self.operators.append(_ADD_COMPONENT)
+        self.pointCounts.append(0)
+        self.components.append((glyphName, transformation))
+
+    def addVarComponent(self, glyphName, transformation, location):
+        self.operators.append(_ADD_VAR_COMPONENT)
+        self.pointCounts.append(0)
+        self.components.append((glyphName, transformation, location))
+
+    def __iter__(self):
+        it = iter(self.coordinates)
+        points = list(zip(it, it))
+        components = iter(self.components)
+        i = 0
+        for operator, count in zip(self.operators, self.pointCounts):
+            if operator >= _ADD_COMPONENT:
+                yield _OPERATOR_NAMES[operator], next(components)
+                continue
+            j = i + count
+            operands = tuple(points[i:j])
+            i = j
+            if operator == _QCURVE_TO_IMPLIED:
+                operands += (None,)
+            yield _OPERATOR_NAMES[operator], operands
+
+    def __len__(self):
+        return len(self.operators)
+
+    @property
+    def value(self):
+        return list(self)
+
+    @value.setter
+    def value(self, value):
+        CompactRecordingPen.__init__(self)
+        replayRecording(value, self)
+
+    def replay(self, pen):
+        methods = {}
+        for operator, operands in self:
+            try:
+                method = methods[operator]
+            except KeyError:
+                method = methods[operator] = getattr(pen, operator)
+            method(*operands)
+
+    draw = replay
+
+    def __eq__(self, other):
+        if not isinstance(other, CompactRecordingPen):
+            return NotImplemented
+        return (
+            self.operators == other.operators
+            and self.pointCounts == other.pointCounts
+            and self.coordinates == other.coordinates
+            and self.components == other.components
+        )
+
+    def _copyWithCoordinates(self, coordinates, components=None):
+        pen = self.__class__.__new__(self.__class__)
+        pen.__dict__.update(self.__dict__)
+        pen.operators = bytearray(self.operators)
+        pen.pointCounts = array("L", self.pointCounts)
+        pen.coordinates = coordinates
+        pen.components = list(self.components if components is None else components)
+        return pen
+
+    def transform(self, transformation):
+        """Return a new pen with the recording transformed by an affine
+        transformation (a Transform or a 6-tuple)."""
+        if not isinstance(transformation, Transform):
+            transformation = Transform(*transformation)
+        xx, xy, yx, yy, dx, dy = transformation
+        coordinates = self.coordinates
+        xs = coordinates[0::2]
+        ys = coordinates[1::2]
+        transformed = array("d", bytes(len(coordinates) * coordinates.itemsize))
+        transformed[0::2] = array("d", [xx * x + yx * y + dx for x, y in zip(xs, ys)])
+        transformed[1::2] = array("d", [xy * x + yy * y + dy for x, y in zip(xs, ys)])
+        components = [
+            (glyphName, transformation.transform(t), *rest)
+            for glyphName, t, *rest in self.components
+        ]
+        return self._copyWithCoordinates(transformed, components)
+
+    def lerp(self, other, factor=0.5):
+        """Return a new pen with the recording linearly interpolated between
+        this one and another one, like :func:`lerpRecordings`. The recordings
+        must be decomposed, i.e. they must not contain any components.
+        """
+        if len(self.operators) != len(other.operators):
+            raise ValueError(
+                "Mismatched lengths: %d and %d"
+                % (len(self.operators), len(other.operators))
+            )
+        if self.components or other.components:
+            raise ValueError("Cannot interpolate components")
+        if self.operators != other.operators:
+            for op1, op2 in zip(self.operators, other.operators):
+                if op1 != op2:
+                    raise ValueError(
+                        "Mismatched operations: %s, %s"
+                        % (_OPERATOR_NAMES[op1], _OPERATOR_NAMES[op2])
+                    )
+        if self.pointCounts != other.pointCounts:
+            raise ValueError("Mismatched number of points")
+        coordinates = array(
+            "d",
+            [
+                v1 + (v2 - v1) * factor
+                for v1, v2 in zip(self.coordinates, other.coordinates)
+            ],
+        )
+        return self._copyWithCoordinates(coordinates)
+
+
+class DecomposingCompactRecordingPen(DecomposingPen, CompactRecordingPen):
+    """Same as CompactRecordingPen, except that it doesn't keep components
+    as references, but draws them decomposed as regular contours, like
+    DecomposingRecordingPen.
+    """
+
+    # raises MissingComponentError(KeyError) if base glyph is not found in glyphSet
+    skipMissingComponents = False
+
+
 class RecordingPointPen(AbstractPointPen):
     """PointPen recording operations that can be accessed or replayed.
 
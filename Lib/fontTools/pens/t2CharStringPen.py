@@ -3,12 +3,20 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, List, Tuple
+from array import array
+from math import floor
+from typing import Any, Dict, List, Sequence, Tuple
 
 from fontTools.cffLib.specializer import commandsToProgram, specializeCommands
 from fontTools.misc.psCharStrings import T2CharString
 from fontTools.misc.roundTools import otRound, roundFunc
-from fontTools.pens.basePen import BasePen
+from fontTools.pens.basePen import BasePen, decomposeQuadraticSegment
+from fontTools.ttLib.tables._g_l_y_f import (
+    Glyph,
+    GlyphCoordinates,
+    flagCubic,
+    flagOnCurve,
+)
 
 
 class T2CharStringPen(BasePen):
@@ -86,3 +94,137 @@ class T2CharStringPen(BasePen):
             program=program, private=private, globalSubrs=globalSubrs
         )
         return charString
+
+
+def charStringFromArrays(
+    coordinates: Sequence[Tuple[float, float]],
+    flags: Sequence[int],
+    endPtsOfContours: Sequence[int],
+    width: float | None,
+    *,
+    private: Dict | None = None,
+    globalSubrs: List | None = None,
+    roundTolerance: float = 0.5,
+    CFF2: bool = False,
+    optimize: bool = True,
+) -> T2CharString:
+    """Return a T2CharString built directly from the arrays of the points of
+    a glyph, without drawing them with a pen segment by segment.
+
+    The points are described like those of a ``glyf`` glyph: ``flags`` has
+    bit 0x01 set for the on-curve points, and bit 0x80 set for the cubic
+    off-curve points; off-curve points without it are quadratic, and are
+    converted to cubic curves. ``endPtsOfContours`` are the indices of the
+    last point of each contour. ``coordinates`` can be a list of (x, y)
+    tuples or an (N, 2) NumPy array.
+
+    The result is the same as drawing the equivalent
+    :class:`fontTools.ttLib.tables._g_l_y_f.Glyph` with a
+    :class:`T2CharStringPen` and calling :meth:`T2CharStringPen.getCharString`
+    with the same arguments.
+    """
+    pen = T2CharStringPen(width, None, roundTolerance=roundTolerance, CFF2=CFF2)
+    if hasattr(coordinates, "tolist"):
+        coordinates = coordinates.tolist()
+    points = list(coordinates)
+    flags = [int(flag) for flag in flags]
+    if len(flags) != len(points):
+        raise ValueError(f"Expected {len(points)} flags, found {len(flags)}.")
+    round = pen.round
+    if round is otRound:
+        rounded = [(floor(x + 0.5), floor(y + 0.5)) for x, y in points]
+    else:
+        rounded = [(round(x), round(y)) for x, y in points]
+    start = 0
+    for end in endPtsOfContours:
+        end += 1
+        if end <= start:
+            raise ValueError("Invalid contour end points.")
+        _drawContour(pen, points, rounded, flags, start, end)
+        start = end
+    if start != len(points):
+        raise ValueError("Invalid contour end points.")
+    return pen.getCharString(private, globalSubrs, optimize)
+
+
+def _drawContour(pen, points, rounded, flags, start, end):
+    # Draw the points[start:end] contour like Glyph.draw would, appending the
+    # commands to the pen directly.
+    first = next((i for i in range(start, end) if flags[i] & flagOnCurve), None)
+    if first is None:
+        _drawContourWithGlyph(pen, points[start:end], flags[start:end])
+        return
+    # the contour is rotated so that it ends with its first on-curve point,
+    # used for the moveto
+    indices = list(range(first + 1, end)) + list(range(start, first + 1))
+
+    commands = pen._commands
+    mark = len(commands)
+    x0, y0 = pen._p0
+    x, y = rounded[first]
+    commands.append(("rmoveto", [x - x0, y - y0]))
+    x0, y0 = x, y
+    current = points[first]
+    offCurves = []
+    anyCubic = 0
+    allCubic = flagCubic
+    for i in indices:
+        flag = flags[i]
+        if not flag & flagOnCurve:
+            offCurves.append(i)
+            anyCubic |= flag
+            allCubic &= flag
+            continue
+        if not offCurves:
+            if i == first:
+                # the final line is implied by the closepath
+                break
+            x, y = rounded[i]
+            commands.append(("rlineto", [x - x0, y - y0]))
+            x0, y0 = x, y
+        elif anyCubic & flagCubic:
+            if len(offCurves) != 2 or not allCubic:
+                # leave the cubic runs with implied on-curve points (and the
+                # invalid ones) to Glyph.draw
+                del commands[mark:]
+                _drawContourWithGlyph(pen, points[start:end], flags[start:end])
+                return
+            x1, y1 = rounded[offCurves[0]]
+            x2, y2 = rounded[offCurves[1]]
+            x, y = rounded[i]
+            commands.append(
+                ("rrcurveto", [x1 - x0, y1 - y0, x2 - x1, y2 - y1, x - x2, y - y2])
+            )
+            x0, y0 = x, y
+        else:
+            # convert to cubic curves like BasePen._qCurveToOne
+            round = pen.round
+            quadSegment = [points[j] for j in offCurves]
+            quadSegment.append(points[i])
+            for (pt1x, pt1y), pt2 in decomposeQuadraticSegment(quadSegment):
+                pt0x, pt0y = current
+                pt2x, pt2y = pt2
+                x1 = round(pt0x + 0.66666666666666667 * (pt1x - pt0x))
+                y1 = round(pt0y + 0.66666666666666667 * (pt1y - pt0y))
+                x2 = round(pt2x + 0.66666666666666667 * (pt1x - pt2x))
+                y2 = round(pt2y + 0.66666666666666667 * (pt1y - pt2y))
+                x, y = round(pt2x), round(pt2y)
+                commands.append(
+                    ("rrcurveto", [x1 - x0, y1 - y0, x2 - x1, y2 - y1, x - x2, y - y2])
+                )
+                x0, y0 = x, y
+                current = pt2
+        current = points[i]
+        offCurves = []
+        anyCubic = 0
+        allCubic = flagCubic
+    pen._p0 = (x0, y0)
+
+
+def _drawContourWithGlyph(pen, contour, flags):
+    glyph = Glyph()
+    glyph.numberOfContours = 1
+    glyph.coordinates = GlyphCoordinates(contour)
+    glyph.flags = array("B", flags)
+    glyph.endPtsOfContours = [len(contour) - 1]
+    glyph.draw(pen, None)
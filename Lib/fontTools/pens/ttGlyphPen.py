@@ -1,5 +1,5 @@
 from array import array
-from typing import Any, Callable, Dict, Optional, Tuple
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
 from fontTools.misc.fixedTools import MAX_F2DOT14, floatToFixedToFloat
 from fontTools.misc.loggingTools import LogMixin
 from fontTools.pens.pointPen import AbstractPointPen
@@ -14,7 +14,7 @@ from fontTools.ttLib.tables._g_l_y_f import GlyphCoordinates
 from fontTools.ttLib.tables._g_l_y_f import dropImpliedOnCurvePoints
 import math
 
-__all__ = ["TTGlyphPen", "TTGlyphPointPen"]
+__all__ = ["TTGlyphPen", "TTGlyphPointPen", "glyphFromArrays"]
 
 
 class _TTGlyphBasePen:
@@ -332,3 +332,63 @@ class TTGlyphPointPen(_TTGlyphBasePen, LogMixin, AbstractPointPen):
             raise AssertionError(segmentType)
 
         self.points.append(pt)
+
+
+def glyphFromArrays(
+    coordinates: Sequence[Tuple[float, float]],
+    flags: Sequence[int],
+    endPtsOfContours: Sequence[int],
+    dropImpliedOnCurves: bool = False,
+    *,
+    round: Callable[[float], int] = otRound,
+) -> Glyph:
+    """
+    Returns a simple :py:class:`~._g_l_y_f.Glyph` object built directly from
+    the arrays of its points, without drawing them with a pen.
+
+    This is the same glyph as the one returned by ``TTGlyphPen.glyph()``
+    after drawing the contours, but faster to build for fonts with
+    many glyphs from a columnar source.
+
+    Args:
+        coordinates: The (x, y) coordinates of the points, e.g. a list of
+            tuples or an (N, 2) NumPy array.
+
+        flags: The flags of the points: ``flagOnCurve`` (0x01) for on-curve
+            points, 0 for quadratic off-curve points, ``flagCubic`` (0x80)
+            for cubic off-curve points.
+
+        endPtsOfContours: The index of the last point of each contour.
+
+        dropImpliedOnCurves: Whether to remove implied-oncurve points. (default: False)
+
+        round: The function used to round the coordinates to integers.
+    """
+    flags = array("B", flags)
+    endPtsOfContours = [int(endPt) for endPt in endPtsOfContours]
+    glyph = Glyph()
+    if hasattr(coordinates, "astype"):
+        # NumPy array: copy the coordinates all at once
+        if coordinates.ndim != 2 or coordinates.shape[1] != 2:
+            raise PenError(f"Expected (N, 2) coordinates, found {coordinates.shape}.")
+        glyph.coordinates = GlyphCoordinates()
+        glyph.coordinates.array.frombytes(coordinates.astype("d").tobytes())
+    else:
+        glyph.coordinates = GlyphCoordinates(coordinates)
+    numPoints = len(glyph.coordinates)
+    if len(flags) != numPoints:
+        raise PenError(f"Expected {numPoints} flags, found {len(flags)}.")
+    if (endPtsOfContours[-1] if endPtsOfContours else -1) != numPoints - 1 or any(
+        endPt <= prevEndPt
+        for prevEndPt, endPt in zip([-1] + endPtsOfContours, endPtsOfContours)
+    ):
+        raise PenError("Invalid contour end points.")
+    glyph.flags = flags
+    glyph.endPtsOfContours = endPtsOfContours
+    glyph.numberOfContours = len(endPtsOfContours)
+    glyph.program = ttProgram.Program()
+    glyph.program.fromBytecode(b"")
+    if dropImpliedOnCurves:
+        dropImpliedOnCurvePoints(glyph)
+    glyph.coordinates.toInt(round=round)
+    return glyph
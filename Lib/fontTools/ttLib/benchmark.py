@@ -0,0 +1,89 @@
+"""Benchmark the performance of WOFF2 encoding and decoding.
+
+The 'glyf' table transform and the brotli (de)compression of the whole font
+data are timed separately.
+
+Usage: python -m fontTools.ttLib.benchmark FONT [REPEAT]
+"""
+
+from fontTools.ttLib import TTFont
+from fontTools.ttLib.woff2 import WOFF2GlyfTable, WOFF2Reader, brotli
+from fontTools.ttLib.woff2Triplets import COMPILED
+from io import BytesIO
+import sys
+import timeit
+
+
+def setup_glyf(path):
+    font = TTFont(path)
+    glyfTable = WOFF2GlyfTable()
+    glyfTable.decompile(font.getTableData("glyf"), font)
+    glyfTable.ensureDecompiled()
+    return glyfTable, font
+
+
+def setup_transformed_glyf(path):
+    glyfTable, font = setup_glyf(path)
+    return glyfTable.transform(font), font
+
+
+def setup_font_data(path):
+    font = TTFont(path)
+    font.flavor = "woff2"
+    buf = BytesIO()
+    font.save(buf)
+    buf.seek(0)
+    return WOFF2Reader(buf).transformBuffer.getvalue()
+
+
+def setup_compressed_font_data(path):
+    return brotli.compress(setup_font_data(path), mode=brotli.MODE_FONT)
+
+
+def transform_glyf(data):
+    glyfTable, font = data
+    glyfTable.transform(font)
+
+
+def reconstruct_glyf(data):
+    transformedData, font = data
+    WOFF2GlyfTable().reconstruct(transformedData, font)
+
+
+def brotli_compress(data):
+    brotli.compress(data, mode=brotli.MODE_FONT)
+
+
+def brotli_decompress(data):
+    brotli.decompress(data)
+
+
+def run_benchmark(path, function, setup, repeat=3):
+    print("%s:" % function, end="")
+    function = globals()[function]
+    setup = globals()["setup_" + setup]
+    results = []
+    for _ in range(repeat):
+        data = setup(path)
+        results.append(timeit.timeit(lambda: function(data), number=1))
+    print("\t%8.1fms" % (min(results) * 1000.0))
+
+
+def main(args=None):
+    if args is None:
+        args = sys.argv[1:]
+    if not args:
+        print(__doc__, file=sys.stderr)
+        return 2
+    path = args[0]
+    repeat = int(args[1]) if len(args) > 1 else 3
+    print("woff2Triplets compiled: %s" % COMPILED)
+    if "glyf" in TTFont(path):
+        run_benchmark(path, "transform_glyf", "glyf", repeat)
+        run_benchmark(path, "reconstruct_glyf", "transformed_glyf", repeat)
+    run_benchmark(path, "brotli_compress", "font_data", repeat)
+    run_benchmark(path, "brotli_decompress", "compressed_font_data", repeat)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,148 @@
+"""Glyph bounds and outline statistics shared by the tables that recalculate
+them when a font is compiled.
+
+The ``head``, ``hhea``, ``vhea`` and ``maxp`` tables (and the ``CFF `` table
+for its ``FontBBox``) all need the bounds of every glyph of the font when
+:attr:`TTFont.recalcBBoxes` is true. :meth:`TTFont.save` creates a
+:class:`FontMetrics` for the duration of the save, so that these are computed
+once, in component order for composite glyphs, and shared by all the tables:
+most importantly, each CFF charstring is only drawn once instead of once per
+table.
+
+Outside of a save, :func:`getFontMetrics` returns a new, unshared
+:class:`FontMetrics`, so that calling e.g. ``font["hhea"].recalc(font)``
+after modifying glyphs uses up-to-date values.
+"""
+
+from fontTools.misc.arrayTools import unionRect
+from fontTools.ttLib import TTLibError
+
+__all__ = ["FontMetrics", "getFontMetrics"]
+
+
+class FontMetrics:
+    """The memoized glyph bounds of a font with ``glyf``, ``CFF `` or
+    ``CFF2`` outlines.
+
+    The bounds of ``glyf`` glyphs are the integer ``xMin``, ``yMin``,
+    ``xMax`` and ``yMax`` attributes of the glyphs, those of CFF glyphs are
+    the exact floating point bounds of the charstrings, which are memoized.
+
+    The glyphs must not be modified while a :class:`FontMetrics` is used.
+    """
+
+    def __init__(self, ttFont):
+        self.ttFont = ttFont
+        # the names of the glyf glyphs whose bounds were recalculated, shared
+        # with table__g_l_y_f.compile
+        self.boundsDone = set()
+        self._glyphBounds = {}
+        self._fontBounds = None
+        self._compositeMaxpValues = {}
+        self._charStrings = None
+
+    @property
+    def charStrings(self):
+        """The CharStrings of the ``CFF `` or ``CFF2`` table, or None."""
+        if self._charStrings is None:
+            ttFont = self.ttFont
+            for tag in ("CFF ", "CFF2"):
+                if tag in ttFont:
+                    topDict = ttFont[tag].cff.topDictIndex[0]
+                    self._charStrings = topDict.CharStrings
+                    break
+        return self._charStrings
+
+    def glyphBounds(self, glyphName):
+        """Return the ``(xMin, yMin, xMax, yMax)`` bounds of a glyph, or None
+        if it has no outline."""
+        if "glyf" in self.ttFont:
+            # the bounds are stored in the glyphs (and recalculated by
+            # table__g_l_y_f.compile), there is nothing to memoize
+            return self._calcGlyfBounds(glyphName)
+        try:
+            return self._glyphBounds[glyphName]
+        except KeyError:
+            pass
+        charStrings = self.charStrings
+        bounds = self._glyphBounds[glyphName] = charStrings[glyphName].calcBounds(
+            charStrings
+        )
+        return bounds
+
+    def _calcGlyfBounds(self, glyphName):
+        glyfTable = self.ttFont["glyf"]
+        g = glyfTable[glyphName]
+        if g.numberOfContours == 0:
+            return None
+        if g.numberOfContours < 0 and not hasattr(g, "xMax"):
+            # Composite glyph without extents set; the bounds of the
+            # components are only calculated once.
+            g.recalcBounds(glyfTable, boundsDone=self.boundsDone)
+            self.boundsDone.add(glyphName)
+        return g.xMin, g.yMin, g.xMax, g.yMax
+
+    def fontBounds(self):
+        """Return the union of the bounds of all the glyphs, or None if no
+        glyph has an outline."""
+        if self._fontBounds is not None and "glyf" not in self.ttFont:
+            return self._fontBounds[0]
+        fontBounds = None
+        for glyphName in self.ttFont.getGlyphOrder():
+            bounds = self.glyphBounds(glyphName)
+            if bounds is not None:
+                if fontBounds is not None:
+                    fontBounds = unionRect(fontBounds, bounds)
+                else:
+                    fontBounds = bounds
+        self._fontBounds = (fontBounds,)
+        return fontBounds
+
+    def compositeMaxpValues(self, glyphName):
+        """Return the number of points and contours, and the component depth
+        of a composite ``glyf`` glyph, like
+        :meth:`fontTools.ttLib.tables._g_l_y_f.Glyph.getCompositeMaxpValues`.
+
+        The values of the nested composite glyphs are only calculated once.
+        """
+        try:
+            return self._compositeMaxpValues[glyphName]
+        except KeyError:
+            pass
+        glyfTable = self.ttFont["glyf"]
+        glyph = glyfTable[glyphName]
+        assert glyph.isComposite()
+        nPoints = nContours = 0
+        maxComponentDepth = 1
+        for compo in glyph.components:
+            baseGlyph = glyfTable[compo.glyphName]
+            if baseGlyph.numberOfContours == 0:
+                continue
+            elif baseGlyph.numberOfContours > 0:
+                nP, nC = baseGlyph.getMaxpValues()
+            else:
+                try:
+                    nP, nC, componentDepth = self.compositeMaxpValues(compo.glyphName)
+                except RecursionError:
+                    raise TTLibError(
+                        "glyph '%s' contains a recursive component reference"
+                        % compo.glyphName
+                    )
+                maxComponentDepth = max(maxComponentDepth, componentDepth + 1)
+            nPoints += nP
+            nContours += nC
+        values = self._compositeMaxpValues[glyphName] = (
+            nPoints,
+            nContours,
+            maxComponentDepth,
+        )
+        return values
+
+
+def getFontMetrics(ttFont):
+    """Return the :class:`FontMetrics` shared by the tables of ``ttFont``
+    while it is being saved, or a new one."""
+    fontMetrics = getattr(ttFont, "_fontMetrics", None)
+    if fontMetrics is None:
+        fontMetrics = FontMetrics(ttFont)
+    return fontMetrics
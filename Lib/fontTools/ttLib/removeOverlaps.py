@@ -1,10 +1,18 @@
 """Simplify TrueType glyphs by merging overlapping contours/components.
 
 Requires https://github.com/fonttools/skia-pathops
+
+The glyphs can be simplified in a pool of worker processes (``jobs``); the
+outlines are sent to the workers in batches of compact recordings, and the
+workers return the compiled glyph data (or charstring programs). The
+``skipNonOverlapping`` option enables a cheap test of the contour bounding
+boxes and segments, which skips simplifying the glyphs that can't contain
+overlaps.
 """
 
 import itertools
 import logging
+import os
 from typing import Callable, Iterable, Optional, Mapping
 
 from fontTools.cffLib import CFFFontSet
@@ -13,6 +21,7 @@ from fontTools.ttLib.tables import _g_l_y_f
 from fontTools.ttLib.tables import _h_m_t_x
 from fontTools.misc.psCharStrings import T2CharString
 from fontTools.misc.roundTools import otRound, noRound
+from fontTools.pens.recordingPen import CompactRecordingPen
 from fontTools.pens.ttGlyphPen import TTGlyphPen
 from fontTools.pens.t2CharStringPen import T2CharStringPen
 
@@ -29,6 +38,14 @@ log = logging.getLogger("fontTools.ttLib.removeOverlaps")
 
 _TTGlyphMapping = Mapping[str, ttFont._TTGlyph]
 
+# number of glyphs sent to a worker process at once
+_BATCH_SIZE = 32
+
+_LINE = pathops.PathVerb.LINE
+_QUAD = pathops.PathVerb.QUAD
+_CUBIC = pathops.PathVerb.CUBIC
+_CLOSE = pathops.PathVerb.CLOSE
+
 
 def skPathFromGlyph(glyphName: str, glyphSet: _TTGlyphMapping) -> pathops.Path:
     path = pathops.Path()
@@ -83,18 +100,174 @@ def ttfGlyphFromSkPath(path: pathops.Path) -> _g_l_y_f.Glyph:
     return glyph
 
 
+def _charStringWidth(charString: T2CharString) -> Optional[float]:
+    if charString.width == charString.private.defaultWidthX:
+        return None
+    return charString.width - charString.private.nominalWidthX
+
+
 def _charString_from_SkPath(
     path: pathops.Path, charString: T2CharString
 ) -> T2CharString:
-    if charString.width == charString.private.defaultWidthX:
-        width = None
-    else:
-        width = charString.width - charString.private.nominalWidthX
-    t2Pen = T2CharStringPen(width=width, glyphSet=None)
+    t2Pen = T2CharStringPen(width=_charStringWidth(charString), glyphSet=None)
     path.draw(t2Pen)
     return t2Pen.getCharString(charString.private, charString.globalSubrs)
 
 
+def _recordSkPath(path: pathops.Path) -> CompactRecordingPen:
+    # Record the verbs of the path as they are, so that the path drawn from
+    # the recording is identical (the pathops pen decomposes qCurveTo with
+    # implied on-curve points, and path.draw() creates them).
+    rec = CompactRecordingPen()
+    for contour in path.contours:
+        closed = False
+        for verb, points in contour:
+            if verb == pathops.PathVerb.MOVE:
+                rec.moveTo(*points)
+            elif verb == pathops.PathVerb.LINE:
+                rec.lineTo(*points)
+            elif verb == pathops.PathVerb.QUAD:
+                rec.qCurveTo(*points)
+            elif verb == pathops.PathVerb.CUBIC:
+                rec.curveTo(*points)
+            elif verb == pathops.PathVerb.CLOSE:
+                closed = True
+            else:
+                raise RemoveOverlapsError(f"Unsupported path verb: {verb!r}")
+        if closed:
+            rec.closePath()
+        else:
+            rec.endPath()
+    return rec
+
+
+def _skPathFromRecording(rec: CompactRecordingPen) -> pathops.Path:
+    path = pathops.Path()
+    rec.replay(path.getPen())
+    return path
+
+
+def _cross(a, b, c):
+    return (b[0] - a[0]) * (c[1] - b[1]) - (b[1] - a[1]) * (c[0] - b[0])
+
+
+def _dot(a, b, c):
+    return (b[0] - a[0]) * (c[0] - b[0]) + (b[1] - a[1]) * (c[1] - b[1])
+
+
+def _cubicMaySelfIntersect(pts) -> bool:
+    # A cubic curve doesn't intersect itself if its control polygon is convex,
+    # or if it is a straight line that doesn't fold back.
+    points = [pts[0]]
+    for pt in pts[1:]:
+        if pt != points[-1]:
+            points.append(pt)
+    if len(points) <= 2:
+        return False
+    if points[-1] == points[0]:
+        return True
+    straight = True
+    for a, b, c in zip(points, points[1:], points[2:]):
+        if _cross(a, b, c) != 0:
+            straight = False
+        elif _dot(a, b, c) < 0:
+            return True
+    if straight:
+        return False
+    n = len(points)
+    signs = set()
+    for i in range(n):
+        cross = _cross(points[i - 2], points[i - 1], points[i])
+        if cross:
+            signs.add(cross > 0)
+    return len(signs) > 1
+
+
+def _contourMaySelfIntersect(contour: pathops.Path) -> bool:
+    if contour.isConvex:
+        return False
+    # the (xMin, yMin, xMax, yMax, endPt) tuples of the segments, with the
+    # bounds of their control points
+    segments = []
+    points = contour.points
+    startPt = currentPt = points[0]
+    i = 1
+    for verb in contour.verbs[1:]:
+        if verb is _LINE:
+            segmentPoints = (currentPt, points[i])
+        elif verb is _QUAD:
+            segmentPoints = (currentPt, points[i], points[i + 1])
+        elif verb is _CUBIC:
+            segmentPoints = (currentPt,) + tuple(points[i : i + 3])
+            if _cubicMaySelfIntersect(segmentPoints):
+                return True
+        elif verb is _CLOSE and currentPt != startPt:
+            segmentPoints = (currentPt, startPt)
+        else:
+            continue
+        i += len(segmentPoints) - 1
+        xs = [pt[0] for pt in segmentPoints]
+        ys = [pt[1] for pt in segmentPoints]
+        currentPt = segmentPoints[-1]
+        segments.append((min(xs), min(ys), max(xs), max(ys), currentPt))
+
+    # Sweep the control point bounding boxes of the segments along the x axis:
+    # segments whose boxes are disjoint don't intersect, and neither do
+    # consecutive segments whose boxes only meet at their common point.
+    n = len(segments)
+    order = sorted(range(n), key=lambda i: segments[i][0])
+    active = []
+    for i in order:
+        xMin, yMin, xMax, yMax, _ = segments[i]
+        stillActive = []
+        for j in active:
+            xMin2, yMin2, xMax2, yMax2, _ = segments[j]
+            if xMax2 < xMin:
+                continue
+            stillActive.append(j)
+            if yMax2 < yMin or yMax < yMin2:
+                continue
+            if (i - j) % n == 1:
+                commonPt = segments[j][4]
+            elif (j - i) % n == 1:
+                commonPt = segments[i][4]
+            else:
+                return True
+            if (
+                max(xMin, xMin2) != min(xMax, xMax2)
+                or max(yMin, yMin2) != min(yMax, yMax2)
+                or (max(xMin, xMin2), max(yMin, yMin2)) != commonPt
+            ):
+                return True
+        stillActive.append(i)
+        active = stillActive
+    return False
+
+
+def _mayOverlap(path: pathops.Path) -> bool:
+    """Return False if the contours of the path can't overlap each other or
+    themselves, in which case simplifying it would at most normalize it
+    (e.g. merge collinear segments). Open contours, empty contours and
+    contours with different orientations are assumed to overlap."""
+    # the cheap tests first: the orientations and the bounds of the contours
+    contours = list(path.contours)
+    if len({contour.clockwise for contour in contours}) > 1:
+        return True
+    bounds = []
+    for contour in contours:
+        if contour.area == 0 or contour.verbs[-1] is not _CLOSE:
+            return True
+        bounds.append(contour.bounds)
+    bounds.sort()
+    for i, (xMin, yMin, xMax, yMax) in enumerate(bounds):
+        for xMin2, yMin2, xMax2, yMax2 in bounds[i + 1 :]:
+            if xMin2 > xMax:
+                break
+            if yMin2 <= yMax and yMin <= yMax2:
+                return True
+    return any(_contourMaySelfIntersect(contour) for contour in contours)
+
+
 def _round_path(
     path: pathops.Path, round: Callable[[float], float] = otRound
 ) -> pathops.Path:
@@ -147,13 +320,12 @@ def _same_path(path1: pathops.Path, path2: pathops.Path) -> bool:
     return {tuple(c) for c in path1.contours} == {tuple(c) for c in path2.contours}
 
 
-def removeTTGlyphOverlaps(
+def _glyfPathToSimplify(
     glyphName: str,
     glyphSet: _TTGlyphMapping,
     glyfTable: _g_l_y_f.table__g_l_y_f,
-    hmtxTable: _h_m_t_x.table__h_m_t_x,
-    removeHinting: bool = True,
-) -> bool:
+    skipNonOverlapping: bool = False,
+) -> Optional[pathops.Path]:
     glyph = glyfTable[glyphName]
     # decompose composite glyphs only if components overlap each other
     if (
@@ -162,26 +334,96 @@ def removeTTGlyphOverlaps(
         and componentsOverlap(glyph, glyphSet)
     ):
         path = skPathFromGlyph(glyphName, glyphSet)
+        if not skipNonOverlapping or _mayOverlap(path):
+            return path
+    return None
+
+
+def _setSimplifiedTTGlyph(
+    glyphName: str,
+    glyph: _g_l_y_f.Glyph,
+    glyfTable: _g_l_y_f.table__g_l_y_f,
+    hmtxTable: _h_m_t_x.table__h_m_t_x,
+) -> None:
+    glyfTable[glyphName] = glyph
+    # simplified glyph is always unhinted
+    assert not glyph.program
+    # also ensure hmtx LSB == glyph.xMin so glyph origin is at x=0
+    width, lsb = hmtxTable[glyphName]
+    if lsb != glyph.xMin:
+        hmtxTable[glyphName] = (width, glyph.xMin)
 
+
+def removeTTGlyphOverlaps(
+    glyphName: str,
+    glyphSet: _TTGlyphMapping,
+    glyfTable: _g_l_y_f.table__g_l_y_f,
+    hmtxTable: _h_m_t_x.table__h_m_t_x,
+    removeHinting: bool = True,
+    *,
+    skipNonOverlapping: bool = False,
+) -> bool:
+    path = _glyfPathToSimplify(glyphName, glyphSet, glyfTable, skipNonOverlapping)
+    if path is not None:
         # remove overlaps
         path2 = _simplify(path, glyphName)
 
         # replace TTGlyph if simplified path is different (ignoring contour order)
         if not _same_path(path, path2):
-            glyfTable[glyphName] = glyph = ttfGlyphFromSkPath(path2)
-            # simplified glyph is always unhinted
-            assert not glyph.program
-            # also ensure hmtx LSB == glyph.xMin so glyph origin is at x=0
-            width, lsb = hmtxTable[glyphName]
-            if lsb != glyph.xMin:
-                hmtxTable[glyphName] = (width, glyph.xMin)
+            _setSimplifiedTTGlyph(
+                glyphName, ttfGlyphFromSkPath(path2), glyfTable, hmtxTable
+            )
             return True
 
     if removeHinting:
-        glyph.removeHinting()
+        glyfTable[glyphName].removeHinting()
     return False
 
 
+def _simplifyRecordings(batch, isCFF):
+    # Run in the worker processes: simplify the recorded paths of a batch of
+    # glyphs, and return for each glyph the error raised, and the compiled
+    # data of the glyf glyph, or the program of the charstring, or None if
+    # the glyph is unchanged.
+    results = []
+    for glyphName, rec, width in batch:
+        path = _skPathFromRecording(rec)
+        try:
+            path2 = _simplify(path, glyphName, round=noRound if isCFF else otRound)
+        except RemoveOverlapsError as e:
+            results.append((e, None))
+            continue
+        if _same_path(path, path2):
+            results.append((None, None))
+        elif isCFF:
+            t2Pen = T2CharStringPen(width=width, glyphSet=None)
+            path2.draw(t2Pen)
+            results.append((None, t2Pen.getCharString().program))
+        else:
+            results.append((None, ttfGlyphFromSkPath(path2).compile(None)))
+    return results
+
+
+def _simplifyInExecutor(executor, paths, isCFF):
+    # Yield the (glyphName, error, result) tuples of the (glyphName, path,
+    # width) tuples simplified by _simplifyRecordings in the executor.
+    batch = []
+    batches = []
+    for glyphName, path, width in paths:
+        batch.append((glyphName, _recordSkPath(path), width))
+        if len(batch) == _BATCH_SIZE:
+            batches.append(batch)
+            batch = []
+    if batch:
+        batches.append(batch)
+    for batch, results in zip(
+        batches,
+        executor.map(_simplifyRecordings, batches, [isCFF] * len(batches)),
+    ):
+        for (glyphName, _, _), (error, result) in zip(batch, results):
+            yield glyphName, error, result
+
+
 def _remove_glyf_overlaps(
     *,
     font: ttFont.TTFont,
@@ -189,6 +431,8 @@ def _remove_glyf_overlaps(
     glyphSet: _TTGlyphMapping,
     removeHinting: bool,
     ignoreErrors: bool,
+    skipNonOverlapping: bool = False,
+    executor=None,
 ) -> None:
     glyfTable = font["glyf"]
     hmtxTable = font["hmtx"]
@@ -196,28 +440,61 @@ def _remove_glyf_overlaps(
     # process all simple glyphs first, then composites with increasing component depth,
     # so that by the time we test for component intersections the respective base glyphs
     # have already been simplified
-    glyphNames = sorted(
-        glyphNames,
-        key=lambda name: (
-            (
-                glyfTable[name].getCompositeMaxpValues(glyfTable).maxComponentDepth
-                if glyfTable[name].isComposite()
-                else 0
-            ),
-            name,
-        ),
-    )
+    componentDepths = {
+        name: (
+            glyfTable[name].getCompositeMaxpValues(glyfTable).maxComponentDepth
+            if glyfTable[name].isComposite()
+            else 0
+        )
+        for name in glyphNames
+    }
+    glyphNames = sorted(componentDepths, key=lambda name: (componentDepths[name], name))
     modified = set()
-    for glyphName in glyphNames:
-        try:
-            if removeTTGlyphOverlaps(
-                glyphName, glyphSet, glyfTable, hmtxTable, removeHinting
-            ):
-                modified.add(glyphName)
-        except RemoveOverlapsError:
-            if not ignoreErrors:
-                raise
-            log.error("Failed to remove overlaps for '%s'", glyphName)
+    if executor is None:
+        for glyphName in glyphNames:
+            try:
+                if removeTTGlyphOverlaps(
+                    glyphName,
+                    glyphSet,
+                    glyfTable,
+                    hmtxTable,
+                    removeHinting,
+                    skipNonOverlapping=skipNonOverlapping,
+                ):
+                    modified.add(glyphName)
+            except RemoveOverlapsError:
+                if not ignoreErrors:
+                    raise
+                log.error("Failed to remove overlaps for '%s'", glyphName)
+    else:
+        # the glyphs of the same component depth don't depend on each other,
+        # and are simplified together in the worker processes
+        for _, names in itertools.groupby(glyphNames, key=componentDepths.get):
+            paths = []
+            for glyphName in names:
+                path = _glyfPathToSimplify(
+                    glyphName, glyphSet, glyfTable, skipNonOverlapping
+                )
+                if path is None:
+                    if removeHinting:
+                        glyfTable[glyphName].removeHinting()
+                else:
+                    paths.append((glyphName, path, None))
+            for glyphName, error, data in _simplifyInExecutor(executor, paths, False):
+                if error is not None:
+                    if not ignoreErrors:
+                        raise error
+                    log.error("Failed to remove overlaps for '%s'", glyphName)
+                    # like removeTTGlyphOverlaps, leave the glyph as it is
+                    continue
+                elif data is not None:
+                    glyph = _g_l_y_f.Glyph(data)
+                    glyph.expand(glyfTable)
+                    _setSimplifiedTTGlyph(glyphName, glyph, glyfTable, hmtxTable)
+                    modified.add(glyphName)
+                    continue
+                if removeHinting:
+                    glyfTable[glyphName].removeHinting()
 
     log.debug("Removed overlaps for %s glyphs:\n%s", len(modified), " ".join(modified))
 
@@ -227,8 +504,11 @@ def _remove_charstring_overlaps(
     glyphName: str,
     glyphSet: _TTGlyphMapping,
     cffFontSet: CFFFontSet,
+    skipNonOverlapping: bool = False,
 ) -> bool:
     path = skPathFromGlyph(glyphName, glyphSet)
+    if skipNonOverlapping and not _mayOverlap(path):
+        return False
 
     # remove overlaps
     path2 = _simplify(path, glyphName, round=noRound)
@@ -251,21 +531,46 @@ def _remove_cff_overlaps(
     ignoreErrors: bool,
     table_tag: str,
     removeUnusedSubroutines: bool = True,
+    skipNonOverlapping: bool = False,
+    executor=None,
 ) -> None:
     cffFontSet = font[table_tag].cff
     modified = set()
-    for glyphName in glyphNames:
-        try:
-            if _remove_charstring_overlaps(
-                glyphName=glyphName,
-                glyphSet=glyphSet,
-                cffFontSet=cffFontSet,
-            ):
+    if executor is None:
+        for glyphName in glyphNames:
+            try:
+                if _remove_charstring_overlaps(
+                    glyphName=glyphName,
+                    glyphSet=glyphSet,
+                    cffFontSet=cffFontSet,
+                    skipNonOverlapping=skipNonOverlapping,
+                ):
+                    modified.add(glyphName)
+            except RemoveOverlapsError:
+                if not ignoreErrors:
+                    raise
+                log.error("Failed to remove overlaps for '%s'", glyphName)
+    else:
+        charStrings = cffFontSet[0].CharStrings
+        paths = []
+        for glyphName in glyphNames:
+            path = skPathFromGlyph(glyphName, glyphSet)
+            if not skipNonOverlapping or _mayOverlap(path):
+                width = _charStringWidth(charStrings[glyphName])
+                paths.append((glyphName, path, width))
+        for glyphName, error, program in _simplifyInExecutor(executor, paths, True):
+            if error is not None:
+                if not ignoreErrors:
+                    raise error
+                log.error("Failed to remove overlaps for '%s'", glyphName)
+            elif program is not None:
+                charString = charStrings[glyphName]
+                charStrings[glyphName] = T2CharString(
+                    program=program,
+                    private=charString.private,
+                    globalSubrs=charString.globalSubrs,
+                )
                 modified.add(glyphName)
-        except RemoveOverlapsError:
-            if not ignoreErrors:
-                raise
-            log.error("Failed to remove overlaps for '%s'", glyphName)
 
     if not modified:
         log.debug("No overlaps found in the specified CFF glyphs")
@@ -287,6 +592,8 @@ def removeOverlaps(
     ignoreErrors: bool = False,
     *,
     removeUnusedSubroutines: bool = True,
+    skipNonOverlapping: bool = False,
+    jobs: int = 1,
 ) -> None:
     """Simplify glyphs in TTFont by merging overlapping contours.
 
@@ -309,6 +616,14 @@ def removeOverlaps(
         removeUnusedSubroutines (bool): set to False to keep unused subroutines
             in CFF table after removing overlaps. Default is to remove them if
             any glyphs are modified.
+        skipNonOverlapping (bool): set to True to leave unchanged the glyphs whose
+            contours can't overlap, as determined by a quick test of their bounding
+            boxes and segments. Otherwise the paths of all the glyphs are simplified,
+            which also normalizes the glyphs without overlaps (e.g. it removes the
+            redundant points of collinear segments).
+        jobs (int): the number of worker processes simplifying the glyphs, by
+            default the glyphs are simplified in the current process. The result
+            is the same.
     """
 
     if "glyf" not in font and "CFF " not in font and "CFF2" not in font:
@@ -322,6 +637,43 @@ def removeOverlaps(
     # Wraps the underlying glyphs, takes care of interfacing with drawing pens
     glyphSet = font.getGlyphSet()
 
+    if jobs > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(jobs) as executor:
+            _remove_overlaps(
+                font,
+                glyphNames,
+                glyphSet,
+                removeHinting,
+                ignoreErrors,
+                removeUnusedSubroutines,
+                skipNonOverlapping,
+                executor,
+            )
+    else:
+        _remove_overlaps(
+            font,
+            glyphNames,
+            glyphSet,
+            removeHinting,
+            ignoreErrors,
+            removeUnusedSubroutines,
+            skipNonOverlapping,
+            None,
+        )
+
+
+def _remove_overlaps(
+    font,
+    glyphNames,
+    glyphSet,
+    removeHinting,
+    ignoreErrors,
+    removeUnusedSubroutines,
+    skipNonOverlapping,
+    executor,
+):
     if "glyf" in font:
         _remove_glyf_overlaps(
             font=font,
@@ -329,6 +681,8 @@ def removeOverlaps(
             glyphSet=glyphSet,
             removeHinting=removeHinting,
             ignoreErrors=ignoreErrors,
+            skipNonOverlapping=skipNonOverlapping,
+            executor=executor,
         )
 
     if "CFF " in font or "CFF2" in font:
@@ -340,6 +694,8 @@ def removeOverlaps(
             ignoreErrors=ignoreErrors,
             table_tag="CFF " if "CFF " in font else "CFF2",
             removeUnusedSubroutines=removeUnusedSubroutines,
+            skipNonOverlapping=skipNonOverlapping,
+            executor=executor,
         )
 
 
@@ -377,6 +733,21 @@ def main(args=None):
         help="Keep unused subroutines in CFF table after removing overlaps, "
         "default is to remove them if any glyphs are modified",
     )
+    parser.add_argument(
+        "--skip-non-overlapping",
+        action="store_true",
+        help="Leave unchanged the glyphs whose contours can't overlap, "
+        "default is to simplify all the glyphs",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Simplify the glyphs in N worker processes, 0 means the number of "
+        "CPUs, default is 1",
+    )
     args = parser.parse_args(args)
 
     with ttFont.TTFont(args.input) as font:
@@ -386,6 +757,8 @@ def main(args=None):
             removeHinting=not args.keep_hinting,
             ignoreErrors=args.ignore_errors,
             removeUnusedSubroutines=not args.keep_unused_subroutines,
+            skipNonOverlapping=args.skip_non_overlapping,
+            jobs=args.jobs or os.cpu_count() or 1,
         )
         font.save(args.output)
 
@@ -46,7 +46,8 @@ class SFNTReader(object):
         # return default object
         return object.__new__(cls)
 
-    def __init__(self, file, checkChecksums=0, fontNumber=-1):
+    def __init__(self, file, checkChecksums=0, fontNumber=-1, lazy=False):
+        # 'lazy' only matters for WOFF2Reader: tables are always read on demand
         self.file = file
         self.checkChecksums = checkChecksums
 
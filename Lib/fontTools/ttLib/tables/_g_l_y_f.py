@@ -17,6 +17,7 @@ from fontTools.misc.fixedTools import (
 from fontTools.misc.roundTools import noRound, otRound
 from fontTools.misc.vector import Vector
 from numbers import Number
+from fontTools.ttLib.fontMetrics import getFontMetrics
 from . import DefaultTable
 from . import ttProgram
 import sys
@@ -90,6 +91,17 @@ class table__g_l_y_f(DefaultTable.DefaultTable):
     # no padding, except for when padding would allow to use short loca offsets.
     padding = 1
 
+    # this attribute controls how the coordinates of simple glyphs are encoded upon
+    # compile. None (default) defers to the font's OPTIMIZE_FONT_SPEED config option;
+    # True packs each coordinate delta in its shortest form; False uses the widest
+    # form needed by each glyph, which compiles faster but makes the table larger.
+    optimizeSize = None
+
+    # when True, the compiled data of each simple glyph is kept together with a
+    # snapshot of its outline, and reused by subsequent compiles as long as the
+    # outline, bounds and instructions of the glyph have not changed.
+    cacheCompiledGlyphs = False
+
     def decompile(self, data, ttFont):
         loca = ttFont["loca"]
         pos = int(loca[0])
@@ -129,7 +141,9 @@ class table__g_l_y_f(DefaultTable.DefaultTable):
             glyph.expand(self)
 
     def compile(self, ttFont):
-        optimizeSpeed = ttFont.cfg[ttLib.OPTIMIZE_FONT_SPEED]
+        optimizeSize = self.optimizeSize
+        if optimizeSize is None:
+            optimizeSize = not ttFont.cfg[ttLib.OPTIMIZE_FONT_SPEED]
         if not hasattr(self, "glyphOrder"):
             self.glyphOrder = ttFont.getGlyphOrder()
         padding = self.padding
@@ -138,15 +152,26 @@ class table__g_l_y_f(DefaultTable.DefaultTable):
         currentLocation = 0
         dataList = []
         recalcBBoxes = ttFont.recalcBBoxes
-        boundsDone = set()
+        # shared with the tables that use the glyph bounds after this one
+        boundsDone = getFontMetrics(ttFont).boundsDone
+        if self.cacheCompiledGlyphs:
+            cache = self.__dict__.setdefault("_compiledGlyphs", {})
+        else:
+            self.__dict__.pop("_compiledGlyphs", None)
+            cache = None
         for glyphName in self.glyphOrder:
             glyph = self.glyphs[glyphName]
-            glyphData = glyph.compile(
-                self,
-                recalcBBoxes,
-                boundsDone=boundsDone,
-                optimizeSize=not optimizeSpeed,
-            )
+            if cache is None:
+                glyphData = glyph.compile(
+                    self,
+                    recalcBBoxes,
+                    boundsDone=boundsDone,
+                    optimizeSize=optimizeSize,
+                )
+            else:
+                glyphData = self._compileGlyphCached(
+                    glyphName, glyph, cache, recalcBBoxes, boundsDone, optimizeSize
+                )
             if padding > 1:
                 glyphData = pad(glyphData, size=padding)
             locations.append(currentLocation)
@@ -183,6 +208,55 @@ class table__g_l_y_f(DefaultTable.DefaultTable):
             data = b"\0"
         return data
 
+    def _compileGlyphCached(
+        self, glyphName, glyph, cache, recalcBBoxes, boundsDone, optimizeSize
+    ):
+        if hasattr(glyph, "data"):
+            if not recalcBBoxes:
+                return glyph.data
+            glyph.expand(self)
+        if glyph.numberOfContours <= 0:
+            # empty and composite glyphs are cheap to compile, and the bounds of
+            # the latter depend on other glyphs; don't bother caching them.
+            cache.pop(glyphName, None)
+            return glyph.compile(
+                self, recalcBBoxes, boundsDone=boundsDone, optimizeSize=optimizeSize
+            )
+        if recalcBBoxes:
+            glyph.recalcBounds(self, boundsDone=boundsDone)
+        # The snapshot is made of the raw buffers of the glyph attributes, which
+        # are much cheaper to compare than it is to re-encode the coordinates.
+        key = (
+            optimizeSize,
+            glyph.numberOfContours,
+            glyph.xMin,
+            glyph.yMin,
+            glyph.xMax,
+            glyph.yMax,
+            glyph.coordinates.array.tobytes(),
+            bytes(glyph.flags),
+            tuple(glyph.endPtsOfContours),
+            glyph.program.getBytecode(),
+        )
+        cached = cache.get(glyphName)
+        if cached is not None and cached[0] is glyph and cached[1] == key:
+            return cached[2]
+        data = glyph.compile(self, recalcBBoxes=False, optimizeSize=optimizeSize)
+        cache[glyphName] = (glyph, key, data)
+        return data
+
+    def __eq__(self, other):
+        if type(self) is not type(other):
+            return NotImplemented
+        # the cache of compiled glyphs is not part of the table's contents
+        return self._eqState() == other._eqState()
+
+    def _eqState(self):
+        state = self.__dict__
+        if "_compiledGlyphs" in state:
+            state = {k: v for k, v in state.items() if k != "_compiledGlyphs"}
+        return state
+
     def toXML(self, writer, ttFont, splitGlyphs=False):
         notice = (
             "The xMin, yMin, xMax and yMax values\n"
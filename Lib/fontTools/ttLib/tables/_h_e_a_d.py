@@ -7,7 +7,8 @@ from fontTools.misc.timeTools import (
     timestampNow,
 )
 from fontTools.misc.timeTools import epoch_diff as mac_epoch_diff  # For backward compat
-from fontTools.misc.arrayTools import intRect, unionRect
+from fontTools.misc.arrayTools import intRect
+from fontTools.ttLib.fontMetrics import getFontMetrics
 from . import DefaultTable
 import logging
 
@@ -77,16 +78,7 @@ class table__h_e_a_d(DefaultTable.DefaultTable):
                 topDict = ttFont["CFF "].cff.topDictIndex[0]
                 self.xMin, self.yMin, self.xMax, self.yMax = intRect(topDict.FontBBox)
             elif "CFF2" in ttFont:
-                topDict = ttFont["CFF2"].cff.topDictIndex[0]
-                charStrings = topDict.CharStrings
-                fontBBox = None
-                for charString in charStrings.values():
-                    bounds = charString.calcBounds(charStrings)
-                    if bounds is not None:
-                        if fontBBox is not None:
-                            fontBBox = unionRect(fontBBox, bounds)
-                        else:
-                            fontBBox = bounds
+                fontBBox = getFontMetrics(ttFont).fontBounds()
                 if fontBBox is not None:
                     self.xMin, self.yMin, self.xMax, self.yMax = intRect(fontBBox)
         if ttFont.recalcTimestamp:
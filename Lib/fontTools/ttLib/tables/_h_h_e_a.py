@@ -4,6 +4,7 @@ from fontTools.misc.fixedTools import (
     ensureVersionIsLong as fi2ve,
     versionToFixed as ve2fi,
 )
+from fontTools.ttLib.fontMetrics import getFontMetrics
 from . import DefaultTable
 import math
 
@@ -84,27 +85,16 @@ class table__h_h_e_a(DefaultTable.DefaultTable):
         self.advanceWidthMax = max(adv for adv, _ in hmtxTable.metrics.values())
 
         boundsWidthDict = {}
-        if "glyf" in ttFont:
-            glyfTable = ttFont["glyf"]
+        if "glyf" in ttFont or "CFF " in ttFont or "CFF2" in ttFont:
+            fontMetrics = getFontMetrics(ttFont)
+            isGlyf = "glyf" in ttFont
             for name in ttFont.getGlyphOrder():
-                g = glyfTable[name]
-                if g.numberOfContours == 0:
+                bounds = fontMetrics.glyphBounds(name)
+                if bounds is None:
                     continue
-                if g.numberOfContours < 0 and not hasattr(g, "xMax"):
-                    # Composite glyph without extents set.
-                    # Calculate those.
-                    g.recalcBounds(glyfTable)
-                boundsWidthDict[name] = g.xMax - g.xMin
-        elif "CFF " in ttFont or "CFF2" in ttFont:
-            if "CFF " in ttFont:
-                topDict = ttFont["CFF "].cff.topDictIndex[0]
-            else:
-                topDict = ttFont["CFF2"].cff.topDictIndex[0]
-            charStrings = topDict.CharStrings
-            for name in ttFont.getGlyphOrder():
-                cs = charStrings[name]
-                bounds = cs.calcBounds(charStrings)
-                if bounds is not None:
+                if isGlyf:
+                    boundsWidthDict[name] = bounds[2] - bounds[0]
+                else:
                     boundsWidthDict[name] = int(
                         math.ceil(bounds[2]) - math.floor(bounds[0])
                     )
@@ -1,5 +1,6 @@
 from fontTools.misc import sstruct
 from fontTools.misc.textTools import safeEval
+from fontTools.ttLib.fontMetrics import getFontMetrics
 from . import DefaultTable
 
 maxpFormat_0_5 = """
@@ -66,6 +67,7 @@ class table__m_a_x_p(DefaultTable.DefaultTable):
         glyfTable = ttFont["glyf"]
         hmtxTable = ttFont["hmtx"]
         headTable = ttFont["head"]
+        fontMetrics = getFontMetrics(ttFont)
         self.numGlyphs = len(glyfTable)
         INFINITY = 100000
         xMin = +INFINITY
@@ -82,19 +84,20 @@ class table__m_a_x_p(DefaultTable.DefaultTable):
         for glyphName in ttFont.getGlyphOrder():
             g = glyfTable[glyphName]
             if g.numberOfContours:
-                if hmtxTable[glyphName][1] != g.xMin:
+                gxMin, gyMin, gxMax, gyMax = fontMetrics.glyphBounds(glyphName)
+                if hmtxTable[glyphName][1] != gxMin:
                     allXMinIsLsb = 0
-                xMin = min(xMin, g.xMin)
-                yMin = min(yMin, g.yMin)
-                xMax = max(xMax, g.xMax)
-                yMax = max(yMax, g.yMax)
+                xMin = min(xMin, gxMin)
+                yMin = min(yMin, gyMin)
+                xMax = max(xMax, gxMax)
+                yMax = max(yMax, gyMax)
                 if g.numberOfContours > 0:
                     nPoints, nContours = g.getMaxpValues()
                     maxPoints = max(maxPoints, nPoints)
                     maxContours = max(maxContours, nContours)
                 elif g.isComposite():
-                    nPoints, nContours, componentDepth = g.getCompositeMaxpValues(
-                        glyfTable
+                    nPoints, nContours, componentDepth = (
+                        fontMetrics.compositeMaxpValues(glyphName)
                     )
                     maxCompositePoints = max(maxCompositePoints, nPoints)
                     maxCompositeContours = max(maxCompositeContours, nContours)
@@ -4,6 +4,7 @@ from fontTools.misc.fixedTools import (
     ensureVersionIsLong as fi2ve,
     versionToFixed as ve2fi,
 )
+from fontTools.ttLib.fontMetrics import getFontMetrics
 from . import DefaultTable
 import math
 
@@ -67,27 +68,16 @@ class table__v_h_e_a(DefaultTable.DefaultTable):
         self.advanceHeightMax = max(adv for adv, _ in vmtxTable.metrics.values())
 
         boundsHeightDict = {}
-        if "glyf" in ttFont:
-            glyfTable = ttFont["glyf"]
+        if "glyf" in ttFont or "CFF " in ttFont or "CFF2" in ttFont:
+            fontMetrics = getFontMetrics(ttFont)
+            isGlyf = "glyf" in ttFont
             for name in ttFont.getGlyphOrder():
-                g = glyfTable[name]
-                if g.numberOfContours == 0:
+                bounds = fontMetrics.glyphBounds(name)
+                if bounds is None:
                     continue
-                if g.numberOfContours < 0 and not hasattr(g, "yMax"):
-                    # Composite glyph without extents set.
-                    # Calculate those.
-                    g.recalcBounds(glyfTable)
-                boundsHeightDict[name] = g.yMax - g.yMin
-        elif "CFF " in ttFont or "CFF2" in ttFont:
-            if "CFF " in ttFont:
-                topDict = ttFont["CFF "].cff.topDictIndex[0]
-            else:
-                topDict = ttFont["CFF2"].cff.topDictIndex[0]
-            charStrings = topDict.CharStrings
-            for name in ttFont.getGlyphOrder():
-                cs = charStrings[name]
-                bounds = cs.calcBounds(charStrings)
-                if bounds is not None:
+                if isGlyf:
+                    boundsHeightDict[name] = bounds[3] - bounds[1]
+                else:
                     boundsHeightDict[name] = int(
                         math.ceil(bounds[3]) - math.floor(bounds[1])
                     )
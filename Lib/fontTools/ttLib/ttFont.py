@@ -12,8 +12,10 @@ from fontTools.misc.configTools import AbstractConfig
 from fontTools.misc.loggingTools import deprecateArgument
 from fontTools.misc.textTools import Tag, byteord, tostr
 from fontTools.ttLib import TTLibError
+from fontTools.ttLib.fontMetrics import FontMetrics
 from fontTools.ttLib.sfnt import SFNTReader, SFNTWriter
 from fontTools.ttLib.ttGlyphSet import (
+    GlyphOutlineCache,
     _TTGlyph,  # noqa: F401
     _TTGlyphSet,
     _TTGlyphSetCFF,
@@ -210,6 +212,9 @@ class TTFont(object):
             lazy (bool): If lazy is set to True, many data structures are loaded lazily, upon
                     access only. If it is set to False, many data structures are loaded immediately.
                     The default is ``lazy=None`` which is somewhere in between.
+                    For WOFF2 fonts, ``lazy=True`` also decompresses the font data
+                    incrementally and decodes the transformed ``glyf`` table glyph by
+                    glyph, upon access.
     """
 
     tables: dict[Tag, DefaultTable | GlyphOrder]
@@ -320,7 +325,7 @@ class TTFont(object):
         elif not seekable:
             raise TTLibError("Input file must be seekable when lazy=True")
         self._tableCache = _tableCache
-        self.reader = SFNTReader(file, checkChecksums, fontNumber=fontNumber)
+        self.reader = SFNTReader(file, checkChecksums, fontNumber=fontNumber, lazy=lazy)
         self.sfntVersion = self.reader.sfntVersion
         self.flavor = self.reader.flavor
         self.flavorData = self.reader.flavorData
@@ -419,8 +424,13 @@ class TTFont(object):
         )
 
         done = []
-        for tag in tags:
-            self._writeTable(tag, writer, done, tableCache)
+        # the glyph bounds are shared by the tables that recalculate them
+        self._fontMetrics = FontMetrics(self)
+        try:
+            for tag in tags:
+                self._writeTable(tag, writer, done, tableCache)
+        finally:
+            del self._fontMetrics
 
         writer.close()
 
@@ -822,6 +832,11 @@ class TTFont(object):
     def _readTable(self, tag: Tag) -> DefaultTable:
         log.debug("Reading '%s' table from disk", tag)
         assert self.reader is not None
+        if self.lazy and hasattr(self.reader, "getLazyTable"):
+            table = self.reader.getLazyTable(tag, self)
+            if table is not None:
+                self.tables[tag] = table
+                return table
         data = self.reader[tag]
         if self._tableCache is not None:
             table = self._tableCache.get((tag, data))
@@ -1292,6 +1307,7 @@ class TTFont(object):
         location: Mapping[str, _NumberT] | None = None,
         normalized: bool = False,
         recalcBounds: bool = True,
+        outlineCache: GlyphOutlineCache | None = None,
     ) -> _TTGlyphSet:
         """Return a generic GlyphSet, which is a dict-like object
         mapping glyph names to glyph objects. The returned glyph objects
@@ -1315,6 +1331,10 @@ class TTFont(object):
         If the ``normalized`` variable is set to True, that location is
         interpreted as in the normalized (-1..+1) space, otherwise it is in the
         font's defined axes space.
+
+        If ``outlineCache`` is a :class:`fontTools.ttLib.ttGlyphSet.GlyphOutlineCache`,
+        the glyph outlines are recorded the first time they are drawn, and
+        replayed from the cache afterwards.
         """
         if location and "fvar" not in self:
             location = None
@@ -1322,13 +1342,17 @@ class TTFont(object):
             location = self.normalizeLocation(location)
         glyphSet = None
         if ("CFF " in self or "CFF2" in self) and (preferCFF or "glyf" not in self):
-            glyphSet = _TTGlyphSetCFF(self, location)
+            glyphSet = _TTGlyphSetCFF(self, location, outlineCache=outlineCache)
         elif "glyf" in self:
-            glyphSet = _TTGlyphSetGlyf(self, location, recalcBounds=recalcBounds)
+            glyphSet = _TTGlyphSetGlyf(
+                self, location, recalcBounds=recalcBounds, outlineCache=outlineCache
+            )
         else:
             raise TTLibError("Font contains no outlines")
         if "VARC" in self:
-            glyphSet = _TTGlyphSetVARC(self, location, glyphSet)
+            glyphSet = _TTGlyphSetVARC(
+                self, location, glyphSet, outlineCache=outlineCache
+            )
         return glyphSet
 
     def normalizeLocation(self, location: Mapping[str, float]) -> dict[str, float]:
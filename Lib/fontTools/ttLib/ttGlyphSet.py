@@ -1,29 +1,94 @@
 """GlyphSets returned by a TTFont."""
 
 from abc import ABC, abstractmethod
+from collections import OrderedDict
 from collections.abc import Mapping
 from contextlib import contextmanager
 from copy import copy, deepcopy
+from sys import getsizeof
 from types import SimpleNamespace
 from fontTools.misc.vector import Vector
 from fontTools.misc.fixedTools import otRound, fixedToFloat as fi2fl
 from fontTools.misc.loggingTools import deprecateFunction
 from fontTools.misc.transform import Transform, DecomposedTransform
+from fontTools.pens.basePen import AbstractPen, DecomposingPen
+from fontTools.pens.pointPen import AbstractPointPen
 from fontTools.pens.transformPen import TransformPen, TransformPointPen
 from fontTools.pens.recordingPen import (
     DecomposingRecordingPen,
+    RecordingPen,
+    RecordingPointPen,
     lerpRecordings,
     replayRecording,
 )
 
 
+class GlyphOutlineCache:
+    """A least-recently-used cache of the glyph outlines drawn by glyph sets.
+
+    Pass one to :meth:`fontTools.ttLib.TTFont.getGlyphSet` (the same cache
+    can be shared by the glyph sets of a font at different locations) to
+    record the outlines of the glyphs the first time they are drawn, and
+    replay the recordings afterwards, e.g. when many pens draw the same
+    glyphs, or when the same components are decomposed many times by a
+    ``BoundsPen`` or another ``DecomposingPen``. The font must not be
+    modified while the cache is used.
+
+    The least recently used outlines are evicted when the estimated size of
+    the recordings exceeds ``maxSize`` bytes. The ``hits``, ``misses`` and
+    ``evictions`` attributes count the cache lookups and evictions, ``size``
+    is the current estimated size of the recordings.
+    """
+
+    def __init__(self, maxSize=64 * 1024 * 1024):
+        self.maxSize = maxSize
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        try:
+            entry = self._entries[key]
+        except KeyError:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key, value, size):
+        if size > self.maxSize:
+            return
+        entries = self._entries
+        if key in entries:
+            self.size -= entries.pop(key)[1]
+        entries[key] = (value, size)
+        self.size += size
+        while self.size > self.maxSize:
+            _, (_, evictedSize) = entries.popitem(last=False)
+            self.size -= evictedSize
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+        self.size = 0
+
+
 class _TTGlyphSet(Mapping):
     """Generic dict-like GlyphSet class that pulls metrics from hmtx and
     glyph shape from TrueType or CFF.
     """
 
-    def __init__(self, font, location, glyphsMapping, *, recalcBounds=True):
+    def __init__(
+        self, font, location, glyphsMapping, *, recalcBounds=True, outlineCache=None
+    ):
         self.recalcBounds = recalcBounds
+        self.outlineCache = outlineCache
         self.font = font
         self.defaultLocationNormalized = (
             {axis.axisTag: 0 for axis in self.font["fvar"].axes}
@@ -95,9 +160,15 @@ class _TTGlyphSet(Mapping):
 
 
 class _TTGlyphSetGlyf(_TTGlyphSet):
-    def __init__(self, font, location, recalcBounds=True):
+    def __init__(self, font, location, recalcBounds=True, outlineCache=None):
         self.glyfTable = font["glyf"]
-        super().__init__(font, location, self.glyfTable, recalcBounds=recalcBounds)
+        super().__init__(
+            font,
+            location,
+            self.glyfTable,
+            recalcBounds=recalcBounds,
+            outlineCache=outlineCache,
+        )
         self.gvarTable = font.get("gvar")
 
     def __getitem__(self, glyphName):
@@ -105,10 +176,10 @@ class _TTGlyphSetGlyf(_TTGlyphSet):
 
 
 class _TTGlyphSetCFF(_TTGlyphSet):
-    def __init__(self, font, location):
+    def __init__(self, font, location, outlineCache=None):
         tableTag = "CFF2" if "CFF2" in font else "CFF "
         self.charStrings = list(font[tableTag].cff.values())[0].CharStrings
-        super().__init__(font, location, self.charStrings)
+        super().__init__(font, location, self.charStrings, outlineCache=outlineCache)
         self.setLocation(location)
 
     def __getitem__(self, glyphName):
@@ -141,9 +212,9 @@ class _TTGlyphSetCFF(_TTGlyphSet):
 
 
 class _TTGlyphSetVARC(_TTGlyphSet):
-    def __init__(self, font, location, glyphSet):
+    def __init__(self, font, location, glyphSet, outlineCache=None):
         self.glyphSet = glyphSet
-        super().__init__(font, location, glyphSet)
+        super().__init__(font, location, glyphSet, outlineCache=outlineCache)
         self.varcTable = font["VARC"].table
 
     def __getitem__(self, glyphName):
@@ -163,6 +234,9 @@ class _TTGlyph(ABC):
     attributes.
     """
 
+    # whether the glyphs may be drawn with addVarComponent
+    _drawsVarComponents = False
+
     def __init__(self, glyphSet, glyphName, *, recalcBounds=True):
         self.glyphSet = glyphSet
         self.name = glyphName
@@ -181,12 +255,11 @@ class _TTGlyph(ABC):
             self.width += glyphSet.hvarInstancer[varidx]
         # TODO: VVAR/VORG
 
-    @abstractmethod
     def draw(self, pen):
         """Draw the glyph onto ``pen``. See fontTools.pens.basePen for details
         how that works.
         """
-        raise NotImplementedError
+        self._drawCached(pen, False)
 
     def drawPoints(self, pen):
         """Draw the glyph onto ``pen``. See fontTools.pens.pointPen for details
@@ -196,31 +269,67 @@ class _TTGlyph(ABC):
 
         self.draw(SegmentToPointPen(pen))
 
+    @abstractmethod
+    def _draw(self, pen, isPointPen):
+        """Draw the glyph onto ``pen``, a point pen if ``isPointPen``."""
+        raise NotImplementedError
 
-class _TTGlyphGlyf(_TTGlyph):
-    def draw(self, pen):
-        """Draw the glyph onto ``pen``. See fontTools.pens.basePen for details
-        how that works.
-        """
-        glyph, offset = self._getGlyphAndOffset()
-
-        with self.glyphSet.pushDepth() as depth:
-            if depth:
-                offset = 0  # Offset should only apply at top-level
+    def _drawCached(self, pen, isPointPen):
+        glyphSet = self.glyphSet
+        cache = glyphSet.outlineCache
+        if cache is None or (
+            self._drawsVarComponents and not _declinesVarComponents(pen)
+        ):
+            self._draw(pen, isPointPen)
+            return
+        key = (
+            type(self),
+            isPointPen,
+            self.recalcBounds,
+            self.name,
+            tuple(sorted(glyphSet.location.items())),
+            tuple(sorted(glyphSet.rawLocation.items())),
+            glyphSet.depth > 0,
+        )
+        entry = cache.get(key)
+        if entry is None:
+            if isPointPen:
+                recordingPen = _OutlineRecordingPointPen()
+            else:
+                recordingPen = _OutlineRecordingPen()
+            self._draw(recordingPen, isPointPen)
+            recording = recordingPen.value
+            # drawing a variable glyf glyph also sets its metrics
+            metrics = (self.width, self.lsb, self.height, self.tsb)
+            cache.put(key, (recording, metrics), _recordingSize(recording))
+        else:
+            recording, metrics = entry
+            self.width, self.lsb, self.height, self.tsb = metrics
+        if isPointPen:
+            for operator, args, kwargs in recording:
+                getattr(pen, operator)(*args, **kwargs)
+        else:
+            replayRecording(recording, pen)
 
-            glyph.draw(pen, self.glyphSet.glyfTable, offset)
 
+class _TTGlyphGlyf(_TTGlyph):
     def drawPoints(self, pen):
         """Draw the glyph onto ``pen``. See fontTools.pens.pointPen for details
         how that works.
         """
+        self._drawCached(pen, True)
+
+    def _draw(self, pen, isPointPen):
         glyph, offset = self._getGlyphAndOffset()
 
         with self.glyphSet.pushDepth() as depth:
             if depth:
                 offset = 0  # Offset should only apply at top-level
 
-            glyph.drawPoints(pen, self.glyphSet.glyfTable, offset)
+            if isPointPen:
+                glyph.drawPoints(pen, self.glyphSet.glyfTable, offset)
+            else:
+                glyph.draw(pen, self.glyphSet.glyfTable, offset)
 
     def _getGlyphAndOffset(self):
         if self.glyphSet.location and self.glyphSet.gvarTable is not None:
@@ -275,10 +384,7 @@ class _TTGlyphGlyf(_TTGlyph):
 
 
 class _TTGlyphCFF(_TTGlyph):
-    def draw(self, pen):
-        """Draw the glyph onto ``pen``. See fontTools.pens.basePen for details
-        how that works.
-        """
+    def _draw(self, pen, isPointPen):
         self.glyphSet.charStrings[self.name].draw(pen, self.glyphSet.blender)
 
 
@@ -318,6 +424,8 @@ def _evaluateCondition(condition, fvarAxes, location, instancer):
 
 
 class _TTGlyphVARC(_TTGlyph):
+    _drawsVarComponents = True
+
     def _draw(self, pen, isPointPen):
         """Draw the glyph onto ``pen``. See fontTools.pens.basePen for details
         how that works.
@@ -396,11 +504,44 @@ class _TTGlyphVARC(_TTGlyph):
                             tPen = TransformPen(pen, t)
                             g.draw(tPen)
 
-    def draw(self, pen):
-        self._draw(pen, False)
-
     def drawPoints(self, pen):
-        self._draw(pen, True)
+        self._drawCached(pen, True)
+
+
+# The addVarComponent methods of the pens that don't support VarComponents,
+# onto which the VARC glyphs are drawn decomposed: their outlines can be cached.
+_DECLINED_VAR_COMPONENTS = (
+    AbstractPen.addVarComponent,
+    DecomposingPen.addVarComponent,
+    AbstractPointPen.addVarComponent,
+)
+
+
+def _declinesVarComponents(pen):
+    method = getattr(type(pen), "addVarComponent", None)
+    return method is None or method in _DECLINED_VAR_COMPONENTS
+
+
+class _OutlineRecordingPen(RecordingPen):
+    addVarComponent = AbstractPen.addVarComponent
+
+
+class _OutlineRecordingPointPen(RecordingPointPen):
+    addVarComponent = AbstractPointPen.addVarComponent
+
+
+def _recordingSize(recording):
+    # An estimate of the memory used by a recording: the list, the tuples
+    # of operations and operands, and the point tuples.
+    size = getsizeof(recording)
+    for operation in recording:
+        size += getsizeof(operation)
+        for operands in operation[1:]:
+            size += getsizeof(operands)
+            for operand in operands:
+                if type(operand) is tuple:
+                    size += getsizeof(operand)
+    return size
 
 
 def _setCoordinates(glyph, coord, glyfTable, *, recalcBounds=True):
@@ -1,10 +1,14 @@
 from io import BytesIO
+import os
 import sys
+import time
 import array
 import struct
 from collections import OrderedDict
 from fontTools.misc import sstruct
-from fontTools.misc.arrayTools import calcIntBounds
+from fontTools.misc.loggingTools import Timer
+from fontTools.misc.roundTools import otRound
+from fontTools.misc.lazyTools import LazyDict
 from fontTools.misc.textTools import Tag, bytechr, byteord, bytesjoin, pad
 from fontTools.ttLib import (
     TTFont,
@@ -25,9 +29,11 @@ from fontTools.ttLib.sfnt import (
     calcChecksum,
 )
 from fontTools.ttLib.tables import ttProgram, _g_l_y_f
+from fontTools.ttLib.woff2Triplets import decodeTriplets, encodeTriplets
 import logging
 
 log = logging.getLogger("fontTools.ttLib.woff2")
+timer = Timer(logger=logging.getLogger("fontTools.ttLib.woff2.timer"))
 
 haveBrotli = False
 try:
@@ -41,9 +47,18 @@ except ImportError:
 
 
 class WOFF2Reader(SFNTReader):
+    """Read a WOFF2 font file.
+
+    By default the whole font data is brotli-decompressed when the reader is
+    created. With ``lazy=True`` (as passed by ``TTFont(lazy=True)``), the data is
+    instead decompressed incrementally, only as far as the tables requested so
+    far, and the transformed 'glyf' table can be loaded with :meth:`getLazyTable`,
+    which decodes individual glyphs when first accessed.
+    """
+
     flavor = "woff2"
 
-    def __init__(self, file, checkChecksums=0, fontNumber=-1):
+    def __init__(self, file, checkChecksums=0, fontNumber=-1, lazy=False):
         if not haveBrotli:
             log.error(
                 "The WOFF2 decoder requires the Brotli Python extension, available at: "
@@ -74,15 +89,17 @@ class WOFF2Reader(SFNTReader):
             entry.offset = offset
             offset += entry.length
 
-        totalUncompressedSize = offset
-        compressedData = self.file.read(self.totalCompressedSize)
-        decompressedData = brotli.decompress(compressedData)
-        if len(decompressedData) != totalUncompressedSize:
-            raise TTLibError(
-                "unexpected size for decompressed font data: expected %d, found %d"
-                % (totalUncompressedSize, len(decompressedData))
-            )
-        self.transformBuffer = BytesIO(decompressedData)
+        self.totalUncompressedSize = offset
+        self.lazy = lazy
+        self._transformBuffer = None
+        if lazy:
+            self._decompressor = brotli.Decompressor()
+            self._decompressedData = bytearray()
+            self._compressedOffset = self.file.tell()
+            self._compressedEnd = self._compressedOffset + self.totalCompressedSize
+        else:
+            compressedData = self.file.read(self.totalCompressedSize)
+            self._setTransformBuffer(brotli.decompress(compressedData))
 
         self.file.seek(0, 2)
         if self.length != self.file.tell():
@@ -93,6 +110,52 @@ class WOFF2Reader(SFNTReader):
         # make empty TTFont to store data while reconstructing tables
         self.ttFont = TTFont(recalcBBoxes=False, recalcTimestamp=False)
 
+    @property
+    def transformBuffer(self):
+        """File-like object holding the whole decompressed font data."""
+        if self._transformBuffer is None:
+            self._decompress(self.totalUncompressedSize)
+        return self._transformBuffer
+
+    @transformBuffer.setter
+    def transformBuffer(self, value):
+        self._transformBuffer = value
+
+    def _setTransformBuffer(self, decompressedData):
+        if len(decompressedData) != self.totalUncompressedSize:
+            raise TTLibError(
+                "unexpected size for decompressed font data: expected %d, found %d"
+                % (self.totalUncompressedSize, len(decompressedData))
+            )
+        self._transformBuffer = BytesIO(decompressedData)
+
+    def _decompress(self, size):
+        """Decompress (at least) the first 'size' bytes of the font data."""
+        data = self._decompressedData
+        while len(data) < size and self._compressedOffset < self._compressedEnd:
+            self.file.seek(self._compressedOffset)
+            chunk = self.file.read(
+                min(self._compressedEnd - self._compressedOffset, 0x10000)
+            )
+            if not chunk:
+                break
+            self._compressedOffset += len(chunk)
+            data += self._decompressor.process(chunk)
+        if self._compressedOffset >= self._compressedEnd:
+            # all the font data is there, don't keep it twice
+            self._decompressor = self._decompressedData = None
+            self._setTransformBuffer(bytes(data))
+        elif len(data) < size:
+            raise TTLibError("not enough compressed font data")
+
+    def _loadEntryData(self, entry):
+        if self._transformBuffer is None:
+            end = entry.offset + entry.length
+            self._decompress(end)
+            if self._transformBuffer is None:
+                return bytes(self._decompressedData[entry.offset : end])
+        return entry.loadData(self._transformBuffer)
+
     def __getitem__(self, tag):
         """Fetch the raw table data. Reconstruct transformed tables."""
         entry = self.tables[Tag(tag)]
@@ -100,13 +163,30 @@ class WOFF2Reader(SFNTReader):
             if entry.transformed:
                 entry.data = self.reconstructTable(tag)
             else:
-                entry.data = entry.loadData(self.transformBuffer)
+                entry.data = self._loadEntryData(entry)
         return entry.data
 
+    def getLazyTable(self, tag, ttFont):
+        """Return a table object for 'tag' that is decoded on demand, or None if
+        the table must be loaded from its reconstructed binary data instead.
+
+        Only the transformed 'glyf' table is currently supported: the returned
+        WOFF2GlyfTable decodes each glyph from the transformed substreams the
+        first time the glyph is accessed.
+        """
+        entry = self.tables.get(Tag(tag))
+        if tag != "glyf" or entry is None or not entry.transformed:
+            return None
+        glyfTable = WOFF2GlyfTable()
+        glyfTable.reconstruct(self._loadEntryData(entry), ttFont, lazy=True)
+        if hasattr(self, "padding"):
+            glyfTable.padding = self.padding
+        return glyfTable
+
     def reconstructTable(self, tag):
         """Reconstruct table named 'tag' from transformed data."""
         entry = self.tables[Tag(tag)]
-        rawData = entry.loadData(self.transformBuffer)
+        rawData = self._loadEntryData(entry)
         if tag == "glyf":
             # no need to pad glyph data when reconstructing
             padding = self.padding if hasattr(self, "padding") else None
@@ -255,7 +335,8 @@ class WOFF2Writer(SFNTWriter):
             and "glyf" in self.flavorData.transformedTables
             and "glyf" in self.tables
         ):
-            self._normaliseGlyfAndLoca(padding=4)
+            with timer("normalise 'glyf' and 'loca' tables"):
+                self._normaliseGlyfAndLoca(padding=4)
         self._setHeadTransformFlag()
 
         # To pass the legacy OpenType Sanitiser currently included in browsers,
@@ -270,8 +351,16 @@ class WOFF2Writer(SFNTWriter):
 
         self.totalSfntSize = self._calcSFNTChecksumsLengthsAndOffsets()
 
-        fontData = self._transformTables()
-        compressedFont = brotli.compress(fontData, mode=brotli.MODE_FONT)
+        with timer("transform tables"):
+            fontData = self._transformTables()
+        quality = self.flavorData.brotliQuality
+        window = self.flavorData.brotliWindow
+        with timer(
+            "compress font data (brotli quality=%d, window=%d)" % (quality, window)
+        ):
+            compressedFont = brotli.compress(
+                fontData, mode=brotli.MODE_FONT, quality=quality, lgwin=window
+            )
 
         self.totalCompressedSize = len(compressedFont)
         self.length = self._calcTotalSize()
@@ -610,6 +699,14 @@ woff2DirectoryEntryMaxSize = (
 
 woff2TransformedTableTags = ("glyf", "loca")
 
+# brotli settings for compressing the font data: by default, the best (and
+# slowest) quality, and a 4 MiB sliding window, like brotli's own defaults
+BROTLI_QUALITY = 11
+BROTLI_WINDOW = 22
+# a much faster quality, for quick "preview" encodings, whose output is
+# typically 10-20% larger than with the default quality
+BROTLI_FAST_QUALITY = 5
+
 woff2GlyfTableFormat = """
 		> # big endian
 		version:                  H  # = 0x0000
@@ -635,8 +732,28 @@ bboxFormat = """
 		yMax:				h
 """
 
+bboxSize = sstruct.calcsize(bboxFormat)
+
 woff2OverlapSimpleBitmapFlag = 0x0001
 
+# number of bytes in the glyphStream used by a point, indexed by its flag byte
+_tripletSizes = bytes(
+    1 if f < 84 else 2 if f < 120 else 3 if f < 124 else 4
+    for f in (flag & 0x7F for flag in range(256))
+)
+
+
+def _componentSize(flags):
+    """Return the size in bytes of a composite glyph component record."""
+    size = 8 if flags & _g_l_y_f.ARG_1_AND_2_ARE_WORDS else 6
+    if flags & _g_l_y_f.WE_HAVE_A_SCALE:
+        size += 2
+    elif flags & _g_l_y_f.WE_HAVE_AN_X_AND_Y_SCALE:
+        size += 4
+    elif flags & _g_l_y_f.WE_HAVE_A_TWO_BY_TWO:
+        size += 8
+    return size
+
 
 def getKnownTagIndex(tag):
     """Return index of 'tag' in woff2KnownTags list. Return 63 if not found."""
@@ -774,13 +891,19 @@ class WOFF2GlyfTable(getTableClass("glyf")):
     def __init__(self, tag=None):
         self.tableTag = Tag(tag or "glyf")
 
-    def reconstruct(self, data, ttFont):
-        """Decompile transformed 'glyf' data."""
+    def reconstruct(self, data, ttFont, lazy=False):
+        """Decompile transformed 'glyf' data.
+
+        If 'lazy' is True, only the offsets of each glyph's data within the
+        substreams are computed upfront, and glyphs are decoded upon access.
+        """
         inputDataSize = len(data)
 
         if inputDataSize < woff2GlyfTableFormatSize:
             raise TTLibError("not enough 'glyf' data")
-        dummy, data = sstruct.unpack2(woff2GlyfTableFormat, data, self)
+        # Substreams are consumed glyph by glyph; memoryview slices avoid
+        # copying the remaining data of a stream each time.
+        dummy, data = sstruct.unpack2(woff2GlyfTableFormat, memoryview(data), self)
         offset = woff2GlyfTableFormatSize
 
         for stream in self.subStreams:
@@ -807,7 +930,7 @@ class WOFF2GlyfTable(getTableClass("glyf")):
         self.bboxBitmap = array.array("B", bboxBitmap)
         self.bboxStream = self.bboxStream[bboxBitmapSize:]
 
-        self.nContourStream = array.array("h", self.nContourStream)
+        self.nContourStream = array.array("h", bytes(self.nContourStream))
         if sys.byteorder != "big":
             self.nContourStream.byteswap()
         assert len(self.nContourStream) == self.numGlyphs
@@ -828,11 +951,85 @@ class WOFF2GlyfTable(getTableClass("glyf")):
                     % (len(self.glyphOrder), self.numGlyphs)
                 )
 
+        if lazy:
+            self._indexGlyphs()
+            self.glyphs = LazyDict(
+                dict.fromkeys(self.glyphOrder, self._decodeLazyGlyph)
+            )
+            return
+
         glyphs = self.glyphs = {}
         for glyphID, glyphName in enumerate(self.glyphOrder):
             glyph = self._decodeGlyph(glyphID)
             glyphs[glyphName] = glyph
 
+    def _indexGlyphs(self):
+        """Compute where each glyph's data starts in the substreams, without
+        decoding the glyphs."""
+        self._streamViews = {
+            stream: getattr(self, stream) for stream in self.subStreams[1:]
+        }
+        nPointsStream = self.nPointsStream
+        flagStream = self.flagStream
+        glyphStream = self.glyphStream
+        compositeStream = self.compositeStream
+        bboxBitmap = self.bboxBitmap
+        offsets = self._glyphOffsets = array.array("I")
+        nPointsOffset = flagOffset = glyphOffset = 0
+        compositeOffset = bboxOffset = instructionOffset = 0
+        for glyphID, numberOfContours in enumerate(self.nContourStream):
+            offsets.extend(
+                (
+                    nPointsOffset,
+                    flagOffset,
+                    glyphOffset,
+                    compositeOffset,
+                    bboxOffset,
+                    instructionOffset,
+                )
+            )
+            if numberOfContours == 0:
+                continue
+            haveInstructions = True
+            if numberOfContours > 0:
+                data = nPointsStream[nPointsOffset:]
+                nPoints = 0
+                for i in range(numberOfContours):
+                    ptsOfContour, data = unpack255UShort(data)
+                    nPoints += ptsOfContour
+                nPointsOffset = len(nPointsStream) - len(data)
+                flags = flagStream[flagOffset : flagOffset + nPoints]
+                flagOffset += nPoints
+                glyphOffset += sum(flags.tobytes().translate(_tripletSizes))
+            else:
+                haveInstructions = False
+                more = True
+                while more:
+                    if compositeOffset + 4 > len(compositeStream):
+                        raise TTLibError("not enough 'compositeStream' data")
+                    (flags,) = struct.unpack(
+                        ">H", compositeStream[compositeOffset : compositeOffset + 2]
+                    )
+                    compositeOffset += _componentSize(flags)
+                    haveInstructions |= bool(flags & _g_l_y_f.WE_HAVE_INSTRUCTIONS)
+                    more = flags & _g_l_y_f.MORE_COMPONENTS
+            if haveInstructions:
+                data = glyphStream[glyphOffset:]
+                instructionLength, data = unpack255UShort(data)
+                glyphOffset = len(glyphStream) - len(data)
+                instructionOffset += instructionLength
+            if bboxBitmap[glyphID >> 3] & (0x80 >> (glyphID & 7)):
+                bboxOffset += bboxSize
+        self._glyphIDs = {glyphName: i for i, glyphName in enumerate(self.glyphOrder)}
+
+    def _decodeLazyGlyph(self, glyphName):
+        glyphID = self._glyphIDs[glyphName]
+        offsets = self._glyphOffsets[6 * glyphID : 6 * glyphID + 6]
+        # all substreams but the nContourStream, which is indexed by glyph ID
+        for stream, offset in zip(self.subStreams[1:], offsets):
+            setattr(self, stream, self._streamViews[stream][offset:])
+        return self._decodeGlyph(glyphID)
+
     def transform(self, ttFont):
         """Return transformed 'glyf' data"""
         self.numGlyphs = len(self.glyphs)
@@ -841,8 +1038,9 @@ class WOFF2GlyfTable(getTableClass("glyf")):
             ttFont["maxp"].numGlyphs = self.numGlyphs
         self.indexFormat = ttFont["head"].indexToLocFormat
 
+        # streams are built glyph by glyph, so use mutable buffers while encoding
         for stream in self.subStreams:
-            setattr(self, stream, b"")
+            setattr(self, stream, bytearray())
         bboxBitmapSize = ((self.numGlyphs + 31) >> 5) << 2
         self.bboxBitmap = array.array("B", [0] * bboxBitmapSize)
 
@@ -856,7 +1054,9 @@ class WOFF2GlyfTable(getTableClass("glyf")):
 
         self.bboxStream = self.bboxBitmap.tobytes() + self.bboxStream
         for stream in self.subStreams:
-            setattr(self, stream + "Size", len(getattr(self, stream)))
+            data = bytes(getattr(self, stream))
+            setattr(self, stream, data)
+            setattr(self, stream + "Size", len(data))
         self.version = 0
         self.optionFlags = 0
         if hasOverlapSimpleBitmap:
@@ -934,78 +1134,14 @@ class WOFF2GlyfTable(getTableClass("glyf")):
             glyph.recalcBounds(self)
 
     def _decodeTriplets(self, glyph):
-        def withSign(flag, baseval):
-            assert 0 <= baseval and baseval < 65536, "integer overflow"
-            return baseval if flag & 1 else -baseval
-
         nPoints = glyph.endPtsOfContours[-1] + 1
-        flagSize = nPoints
-        if flagSize > len(self.flagStream):
-            raise TTLibError("not enough 'flagStream' data")
-        flagsData = self.flagStream[:flagSize]
-        self.flagStream = self.flagStream[flagSize:]
-        flags = array.array("B", flagsData)
-
-        triplets = array.array("B", self.glyphStream)
-        nTriplets = len(triplets)
-        assert nPoints <= nTriplets
-
-        x = 0
-        y = 0
-        glyph.coordinates = getTableModule("glyf").GlyphCoordinates.zeros(nPoints)
-        glyph.flags = array.array("B")
-        tripletIndex = 0
-        for i in range(nPoints):
-            flag = flags[i]
-            onCurve = not bool(flag >> 7)
-            flag &= 0x7F
-            if flag < 84:
-                nBytes = 1
-            elif flag < 120:
-                nBytes = 2
-            elif flag < 124:
-                nBytes = 3
-            else:
-                nBytes = 4
-            assert (tripletIndex + nBytes) <= nTriplets
-            if flag < 10:
-                dx = 0
-                dy = withSign(flag, ((flag & 14) << 7) + triplets[tripletIndex])
-            elif flag < 20:
-                dx = withSign(flag, (((flag - 10) & 14) << 7) + triplets[tripletIndex])
-                dy = 0
-            elif flag < 84:
-                b0 = flag - 20
-                b1 = triplets[tripletIndex]
-                dx = withSign(flag, 1 + (b0 & 0x30) + (b1 >> 4))
-                dy = withSign(flag >> 1, 1 + ((b0 & 0x0C) << 2) + (b1 & 0x0F))
-            elif flag < 120:
-                b0 = flag - 84
-                dx = withSign(flag, 1 + ((b0 // 12) << 8) + triplets[tripletIndex])
-                dy = withSign(
-                    flag >> 1, 1 + (((b0 % 12) >> 2) << 8) + triplets[tripletIndex + 1]
-                )
-            elif flag < 124:
-                b2 = triplets[tripletIndex + 1]
-                dx = withSign(flag, (triplets[tripletIndex] << 4) + (b2 >> 4))
-                dy = withSign(
-                    flag >> 1, ((b2 & 0x0F) << 8) + triplets[tripletIndex + 2]
-                )
-            else:
-                dx = withSign(
-                    flag, (triplets[tripletIndex] << 8) + triplets[tripletIndex + 1]
-                )
-                dy = withSign(
-                    flag >> 1,
-                    (triplets[tripletIndex + 2] << 8) + triplets[tripletIndex + 3],
-                )
-            tripletIndex += nBytes
-            x += dx
-            y += dy
-            glyph.coordinates[i] = (x, y)
-            glyph.flags.append(int(onCurve))
-        bytesConsumed = tripletIndex
-        self.glyphStream = self.glyphStream[bytesConsumed:]
+        coordinates, glyph.flags, size = decodeTriplets(
+            self.flagStream, self.glyphStream, nPoints
+        )
+        glyph.coordinates = getTableModule("glyf").GlyphCoordinates()
+        glyph.coordinates.array.extend(coordinates)
+        self.flagStream = self.flagStream[nPoints:]
+        self.glyphStream = self.glyphStream[size:]
 
     def _encodeGlyph(self, glyphID):
         glyphName = self.getGlyphName(glyphID)
@@ -1062,7 +1198,7 @@ class WOFF2GlyfTable(getTableClass("glyf")):
             # for simple glyphs, compare the encoded bounding box info with the calculated
             # values, and if they match omit the bounding box info
             currentBBox = glyph.xMin, glyph.yMin, glyph.xMax, glyph.yMax
-            calculatedBBox = calcIntBounds(glyph.coordinates)
+            calculatedBBox = glyph.coordinates.calcIntBounds()
             if currentBBox == calculatedBBox:
                 return
         self.bboxBitmap[glyphID >> 3] |= 0x80 >> (glyphID & 7)
@@ -1070,59 +1206,14 @@ class WOFF2GlyfTable(getTableClass("glyf")):
 
     def _encodeTriplets(self, glyph):
         assert len(glyph.coordinates) == len(glyph.flags)
-        coordinates = glyph.coordinates.copy()
-        coordinates.absoluteToRelative()
-
-        flags = array.array("B")
-        triplets = array.array("B")
-        for i, (x, y) in enumerate(coordinates):
-            onCurve = glyph.flags[i] & _g_l_y_f.flagOnCurve
-            absX = abs(x)
-            absY = abs(y)
-            onCurveBit = 0 if onCurve else 128
-            xSignBit = 0 if (x < 0) else 1
-            ySignBit = 0 if (y < 0) else 1
-            xySignBits = xSignBit + 2 * ySignBit
-
-            if x == 0 and absY < 1280:
-                flags.append(onCurveBit + ((absY & 0xF00) >> 7) + ySignBit)
-                triplets.append(absY & 0xFF)
-            elif y == 0 and absX < 1280:
-                flags.append(onCurveBit + 10 + ((absX & 0xF00) >> 7) + xSignBit)
-                triplets.append(absX & 0xFF)
-            elif absX < 65 and absY < 65:
-                flags.append(
-                    onCurveBit
-                    + 20
-                    + ((absX - 1) & 0x30)
-                    + (((absY - 1) & 0x30) >> 2)
-                    + xySignBits
-                )
-                triplets.append((((absX - 1) & 0xF) << 4) | ((absY - 1) & 0xF))
-            elif absX < 769 and absY < 769:
-                flags.append(
-                    onCurveBit
-                    + 84
-                    + 12 * (((absX - 1) & 0x300) >> 8)
-                    + (((absY - 1) & 0x300) >> 6)
-                    + xySignBits
-                )
-                triplets.append((absX - 1) & 0xFF)
-                triplets.append((absY - 1) & 0xFF)
-            elif absX < 4096 and absY < 4096:
-                flags.append(onCurveBit + 120 + xySignBits)
-                triplets.append(absX >> 4)
-                triplets.append(((absX & 0xF) << 4) | (absY >> 8))
-                triplets.append(absY & 0xFF)
-            else:
-                flags.append(onCurveBit + 124 + xySignBits)
-                triplets.append(absX >> 8)
-                triplets.append(absX & 0xFF)
-                triplets.append(absY >> 8)
-                triplets.append(absY & 0xFF)
-
-        self.flagStream += flags.tobytes()
-        self.glyphStream += triplets.tobytes()
+        coordinates = glyph.coordinates.array
+        intCoordinates = array.array("i", map(int, coordinates))
+        if intCoordinates != coordinates:
+            # round non-integer coordinates, like the 'glyf' table does
+            intCoordinates = array.array("i", map(otRound, coordinates))
+        flags, triplets = encodeTriplets(intCoordinates, glyph.flags)
+        self.flagStream += flags
+        self.glyphStream += triplets
 
 
 class WOFF2HmtxTable(getTableClass("hmtx")):
@@ -1285,16 +1376,33 @@ class WOFF2HmtxTable(getTableClass("hmtx")):
 class WOFF2FlavorData(WOFFFlavorData):
     Flavor = "woff2"
 
-    def __init__(self, reader=None, data=None, transformedTables=None):
+    def __init__(
+        self,
+        reader=None,
+        data=None,
+        transformedTables=None,
+        brotliQuality=None,
+        brotliWindow=None,
+    ):
         """Data class that holds the WOFF2 header major/minor version, any
         metadata or private data (as bytes strings), and the set of
         table tags that have transformations applied (if reader is not None),
         or will have once the WOFF2 font is compiled.
 
+        It also holds the brotli quality and window size used to compress the
+        font data when the WOFF2 font is compiled. These are not stored in the
+        font file. Lower qualities compress much faster, at the cost of larger
+        files; for a quick "preview" encoding, use BROTLI_FAST_QUALITY and no
+        table transformations (transformedTables=()).
+
         Args:
                 reader: an SFNTReader (or subclass) object to read flavor data from.
                 data: another WOFFFlavorData object to initialise data from.
                 transformedTables: set of strings containing table tags to be transformed.
+                brotliQuality: brotli compression quality, between 0 and 11
+                        (default: BROTLI_QUALITY, i.e. 11).
+                brotliWindow: base 2 logarithm of the brotli sliding window size,
+                        between 10 and 24 (default: BROTLI_WINDOW, i.e. 22).
 
         Raises:
                 ImportError if the brotli module is not installed.
@@ -1333,11 +1441,31 @@ class WOFF2FlavorData(WOFFFlavorData):
             if transformedTables is None and hasattr(data, "transformedTables"):
                 transformedTables = data.transformedTables
 
+            if brotliQuality is None:
+                brotliQuality = getattr(data, "brotliQuality", None)
+            if brotliWindow is None:
+                brotliWindow = getattr(data, "brotliWindow", None)
+
         if transformedTables is None:
             transformedTables = woff2TransformedTableTags
 
         self.transformedTables = set(transformedTables)
 
+        if brotliQuality is None:
+            brotliQuality = BROTLI_QUALITY
+        elif not 0 <= brotliQuality <= 11:
+            raise ValueError(
+                "brotliQuality must be between 0 and 11, found %r" % brotliQuality
+            )
+        if brotliWindow is None:
+            brotliWindow = BROTLI_WINDOW
+        elif not 10 <= brotliWindow <= 24:
+            raise ValueError(
+                "brotliWindow must be between 10 and 24, found %r" % brotliWindow
+            )
+        self.brotliQuality = brotliQuality
+        self.brotliWindow = brotliWindow
+
     def _decompress(self, rawData):
         return brotli.decompress(rawData)
 
@@ -1442,7 +1570,9 @@ def unpack255UShort(data):
     >>> unpack255UShort(struct.pack("BBB", 253, 1, 250))[0]
     506
     """
-    code = byteord(data[:1])
+    if len(data) == 0:
+        raise TTLibError("not enough data to unpack 255UInt16")
+    code = data[0]
     data = data[1:]
     if code == 253:
         # read two more bytes as an unsigned short
@@ -1454,14 +1584,14 @@ def unpack255UShort(data):
         # read another byte, plus 253 * 2
         if len(data) == 0:
             raise TTLibError("not enough data to unpack 255UInt16")
-        result = byteord(data[:1])
+        result = data[0]
         result += 506
         data = data[1:]
     elif code == 255:
         # read another byte, plus 253
         if len(data) == 0:
             raise TTLibError("not enough data to unpack 255UInt16")
-        result = byteord(data[:1])
+        result = data[0]
         result += 253
         data = data[1:]
     else:
@@ -1494,7 +1624,15 @@ def pack255UShort(value):
         return struct.pack(">BH", 253, value)
 
 
-def compress(input_file, output_file, transform_tables=None):
+def compress(
+    input_file,
+    output_file,
+    transform_tables=None,
+    flavor="woff2",
+    brotli_quality=None,
+    brotli_window=None,
+    fast=False,
+):
     """Compress OpenType font to WOFF2.
 
     Args:
@@ -1506,20 +1644,172 @@ def compress(input_file, output_file, transform_tables=None):
                     to enable preprocessing transformations. By default, only 'glyf'
                     and 'loca' tables are transformed. An empty set means disable all
                     transformations.
+            flavor: either "woff2" (default), or "woff" to compress to WOFF 1.0
+                    instead. The WOFF2-specific arguments below are ignored for WOFF.
+            brotli_quality: Optional[int]: the brotli compression quality, from 0
+                    to 11 (default: 11, the best and slowest).
+            brotli_window: Optional[int]: the base 2 logarithm of the brotli
+                    sliding window size, from 10 to 24 (default: 22).
+            fast: bool: encode a quick "preview" WOFF2 font, skipping all table
+                    transformations, and compressing with a fast brotli quality
+                    (BROTLI_FAST_QUALITY) unless 'brotli_quality' is specified.
     """
+    if flavor not in ("woff", "woff2"):
+        raise ValueError("flavor must be 'woff' or 'woff2', found %r" % flavor)
+
     log.info("Processing %s => %s" % (input_file, output_file))
 
     font = TTFont(input_file, recalcBBoxes=False, recalcTimestamp=False)
-    font.flavor = "woff2"
+    font.flavor = flavor
 
-    if transform_tables is not None:
+    if flavor == "woff2":
+        if fast:
+            transform_tables = ()
+            if brotli_quality is None:
+                brotli_quality = BROTLI_FAST_QUALITY
         font.flavorData = WOFF2FlavorData(
-            data=font.flavorData, transformedTables=transform_tables
+            data=font.flavorData,
+            transformedTables=transform_tables,
+            brotliQuality=brotli_quality,
+            brotliWindow=brotli_window,
         )
 
     font.save(output_file, reorderTables=False)
 
 
+def _compressFile(input_file, output_file, **kwargs):
+    # Runs in the worker processes of compress_many: fonts are read from and
+    # written to disk by the workers, so only the file names and the result
+    # tuple are passed between processes.
+    start = time.perf_counter()
+    compress(input_file, output_file, **kwargs)
+    elapsed = time.perf_counter() - start
+    return (
+        input_file,
+        output_file,
+        os.path.getsize(input_file),
+        os.path.getsize(output_file),
+        elapsed,
+    )
+
+
+def _logCompressResult(input_file, output_file, inputSize, outputSize, elapsed):
+    log.info(
+        "%s => %s: %d -> %d bytes (%.1f%%) in %.3fs",
+        input_file,
+        output_file,
+        inputSize,
+        outputSize,
+        100.0 * outputSize / inputSize if inputSize else 0.0,
+        elapsed,
+    )
+
+
+def compress_many(input_files, output_files, jobs=1, **kwargs):
+    """Compress many OpenType font files to WOFF2 (or WOFF), optionally in
+    parallel.
+
+    Args:
+            input_files: a sequence of input font file paths.
+            output_files: a sequence of output file paths, same length as
+                    'input_files'. They must all be different.
+            jobs: the number of worker processes. If 1 (default), the fonts are
+                    compressed one after the other in the current process.
+            kwargs: the other keyword arguments are passed on to `compress`.
+
+    Each font is parsed, transformed and compressed by a single worker, while
+    the other workers process the following fonts. To bound the memory used,
+    no more than twice as many fonts as there are workers are submitted at
+    any time.
+
+    The compression time and ratio of each file is logged as soon as it is
+    done. Fonts that fail to compress are logged as errors and skipped.
+
+    Returns a list of (input_file, output_file, input_size, output_size,
+    seconds) tuples for the fonts that were compressed successfully, in
+    the order in which they completed.
+    """
+    if len(input_files) != len(output_files):
+        raise ValueError("expected as many output files as input files")
+    seen = set()
+    for output_file in output_files:
+        path = os.path.normcase(os.path.abspath(output_file))
+        if path in seen:
+            raise ValueError("duplicate output file: %s" % output_file)
+        seen.add(path)
+
+    results = []
+    errors = 0
+    tasks = iter(zip(input_files, output_files))
+
+    if jobs <= 1:
+        for input_file, output_file in tasks:
+            try:
+                result = _compressFile(input_file, output_file, **kwargs)
+            except Exception:
+                log.exception("Failed to compress %s", input_file)
+                errors += 1
+                continue
+            _logCompressResult(*result)
+            results.append(result)
+    else:
+        from concurrent.futures import (
+            ProcessPoolExecutor,
+            wait,
+            FIRST_COMPLETED,
+        )
+        from concurrent.futures.process import BrokenProcessPool
+
+        pending = {}
+        with ProcessPoolExecutor(jobs) as executor:
+            while True:
+                for input_file, output_file in tasks:
+                    try:
+                        future = executor.submit(
+                            _compressFile, input_file, output_file, **kwargs
+                        )
+                    except BrokenProcessPool as e:
+                        # a worker died abruptly (e.g. it ran out of memory):
+                        # the pending fonts fail with the same error, and
+                        # the remaining ones can't be submitted
+                        log.error("Failed to compress %s: %s", input_file, e)
+                        errors += 1
+                        for input_file, _ in tasks:
+                            log.error("Failed to compress %s: %s", input_file, e)
+                            errors += 1
+                        break
+                    pending[future] = input_file
+                    if len(pending) >= 2 * jobs:
+                        break
+                if not pending:
+                    break
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    input_file = pending.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception:
+                        log.exception("Failed to compress %s", input_file)
+                        errors += 1
+                        continue
+                    _logCompressResult(*result)
+                    results.append(result)
+
+    if len(results) > 1:
+        inputSize = sum(r[2] for r in results)
+        outputSize = sum(r[3] for r in results)
+        log.info(
+            "Compressed %d files: %d -> %d bytes (%.1f%%)",
+            len(results),
+            inputSize,
+            outputSize,
+            100.0 * outputSize / inputSize if inputSize else 0.0,
+        )
+    if errors:
+        log.error("Failed to compress %d files", errors)
+    return results
+
+
 def decompress(input_file, output_file):
     """Decompress WOFF2 font to OpenType font.
 
@@ -1573,7 +1863,7 @@ def main(args=None):
 
     parser_group = parser.add_subparsers(title="sub-commands")
     parser_compress = parser_group.add_parser(
-        "compress", description="Compress a TTF or OTF font to WOFF2"
+        "compress", description="Compress TTF or OTF fonts to WOFF2 (or WOFF)"
     )
     parser_decompress = parser_group.add_parser(
         "decompress", description="Decompress a WOFF2 font to OTF"
@@ -1595,9 +1885,10 @@ def main(args=None):
         )
 
     parser_compress.add_argument(
-        "input_file",
+        "input_files",
         metavar="INPUT",
-        help="the input OpenType font (.ttf or .otf)",
+        nargs="+",
+        help="the input OpenType fonts (.ttf or .otf)",
     )
     parser_decompress.add_argument(
         "input_file",
@@ -1605,11 +1896,58 @@ def main(args=None):
         help="the input WOFF2 font",
     )
 
-    parser_compress.add_argument(
+    output_group = parser_compress.add_mutually_exclusive_group()
+    output_group.add_argument(
         "-o",
         "--output-file",
         metavar="OUTPUT",
-        help="the output WOFF2 font",
+        help="the output WOFF2 font. This only works with a single input.",
+    )
+    output_group.add_argument(
+        "-d",
+        "--output-dir",
+        metavar="DIRECTORY",
+        help="the output directory (default: same as the input files)",
+    )
+    parser_compress.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help="compress using N parallel processes (default: %(default)s; "
+        "0 means the number of CPUs)",
+    )
+    brotli_group = parser_compress.add_argument_group()
+    brotli_group.add_argument(
+        "--quality",
+        dest="brotli_quality",
+        type=int,
+        choices=range(12),
+        metavar="Q",
+        help="brotli compression quality, from 0 to 11 (default: 11, or %d with "
+        "--fast)" % BROTLI_FAST_QUALITY,
+    )
+    brotli_group.add_argument(
+        "--window",
+        dest="brotli_window",
+        type=int,
+        choices=range(10, 25),
+        metavar="W",
+        help="base 2 logarithm of the brotli window size, from 10 to 24 "
+        "(default: %d)" % BROTLI_WINDOW,
+    )
+    brotli_group.add_argument(
+        "--fast",
+        action="store_true",
+        help="fast 'preview' encoding: no table transformations, and a low "
+        "brotli quality",
+    )
+    parser_compress.add_argument(
+        "--flavor",
+        choices=("woff2", "woff"),
+        default="woff2",
+        help="the output format (default: %(default)s)",
     )
     parser_decompress.add_argument(
         "-o",
@@ -1635,7 +1973,7 @@ def main(args=None):
     )
 
     parser_compress.set_defaults(
-        subcommand=compress,
+        subcommand=compress_many,
         transform_tables={"glyf", "loca"},
     )
     parser_decompress.set_defaults(subcommand=decompress)
@@ -1653,18 +1991,42 @@ def main(args=None):
         level=("ERROR" if quiet else "DEBUG" if verbose else "INFO"),
     )
 
-    if not options["output_file"]:
-        if subcommand is compress:
-            extension = ".woff2"
-        elif subcommand is decompress:
-            # choose .ttf/.otf file extension depending on sfntVersion
-            with open(options["input_file"], "rb") as f:
-                f.seek(4)  # skip 'wOF2' signature
-                sfntVersion = f.read(4)
-            assert len(sfntVersion) == 4, "not enough data"
-            extension = ".otf" if sfntVersion == b"OTTO" else ".ttf"
+    if subcommand is compress_many:
+        input_files = options.pop("input_files")
+        output_file = options.pop("output_file")
+        output_dir = options.pop("output_dir")
+        if output_file:
+            if len(input_files) > 1:
+                parser.error("-o/--output-file can't be used with multiple inputs")
+            output_files = [output_file]
         else:
-            raise AssertionError(subcommand)
+            if output_dir and not os.path.isdir(output_dir):
+                parser.error("'%s' is not a directory" % output_dir)
+            extension = "." + options["flavor"]
+            output_files = [
+                makeOutputFileName(f, outputDir=output_dir, extension=extension)
+                for f in input_files
+            ]
+        jobs = min(len(input_files), options.pop("jobs") or os.cpu_count() or 1)
+        if jobs > 1:
+            log.info("Running %d parallel processes", jobs)
+        try:
+            results = compress_many(input_files, output_files, jobs=jobs, **options)
+        except ValueError as e:
+            parser.error(str(e))
+        if len(results) < len(input_files):
+            if len(input_files) == 1:
+                parser.error("failed to compress %s" % input_files[0])
+            return 1
+        return
+
+    if not options["output_file"]:
+        # choose .ttf/.otf file extension depending on sfntVersion
+        with open(options["input_file"], "rb") as f:
+            f.seek(4)  # skip 'wOF2' signature
+            sfntVersion = f.read(4)
+        assert len(sfntVersion) == 4, "not enough data"
+        extension = ".otf" if sfntVersion == b"OTTO" else ".ttf"
         options["output_file"] = makeOutputFileName(
             options["input_file"], outputDir=None, extension=extension
         )
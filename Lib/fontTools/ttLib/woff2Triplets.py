@@ -0,0 +1,206 @@
+"""Encoder and decoder for the point coordinates of the WOFF2 'glyf' transform.
+
+In the transformed 'glyf' table, each point of a simple glyph is stored as one
+flag byte in the flagStream, plus one to four bytes of "triplet" data in the
+glyphStream, encoding the point's delta from the previous point.
+
+See https://www.w3.org/TR/WOFF2/#triplet_decoding
+
+The functions in this module work on all the points of a glyph at once, on flat
+arrays of coordinates. They can optionally be compiled with Cython.
+"""
+
+try:
+    import cython
+except (AttributeError, ImportError):
+    # if cython not installed, use mock module with no-op decorators and types
+    from fontTools.misc import cython
+COMPILED = cython.compiled
+
+from fontTools.ttLib import TTLibError
+import array
+
+__all__ = ["decodeTriplets", "encodeTriplets"]
+
+
+@cython.locals(
+    nPoints=cython.int,
+    nBytes=cython.int,
+    i=cython.int,
+    pos=cython.int,
+    flag=cython.int,
+    b0=cython.int,
+    b1=cython.int,
+    b2=cython.int,
+    b3=cython.int,
+    dx=cython.int,
+    dy=cython.int,
+    x=cython.int,
+    y=cython.int,
+)
+def decodeTriplets(flags, data, nPoints):
+    """Decode the first 'nPoints' points from the WOFF2 'flags' and triplet
+    'data' bytes.
+
+    Returns a tuple containing a flat array("d") of absolute coordinates
+    (x0, y0, x1, y1, ...), an array("B") of on-curve flags (1 if the point is
+    on-curve, 0 otherwise), and the number of triplet bytes consumed.
+
+    >>> coordinates, onCurves, size = decodeTriplets(b"\\x01\\x8a", b"\\x0a\\x14", 2)
+    >>> list(coordinates), list(onCurves), size
+    ([0.0, 10.0, -20.0, 10.0], [1, 0], 2)
+    """
+    if nPoints > len(flags):
+        raise TTLibError("not enough 'flagStream' data")
+    nBytes = len(data)
+    coordinates = array.array("d", bytes(16 * nPoints))
+    onCurves = array.array("B", bytes(nPoints))
+    x = y = pos = 0
+    for i in range(nPoints):
+        flag = flags[i]
+        if not flag & 0x80:
+            onCurves[i] = 1
+        flag &= 0x7F
+        if flag < 84:
+            if pos + 1 > nBytes:
+                raise TTLibError("not enough 'glyphStream' data")
+            b0 = data[pos]
+            pos += 1
+            if flag < 10:
+                dx = 0
+                dy = ((flag & 14) << 7) + b0
+            elif flag < 20:
+                dx = (((flag - 10) & 14) << 7) + b0
+                dy = 0
+            else:
+                b1 = flag - 20
+                dx = 1 + (b1 & 0x30) + (b0 >> 4)
+                dy = 1 + ((b1 & 0x0C) << 2) + (b0 & 0x0F)
+        elif flag < 120:
+            if pos + 2 > nBytes:
+                raise TTLibError("not enough 'glyphStream' data")
+            b0 = flag - 84
+            dx = 1 + ((b0 // 12) << 8) + data[pos]
+            dy = 1 + (((b0 % 12) >> 2) << 8) + data[pos + 1]
+            pos += 2
+        elif flag < 124:
+            if pos + 3 > nBytes:
+                raise TTLibError("not enough 'glyphStream' data")
+            b1 = data[pos + 1]
+            dx = (data[pos] << 4) + (b1 >> 4)
+            dy = ((b1 & 0x0F) << 8) + data[pos + 2]
+            pos += 3
+        else:
+            if pos + 4 > nBytes:
+                raise TTLibError("not enough 'glyphStream' data")
+            b0 = data[pos]
+            b1 = data[pos + 1]
+            b2 = data[pos + 2]
+            b3 = data[pos + 3]
+            dx = (b0 << 8) + b1
+            dy = (b2 << 8) + b3
+            pos += 4
+        # the first flag bit is the sign of dx (or of dy, if dx is implied
+        # zero); the second one is the sign of dy
+        if flag < 10:
+            if not flag & 1:
+                dy = -dy
+        elif flag < 20:
+            if not flag & 1:
+                dx = -dx
+        else:
+            if not flag & 1:
+                dx = -dx
+            if not flag & 2:
+                dy = -dy
+        x += dx
+        y += dy
+        coordinates[2 * i] = x
+        coordinates[2 * i + 1] = y
+    return coordinates, onCurves, pos
+
+
+@cython.locals(
+    nPoints=cython.int,
+    i=cython.int,
+    x=cython.int,
+    y=cython.int,
+    prevX=cython.int,
+    prevY=cython.int,
+    absX=cython.int,
+    absY=cython.int,
+    onCurveBit=cython.int,
+    xySignBits=cython.int,
+)
+def encodeTriplets(coordinates, onCurves):
+    """Encode points given as a flat sequence of absolute integer 'coordinates'
+    (x0, y0, x1, y1, ...), and a sequence of 'onCurves' flags. Only bit 0 of
+    each flag is used, so the 'glyf' point flags can be passed as is.
+
+    Returns a tuple of the flags bytes and the triplet data bytes.
+
+    >>> encodeTriplets([0, 10, -20, 10], [1, 0])
+    (b'\\x01\\x8a', b'\\n\\x14')
+    """
+    nPoints = len(onCurves)
+    if len(coordinates) != 2 * nPoints:
+        raise ValueError(
+            "expected %d coordinates, found %d" % (2 * nPoints, len(coordinates))
+        )
+    flags = bytearray(nPoints)
+    triplets = bytearray()
+    prevX = prevY = 0
+    for i in range(nPoints):
+        x = coordinates[2 * i]
+        y = coordinates[2 * i + 1]
+        x, prevX = x - prevX, x
+        y, prevY = y - prevY, y
+        absX = -x if x < 0 else x
+        absY = -y if y < 0 else y
+        onCurveBit = 0 if onCurves[i] & 1 else 128
+        xySignBits = (0 if x < 0 else 1) + (0 if y < 0 else 2)
+
+        if x == 0 and absY < 1280:
+            flags[i] = onCurveBit + ((absY & 0xF00) >> 7) + (0 if y < 0 else 1)
+            triplets.append(absY & 0xFF)
+        elif y == 0 and absX < 1280:
+            flags[i] = onCurveBit + 10 + ((absX & 0xF00) >> 7) + (0 if x < 0 else 1)
+            triplets.append(absX & 0xFF)
+        elif absX < 65 and absY < 65:
+            flags[i] = (
+                onCurveBit
+                + 20
+                + ((absX - 1) & 0x30)
+                + (((absY - 1) & 0x30) >> 2)
+                + xySignBits
+            )
+            triplets.append((((absX - 1) & 0xF) << 4) | ((absY - 1) & 0xF))
+        elif absX < 769 and absY < 769:
+            flags[i] = (
+                onCurveBit
+                + 84
+                + 12 * (((absX - 1) & 0x300) >> 8)
+                + (((absY - 1) & 0x300) >> 6)
+                + xySignBits
+            )
+            triplets.append((absX - 1) & 0xFF)
+            triplets.append((absY - 1) & 0xFF)
+        elif absX < 4096 and absY < 4096:
+            flags[i] = onCurveBit + 120 + xySignBits
+            triplets.append(absX >> 4)
+            triplets.append(((absX & 0xF) << 4) | (absY >> 8))
+            triplets.append(absY & 0xFF)
+        else:
+            flags[i] = onCurveBit + 124 + xySignBits
+            triplets.append(absX >> 8)
+            triplets.append(absX & 0xFF)
+            triplets.append(absY >> 8)
+            triplets.append(absY & 0xFF)
+    return bytes(flags), bytes(triplets)
+
+
+if __name__ == "__main__":
+    import sys
+    import doctest
+
+    sys.exit(doctest.testmod().failed)
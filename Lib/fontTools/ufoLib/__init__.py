@@ -941,6 +941,9 @@ class UFOWriter(UFOReader):
         structure: The internal structure of the .ufo file: either `ZIP` or `PACKAGE`.
         validate: A boolean indicating if the data read should be validated. Defaults
             to `True`.
+        compression: The :mod:`zipfile` compression method used to write a `ZIP`
+            structure. Defaults to `zipfile.ZIP_DEFLATED`; `zipfile.ZIP_STORED`
+            writes a larger .ufoz file, but faster.
 
     By default, the written data will be validated before writing. Set ``validate`` to
     ``False`` if you do not want to validate the data. Validation can also be overriden
@@ -958,6 +961,7 @@ class UFOWriter(UFOReader):
         fileCreator: str = "com.github.fonttools.ufoLib",
         structure: Optional[UFOFileStructure] = None,
         validate: bool = True,
+        compression: int = zipfile.ZIP_DEFLATED,
     ) -> None:
         try:
             formatVersion = normalizeFormatVersion(formatVersion, UFOFormatVersion)
@@ -1029,7 +1033,9 @@ class UFOWriter(UFOReader):
                     # if the output zip file didn't exist, we create the root folder;
                     # we name it the same as input 'path', but with '.ufo' extension
                     rootDir = os.path.splitext(os.path.basename(path))[0] + ".ufo"
-                    parentFS = fs.zipfs.ZipFS(path, write=True, encoding="utf-8")  # type: ignore[abstract]
+                    parentFS = fs.zipfs.ZipFS(  # type: ignore[abstract]
+                        path, write=True, compression=compression, encoding="utf-8"
+                    )
                     parentFS.makedir(rootDir)
                 # 'ClosingSubFS' ensures that the parent filesystem is closed
                 # when its root subdirectory is closed
@@ -1037,6 +1043,7 @@ class UFOWriter(UFOReader):
             else:
                 self.fs = fs.osfs.OSFS(path, create=True)
             self._fileStructure = structure
+            self._compression = compression
             self._havePreviousFile = havePreviousFile
             self._shouldClose = True
         elif isinstance(path, fs.base.FS):
@@ -1814,7 +1821,12 @@ class UFOWriter(UFOReader):
             # if we are updating an existing zip file, we can now compress the
             # contents of the temporary filesystem in the destination path
             rootDir = os.path.splitext(os.path.basename(self._path))[0] + ".ufo"
-            with fs.zipfs.ZipFS(self._path, write=True, encoding="utf-8") as destFS:  # type: ignore[abstract]
+            with fs.zipfs.ZipFS(  # type: ignore[abstract]
+                self._path,
+                write=True,
+                compression=self._compression,
+                encoding="utf-8",
+            ) as destFS:
                 fs.copy.copy_fs(self.fs, destFS.makedir(rootDir))
         super().close()
 
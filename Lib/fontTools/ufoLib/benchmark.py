@@ -0,0 +1,167 @@
+"""Benchmark the performance of reading the .glif files of a UFO.
+
+The glyphs are read with validation, and without it using either the
+element tree based reader or the fast streaming parser.
+
+If a UFO is given, loading the whole font from it is also compared with
+loading it from .ufoz copies of it, deflated or stored uncompressed, and
+the time it takes to write these is measured.
+
+Usage: python -m fontTools.ufoLib.benchmark UFO_OR_GLYPHS_DIR [REPEAT]
+"""
+
+from fontTools.misc import filesystem as fs
+from fontTools.pens.recordingPen import RecordingPointPen
+from fontTools.ufoLib import UFOReader
+from fontTools.ufoLib.glifLib import (
+    GLIFFormatVersion,
+    GlyphSet,
+    _glifTreeFromString,
+    _readGlyphFromStringFast,
+    _readGlyphFromTree,
+)
+import os
+import sys
+import tempfile
+import timeit
+import zipfile
+
+
+class _Glyph:
+    pass
+
+
+# the .ufoz copies of the benchmarked UFO, by compression method
+_tempDir = None
+_ufozPaths = {}
+
+
+def setup_glyph_set(path):
+    if os.path.exists(os.path.join(path, "metainfo.plist")):
+        return UFOReader(path, validate=False).getGlyphSet()
+    return GlyphSet(path, validateRead=False)
+
+
+def setup_glifs(path):
+    glyphSet = setup_glyph_set(path)
+    return [glyphSet.getGLIF(glyphName) for glyphName in glyphSet.keys()]
+
+
+def read_glyphs_validate(glyphSet):
+    for glyphName in glyphSet.keys():
+        glyphSet.readGlyph(glyphName, _Glyph(), RecordingPointPen(), validate=True)
+
+
+def read_glyphs_no_validate(glyphSet):
+    for glyphName in glyphSet.keys():
+        glyphSet.readGlyph(glyphName, _Glyph(), RecordingPointPen(), validate=False)
+
+
+def parse_glifs_tree(glifs):
+    formatVersions = GLIFFormatVersion.supported_versions()
+    for text in glifs:
+        _readGlyphFromTree(
+            _glifTreeFromString(text),
+            _Glyph(),
+            RecordingPointPen(),
+            formatVersions=formatVersions,
+            validate=False,
+        )
+
+
+def parse_glifs_fast(glifs):
+    for text in glifs:
+        _readGlyphFromStringFast(text, _Glyph(), RecordingPointPen())
+
+
+def setup_ufo(path):
+    return path
+
+
+def _setup_ufoz(path, compression):
+    if compression not in _ufozPaths:
+        ufozPath = os.path.join(_tempDir, "%d.ufoz" % compression)
+        write_ufoz((path, ufozPath, compression))
+        _ufozPaths[compression] = ufozPath
+    return _ufozPaths[compression]
+
+
+def setup_ufoz(path):
+    return _setup_ufoz(path, zipfile.ZIP_DEFLATED)
+
+
+def setup_ufoz_stored(path):
+    return _setup_ufoz(path, zipfile.ZIP_STORED)
+
+
+def setup_write_ufoz(path):
+    return path, os.path.join(_tempDir, "write.ufoz"), zipfile.ZIP_DEFLATED
+
+
+def setup_write_ufoz_stored(path):
+    return path, os.path.join(_tempDir, "write.ufoz"), zipfile.ZIP_STORED
+
+
+def load_ufo(path):
+    with UFOReader(path, validate=False) as reader:
+        reader.readInfo(_Glyph())
+        reader.readGroups()
+        reader.readKerning()
+        reader.readLib()
+        reader.readFeatures()
+        for layerName in reader.getLayerNames():
+            glyphSet = reader.getGlyphSet(layerName)
+            glyphSet.readGlyphs(
+                glyphObjects={glyphName: _Glyph() for glyphName in glyphSet.keys()},
+                pointPens={
+                    glyphName: RecordingPointPen() for glyphName in glyphSet.keys()
+                },
+            )
+
+
+def write_ufoz(data):
+    path, ufozPath, compression = data
+    rootDir = os.path.splitext(os.path.basename(ufozPath))[0] + ".ufo"
+    with (
+        fs.osfs.OSFS(path) as srcFS,
+        fs.zipfs.ZipFS(ufozPath, write=True, compression=compression) as dstFS,
+    ):
+        fs.copy.copy_fs(srcFS, dstFS.makedir(rootDir))
+
+
+def run_benchmark(path, function, setup, repeat=3):
+    print("%s (%s):" % (function, setup), end="")
+    function = globals()[function]
+    setup = globals()["setup_" + setup]
+    results = []
+    for _ in range(repeat):
+        data = setup(path)
+        results.append(timeit.timeit(lambda: function(data), number=1))
+    print("\t%8.1fms" % (min(results) * 1000.0))
+
+
+def main(args=None):
+    if args is None:
+        args = sys.argv[1:]
+    if not args:
+        print(__doc__, file=sys.stderr)
+        return 2
+    path = args[0]
+    repeat = int(args[1]) if len(args) > 1 else 3
+    run_benchmark(path, "read_glyphs_validate", "glyph_set", repeat)
+    run_benchmark(path, "read_glyphs_no_validate", "glyph_set", repeat)
+    run_benchmark(path, "parse_glifs_tree", "glifs", repeat)
+    run_benchmark(path, "parse_glifs_fast", "glifs", repeat)
+    if not os.path.exists(os.path.join(path, "metainfo.plist")):
+        return
+    global _tempDir
+    with tempfile.TemporaryDirectory() as _tempDir:
+        run_benchmark(path, "load_ufo", "ufo", repeat)
+        run_benchmark(path, "load_ufo", "ufoz", repeat)
+        run_benchmark(path, "load_ufo", "ufoz_stored", repeat)
+        run_benchmark(path, "write_ufoz", "write_ufoz", repeat)
+        run_benchmark(path, "write_ufoz", "write_ufoz_stored", repeat)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
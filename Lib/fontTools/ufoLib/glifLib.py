@@ -12,8 +12,11 @@ glyph data. See the class doc string for details.
 
 from __future__ import annotations
 
+import copy
+import hashlib
 import logging
-from collections import OrderedDict
+import os
+from collections import OrderedDict, deque
 from typing import TYPE_CHECKING, Any, Optional, Union, cast
 from warnings import warn
 
@@ -40,7 +43,7 @@ from fontTools.ufoLib.validators import (
 )
 
 if TYPE_CHECKING:
-    from collections.abc import Callable, Iterable, Set
+    from collections.abc import Callable, Iterable, Mapping, MutableMapping, Set
     from logging import Logger
 
     from fontTools.annotations import (
@@ -139,6 +142,120 @@ class Glyph:
         self.glyphSet.readGlyph(self.glyphName, self, pointPen)
 
 
+class _GlyphRecording(AbstractPointPen):
+    """
+    Records the glyph attributes and point pen calls made by the GLIF reader,
+    as compact, picklable data that can be replayed later.
+    """
+
+    def __init__(self) -> None:
+        self.__dict__["data"] = ([], [])
+
+    def __setattr__(self, attr: str, value: Any) -> None:
+        self.data[0].append((attr, value))
+
+    # The outline is recorded as a flat list of tuples of different lengths:
+    # (identifier,) for beginPath, () for endPath, (x, y, segmentType, smooth,
+    # name, identifier) for addPoint, and (baseGlyphName, transformation,
+    # identifier) for addComponent.
+
+    def beginPath(self, identifier: Optional[str] = None, **kwargs: Any) -> None:
+        self.data[1].append((identifier,))
+
+    def endPath(self) -> None:
+        self.data[1].append(())
+
+    def addPoint(
+        self,
+        pt: tuple[float, float],
+        segmentType: Optional[str] = None,
+        smooth: bool = False,
+        name: Optional[str] = None,
+        identifier: Optional[str] = None,
+        **kwargs: Any,
+    ) -> None:
+        self.data[1].append((pt[0], pt[1], segmentType, smooth, name, identifier))
+
+    def addComponent(
+        self,
+        baseGlyphName: str,
+        transformation: tuple[float, float, float, float, float, float],
+        identifier: Optional[str] = None,
+        **kwargs: Any,
+    ) -> None:
+        self.data[1].append((baseGlyphName, transformation, identifier))
+
+    @staticmethod
+    def replay(
+        data: tuple[list[tuple[str, Any]], list[tuple]],
+        glyphObject: Optional[Any],
+        pointPen: Optional[AbstractPointPen],
+    ) -> None:
+        attributes, outline = data
+        if glyphObject is not None:
+            for attr, value in attributes:
+                if isinstance(value, (list, dict)):
+                    # don't share mutable values with the cache
+                    value = copy.deepcopy(value)
+                _relaxedSetattr(glyphObject, attr, value)
+        if pointPen is None:
+            return
+        # Like the GLIF reader, only pass the identifiers that are set, and
+        # fall back to the old pen protocol without identifiers.
+        addPoint = pointPen.addPoint
+        for item in outline:
+            n = len(item)
+            if n == 6:
+                x, y, segmentType, smooth, name, identifier = item
+                if identifier is None:
+                    addPoint((x, y), segmentType=segmentType, smooth=smooth, name=name)
+                    continue
+                try:
+                    addPoint(
+                        (x, y),
+                        segmentType=segmentType,
+                        smooth=smooth,
+                        name=name,
+                        identifier=identifier,
+                    )
+                except TypeError:
+                    addPoint((x, y), segmentType=segmentType, smooth=smooth, name=name)
+                    warn(
+                        "The addPoint method needs an identifier kwarg. The point's identifier value has been discarded.",
+                        DeprecationWarning,
+                    )
+            elif n == 1:
+                identifier = item[0]
+                if identifier is None:
+                    pointPen.beginPath()
+                    continue
+                try:
+                    pointPen.beginPath(identifier=identifier)
+                except TypeError:
+                    pointPen.beginPath()
+                    warn(
+                        "The beginPath method needs an identifier kwarg. The contour's identifier value has been discarded.",
+                        DeprecationWarning,
+                    )
+            elif n == 0:
+                pointPen.endPath()
+            else:
+                baseGlyphName, transformation, identifier = item
+                if identifier is None:
+                    pointPen.addComponent(baseGlyphName, transformation)
+                    continue
+                try:
+                    pointPen.addComponent(
+                        baseGlyphName, transformation, identifier=identifier
+                    )
+                except TypeError:
+                    pointPen.addComponent(baseGlyphName, transformation)
+                    warn(
+                        "The addComponent method needs an identifier kwarg. The component's identifier value has been discarded.",
+                        DeprecationWarning,
+                    )
+
+
 # ---------
 # Glyph Set
 # ---------
@@ -242,6 +359,7 @@ class GlyphSet(_UFOBaseIO):
         self._validateWrite: bool = validateWrite
         self._existingFileNames: set[str] | None = None
         self._reverseContents: Optional[dict[str, str]] = None
+        self._writeManifest: Optional[dict[str, Any]] = None
 
         self.rebuildContents()
 
@@ -447,33 +565,181 @@ class GlyphSet(_UFOBaseIO):
         if validate is None:
             validate = self._validateRead
         text = self.getGLIF(glyphName)
+        formatVersions = GLIFFormatVersion.supported_versions(
+            self.ufoFormatVersionTuple
+        )
         try:
-            tree = _glifTreeFromString(text)
-            formatVersions = GLIFFormatVersion.supported_versions(
-                self.ufoFormatVersionTuple
-            )
-            _readGlyphFromTree(
-                tree,
-                glyphObject,
-                pointPen,
-                formatVersions=formatVersions,
-                validate=validate,
-            )
+            if validate or not _readGlyphFromStringFast(
+                text, glyphObject, pointPen, formatVersions
+            ):
+                tree = _glifTreeFromString(text)
+                _readGlyphFromTree(
+                    tree,
+                    glyphObject,
+                    pointPen,
+                    formatVersions=formatVersions,
+                    validate=validate,
+                )
         except GlifLibError as glifLibError:
-            # Re-raise with a note that gives extra context, describing where
-            # the error occurred.
-            fileName = self.contents[glyphName]
+            self._addGlifLocationNote(glifLibError, glyphName)
+            raise
+
+    def readGlyphs(
+        self,
+        glyphNames: Optional[Iterable[str]] = None,
+        glyphObjects: Optional[Mapping[str, Any]] = None,
+        pointPens: Optional[Mapping[str, AbstractPointPen]] = None,
+        validate: Optional[bool] = None,
+        maxWorkers: Optional[int] = 1,
+        cache: Optional[MutableMapping[str, Any]] = None,
+    ) -> None:
+        """
+        Read many .glif files at once. This is equivalent to calling
+        readGlyph(glyphName, glyphObjects[glyphName], pointPens[glyphName])
+        for each glyph name, in order.
+
+        If 'maxWorkers' is greater than 1, or None for the ThreadPoolExecutor
+        default, the files are read (and parsed as XML, when validating)
+        concurrently by a pool of threads, while the glyphs are built in the
+        calling thread. This mostly helps with slow (e.g. network) file
+        systems, or on free-threaded Python builds.
+
+        'glyphNames' defaults to all the glyphs in the glyph set. The
+        'glyphObjects' and 'pointPens' mappings are optional, as are any of
+        their items: the glyphs without a glyph object or pen are only
+        parsed.
+
+        The optional 'cache' is a mutable mapping with str keys and picklable
+        values, for example a dict, or a shelve.Shelf to persist it between
+        runs. It keeps the glyph data read from each .glif file, keyed by the
+        file's system path along with its modification time, so a glyph is
+        only parsed again after its file has changed. Glyph sets that don't
+        map to a local directory are not cached. Only open shelves that you
+        trust, as they are unpickled.
+
+        ``validate`` will validate the data, by default it is set to the
+        class's ``validateRead`` value, can be overridden. Glyphs cached
+        without validation are parsed again when read with validation.
+        """
+        if validate is None:
+            validate = self._validateRead
+        if glyphNames is None:
+            glyphNames = self.contents.keys()
+        glyphNames = list(glyphNames)
+        if glyphObjects is None:
+            glyphObjects = {}
+        if pointPens is None:
+            pointPens = {}
+        formatVersions = GLIFFormatVersion.supported_versions(
+            self.ufoFormatVersionTuple
+        )
+
+        cached = {}
+        cacheKeys = {}
+        if cache is not None:
             try:
-                glifLocation = f"'{self.fs.getsyspath(fileName)}'"
+                rootPath = self.fs.getsyspath("/")
             except fs.errors.NoSysPath:
-                # Network or in-memory FS may not map to a local path, so use
-                # the best string representation we have.
-                glifLocation = f"'{fileName}' from '{str(self.fs)}'"
+                rootPath = None
+            if rootPath is not None:
+                ufoFormatVersion = tuple(self.ufoFormatVersionTuple)
+                for glyphName in glyphNames:
+                    key = os.path.join(rootPath, self.contents[glyphName])
+                    try:
+                        mtime = os.stat(key).st_mtime_ns
+                    except OSError:
+                        continue
+                    cacheKey = (mtime, ufoFormatVersion)
+                    cacheKeys[glyphName] = key, cacheKey
+                    entry = cache.get(key)
+                    if (
+                        entry is not None
+                        and entry[0] == cacheKey
+                        and (entry[1] or not validate)
+                    ):
+                        cached[glyphName] = entry[2]
+
+        def parse(glyphName):
+            text = self.getGLIF(glyphName)
+            if not validate:
+                # read with the fast streaming parser in the calling thread
+                return text
+            try:
+                return _glifTreeFromString(text)
+            except GlifLibError as glifLibError:
+                self._addGlifLocationNote(glifLibError, glyphName)
+                raise
+
+        toParse = [glyphName for glyphName in glyphNames if glyphName not in cached]
+        if maxWorkers == 1 or len(toParse) < 2:
+            executor = None
+            parsed = map(parse, toParse)
+        else:
+            from concurrent.futures import ThreadPoolExecutor
+
+            if maxWorkers is None:
+                # same as the ThreadPoolExecutor default
+                maxWorkers = min(32, (os.cpu_count() or 1) + 4)
+            executor = ThreadPoolExecutor(maxWorkers)
+            # only keep a few parsed files in memory at any time
+            parsed = _mapBounded(executor, parse, toParse, 2 * maxWorkers)
+        try:
+            for glyphName in glyphNames:
+                glyphObject = glyphObjects.get(glyphName)
+                pointPen = pointPens.get(glyphName)
+                if glyphName in cached:
+                    _GlyphRecording.replay(cached[glyphName], glyphObject, pointPen)
+                    continue
+                data = next(parsed)
+                if glyphName in cacheKeys:
+                    recording = _GlyphRecording()
+                    readGlyphObject = readPointPen = recording
+                else:
+                    recording = None
+                    readGlyphObject, readPointPen = glyphObject, pointPen
+                try:
+                    # the GLIF text when not validating, else the parsed tree
+                    if validate:
+                        tree = data
+                    elif _readGlyphFromStringFast(
+                        data, readGlyphObject, readPointPen, formatVersions
+                    ):
+                        tree = None
+                    else:
+                        tree = _glifTreeFromString(data)
+                    if tree is not None:
+                        _readGlyphFromTree(
+                            tree,
+                            readGlyphObject,
+                            readPointPen,
+                            formatVersions=formatVersions,
+                            validate=validate,
+                        )
+                except GlifLibError as glifLibError:
+                    self._addGlifLocationNote(glifLibError, glyphName)
+                    raise
+                if recording is not None:
+                    key, cacheKey = cacheKeys[glyphName]
+                    cache[key] = (cacheKey, validate, recording.data)
+                    _GlyphRecording.replay(recording.data, glyphObject, pointPen)
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+
+    def _addGlifLocationNote(self, glifLibError: GlifLibError, glyphName: str) -> None:
+        # Add a note to the error that gives extra context, describing where
+        # the error occurred.
+        fileName = self.contents[glyphName]
+        try:
+            glifLocation = f"'{self.fs.getsyspath(fileName)}'"
+        except fs.errors.NoSysPath:
+            # Network or in-memory FS may not map to a local path, so use
+            # the best string representation we have.
+            glifLocation = f"'{fileName}' from '{str(self.fs)}'"
 
-            glifLibError._add_note(
-                f"The issue is in glyph '{glyphName}', located in {glifLocation}."
-            )
-            raise
+        glifLibError._add_note(
+            f"The issue is in glyph '{glyphName}', located in {glifLocation}."
+        )
 
     def writeGlyph(
         self,
@@ -528,6 +794,120 @@ class GlyphSet(_UFOBaseIO):
         ``validate`` will validate the data, by default it is set to the
         class's ``validateWrite`` value, can be overridden.
         """
+        formatVersion = self._getWriteFormatVersion(formatVersion)
+        if validate is None:
+            validate = self._validateWrite
+        fileName = self._getWriteFileName(glyphName)
+        data = _writeGlyphToBytes(
+            glyphName,
+            glyphObject,
+            drawPointsFunc,
+            formatVersion=formatVersion,
+            validate=validate,
+        )
+        if (
+            self._havePreviousFile
+            and self.fs.exists(fileName)
+            and data == self.fs.readbytes(fileName)
+        ):
+            return
+        self.fs.writebytes(fileName, data)
+
+    def writeGlyphs(
+        self,
+        glyphObjects: Mapping[str, Any],
+        drawPointsFuncs: Optional[
+            Mapping[str, Callable[[AbstractPointPen], None]]
+        ] = None,
+        formatVersion: GLIFFormatVersionInput = None,
+        validate: Optional[bool] = None,
+        maxWorkers: Optional[int] = 1,
+        manifest: Optional[MutableMapping[str, Any]] = None,
+    ) -> list[str]:
+        """
+        Write many .glif files at once, then write the contents.plist file.
+        This is equivalent to calling writeGlyph(glyphName, glyphObject,
+        drawPointsFuncs[glyphName]) for each item of 'glyphObjects', in
+        order, followed by writeContents(). The 'drawPointsFuncs' mapping is
+        optional, as are any of its items. Return the names of the glyphs
+        whose .glif file was actually written.
+
+        If 'maxWorkers' is greater than 1, or None for the ThreadPoolExecutor
+        default, the glyphs are serialized concurrently by a pool of threads,
+        so the glyph objects and draw functions must be safe to use from
+        another thread.
+
+        To avoid rewriting the .glif files that haven't changed, without
+        reading them back, a manifest of the files written is kept. It maps
+        each file name to a hash of its data, along with the size and
+        modification time of the file. A glyph is only compared with the
+        existing file when its manifest entry is missing or out of date. By
+        default the manifest is kept in memory by the glyph set, but a
+        mutable mapping with str keys and picklable values, for example a
+        shelve.Shelf, can be passed as 'manifest' to persist it between runs.
+        Use a different manifest for each glyph set.
+
+        'formatVersion' and 'validate' are the same as for writeGlyph().
+        """
+        formatVersion = self._getWriteFormatVersion(formatVersion)
+        if validate is None:
+            validate = self._validateWrite
+        if drawPointsFuncs is None:
+            drawPointsFuncs = {}
+        if manifest is None:
+            if self._writeManifest is None:
+                self._writeManifest = {}
+            manifest = self._writeManifest
+
+        def serialize(glyphName):
+            data = _writeGlyphToBytes(
+                glyphName,
+                glyphObjects[glyphName],
+                drawPointsFuncs.get(glyphName),
+                formatVersion=formatVersion,
+                validate=validate,
+            )
+            return data, hashlib.sha256(data).hexdigest()
+
+        glyphNames = list(glyphObjects.keys())
+        if maxWorkers == 1 or len(glyphNames) < 2:
+            executor = None
+            serialized = map(serialize, glyphNames)
+        else:
+            from concurrent.futures import ThreadPoolExecutor
+
+            if maxWorkers is None:
+                # same as the ThreadPoolExecutor default
+                maxWorkers = min(32, (os.cpu_count() or 1) + 4)
+            executor = ThreadPoolExecutor(maxWorkers)
+            serialized = _mapBounded(executor, serialize, glyphNames, 2 * maxWorkers)
+        written = []
+        try:
+            for glyphName in glyphNames:
+                data, digest = next(serialized)
+                fileName = self._getWriteFileName(glyphName)
+                stamp = self._getFileStamp(fileName)
+                if stamp is not None and manifest.get(fileName) == (digest, stamp):
+                    continue
+                if not (
+                    self._havePreviousFile
+                    and self.fs.exists(fileName)
+                    and data == self.fs.readbytes(fileName)
+                ):
+                    self.fs.writebytes(fileName, data)
+                    written.append(glyphName)
+                    stamp = self._getFileStamp(fileName)
+                if stamp is not None:
+                    manifest[fileName] = (digest, stamp)
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+        self.writeContents()
+        return written
+
+    def _getWriteFormatVersion(
+        self, formatVersion: GLIFFormatVersionInput
+    ) -> GLIFFormatVersion:
         if formatVersion is None:
             formatVersion = GLIFFormatVersion.default(self.ufoFormatVersionTuple)
         else:
@@ -548,8 +928,11 @@ class GlyphSet(_UFOBaseIO):
                 f"Unsupported GLIF format version ({formatVersion!s}) "
                 f"for UFO format version {self.ufoFormatVersionTuple!s}."
             )
-        if validate is None:
-            validate = self._validateWrite
+        return formatVersion
+
+    def _getWriteFileName(self, glyphName: str) -> str:
+        # Return the file name of the glyph, adding a new one to the contents
+        # if the glyph is not in the glyph set yet.
         fileName = self.contents.get(glyphName)
         if fileName is None:
             if self._existingFileNames is None:
@@ -561,20 +944,19 @@ class GlyphSet(_UFOBaseIO):
             self._existingFileNames.add(fileName.lower())
             if self._reverseContents is not None:
                 self._reverseContents[fileName.lower()] = glyphName
-        data = _writeGlyphToBytes(
-            glyphName,
-            glyphObject,
-            drawPointsFunc,
-            formatVersion=formatVersion,
-            validate=validate,
-        )
-        if (
-            self._havePreviousFile
-            and self.fs.exists(fileName)
-            and data == self.fs.readbytes(fileName)
-        ):
-            return
-        self.fs.writebytes(fileName, data)
+        return fileName
+
+    def _getFileStamp(self, fileName: str) -> Optional[tuple[int, float]]:
+        # Return the size and modification time of the file, or None if the
+        # file does not exist or the file system does not support them.
+        try:
+            info = self.fs.getinfo(fileName, namespaces=["details"])
+            modified = info.modified
+        except (fs.errors.MissingInfoNamespace, fs.errors.ResourceNotFound):
+            return None
+        if modified is None:
+            return None
+        return info.size, modified.timestamp()
 
     def deleteGlyph(self, glyphName: str) -> None:
         """Permanently delete the glyph from the glyph set on disk. Will
@@ -670,6 +1052,18 @@ class GlyphSet(_UFOBaseIO):
         self.close()
 
 
+def _mapBounded(executor, func, iterable, maxPending):
+    # Like executor.map, but only submits up to 'maxPending' calls ahead of
+    # the results consumed so far.
+    pending = deque()
+    for item in iterable:
+        if len(pending) >= maxPending:
+            yield pending.popleft().result()
+        pending.append(executor.submit(func, item))
+    while pending:
+        yield pending.popleft().result()
+
+
 # -----------------------
 # Glyph Name to File Name
 # -----------------------
@@ -747,9 +1141,9 @@ def readGlyphFromString(
     currently defined are allowed to be read.
 
     ``validate`` will validate the read data. It is set to ``True`` by default.
+    When not validating, GLIF format 2 data is read with a faster streaming
+    parser.
     """
-    tree = _glifTreeFromString(aString)
-
     if formatVersions is None:
         validFormatVersions: Set[GLIFFormatVersion] = (
             GLIFFormatVersion.supported_versions()
@@ -769,6 +1163,11 @@ def readGlyphFromString(
                 f"{formatVersions!r}"
             )
 
+    if not validate and _readGlyphFromStringFast(
+        aString, glyphObject, pointPen, validFormatVersions
+    ):
+        return
+    tree = _glifTreeFromString(aString)
     _readGlyphFromTree(
         tree,
         glyphObject,
@@ -1968,6 +2367,309 @@ class _FetchComponentBasesParser(_BaseParser):
         super().endElementHandler(name)
 
 
+# fast non-validating reading
+
+
+def _readGlyphFromStringFast(
+    aString: Union[str, bytes],
+    glyphObject: Optional[Any] = None,
+    pointPen: Optional[AbstractPointPen] = None,
+    formatVersions: Optional[Set[GLIFFormatVersion]] = None,
+) -> bool:
+    """
+    Read a GLIF string without validating it, like _readGlyphFromTree does
+    with validate=False, but in a single streaming pass: the glyph object and
+    the point pen are fed directly by the XML parser, without building an
+    element tree first.
+
+    Only GLIF format 2.0 is read this way, and only if it is one of the
+    allowed 'formatVersions' (all of them by default). Otherwise nothing is
+    read and False is returned, so the tree-based reader can be used instead.
+
+    If the GLIF contains errors, the glyph object and the point pen may have
+    received part of the glyph data by the time the error is raised.
+    """
+    if (
+        formatVersions is not None
+        and GLIFFormatVersion.FORMAT_2_0 not in formatVersions
+    ):
+        return False
+    parser = _FastGlyphParser(glyphObject, pointPen)
+    try:
+        parser.parse(tobytes(aString, encoding="utf-8"))
+    except _DoneParsing:
+        return False
+    return True
+
+
+class _FastGlyphParser(_BaseParser):
+    # The top-level elements are pushed on the element stack by name, except
+    # for those that are skipped (e.g. the lib when there is no glyph object),
+    # which are pushed as None so that their children are ignored. Inside the
+    # outline, which holds most of the data, the parser handlers are swapped
+    # with leaner ones that only track the depth; character data is only
+    # handled where it matters.
+
+    def __init__(
+        self, glyphObject: Optional[Any], pointPen: Optional[AbstractPointPen]
+    ) -> None:
+        super().__init__()
+        self.glyphObject = glyphObject
+        self.pointPen = pointPen
+        self.unicodes: list[int] = []
+        self.guidelines: list[dict[str, Any]] = []
+        self.anchors: list[dict[str, Any]] = []
+        self.text: list[str] = []
+        self.plistTarget: Optional[plistlib.PlistTarget] = None
+        self.outlineDepth = 0
+        self.inContour = False
+
+    def parse(self, text: bytes):
+        from xml.parsers.expat import ExpatError, ParserCreate
+
+        self.parser = parser = ParserCreate()
+        parser.buffer_text = True
+        parser.StartElementHandler = self.startElementHandler
+        parser.EndElementHandler = self.endElementHandler
+        parser.CharacterDataHandler = self.characterDataHandler
+        try:
+            parser.Parse(text, True)
+        except ExpatError as e:
+            raise GlifLibError("GLIF contains invalid XML.") from e
+        finally:
+            # break the reference cycle
+            del self.parser
+
+    def startElementHandler(self, name: str, attrs: dict[str, str]) -> None:
+        stack = self._elementStack
+        depth = len(stack)
+        if depth == 1:
+            if self.parser.CharacterDataHandler is not None:
+                # only whitespace is allowed before the first child
+                self.checkGlyphText()
+                self.parser.CharacterDataHandler = None
+            if not self.startTopLevelElement(name, attrs):
+                name = None
+        elif depth == 0:
+            self.startGlyph(name, attrs)
+        elif self.plistTarget is not None:
+            self.plistTarget.start(name, attrs)
+        stack.append(name)
+
+    def endElementHandler(self, name: str) -> None:
+        stack = self._elementStack
+        element = stack.pop()
+        depth = len(stack)
+        if depth == 1:
+            if self.plistTarget is not None:
+                _relaxedSetattr(self.glyphObject, "lib", self.plistTarget.close())
+                self.plistTarget = None
+            elif element == "note" and self.text:
+                lines = "".join(self.text).split("\n")
+                note = "\n".join(line.strip() for line in lines if line.strip())
+                _relaxedSetattr(self.glyphObject, "note", note)
+            self.text = []
+            self.parser.CharacterDataHandler = None
+        elif depth == 0:
+            self.endGlyph()
+        elif self.plistTarget is not None:
+            self.plistTarget.end(name)
+
+    def characterDataHandler(self, data: str) -> None:
+        self.text.append(data)
+
+    def plistDataHandler(self, data: str) -> None:
+        if len(self._elementStack) > 2:
+            self.plistTarget.data(data)
+
+    def checkGlyphText(self) -> None:
+        if "".join(self.text).strip():
+            raise GlifLibError("Invalid GLIF structure.")
+        self.text = []
+
+    def startGlyph(self, name: str, attrs: dict[str, str]) -> None:
+        if name != "glyph":
+            raise GlifLibError("The GLIF is not properly formatted.")
+        try:
+            formatVersion = GLIFFormatVersion(
+                (int(attrs["format"]), int(attrs.get("formatMinor", 0)))
+            )
+        except (KeyError, ValueError):
+            raise _DoneParsing
+        if formatVersion != GLIFFormatVersion.FORMAT_2_0:
+            raise _DoneParsing
+        glyphName = attrs.get("name")
+        if glyphName and self.glyphObject is not None:
+            _relaxedSetattr(self.glyphObject, "name", glyphName)
+
+    def endGlyph(self) -> None:
+        if self.parser.CharacterDataHandler is not None:
+            self.checkGlyphText()
+        glyphObject = self.glyphObject
+        if self.unicodes:
+            _relaxedSetattr(glyphObject, "unicodes", self.unicodes)
+        if self.guidelines:
+            _relaxedSetattr(glyphObject, "guidelines", self.guidelines)
+        if self.anchors:
+            _relaxedSetattr(glyphObject, "anchors", self.anchors)
+
+    def startTopLevelElement(self, name: str, attrs: dict[str, str]) -> bool:
+        # Return False if the element and its children must be skipped.
+        glyphObject = self.glyphObject
+        if name == "outline":
+            if self.pointPen is None:
+                return False
+            self.parser.StartElementHandler = self.startOutlineElementHandler
+            self.parser.EndElementHandler = self.endOutlineElementHandler
+        elif glyphObject is None:
+            return False
+        elif name == "advance":
+            _relaxedSetattr(glyphObject, "width", _number(attrs.get("width", 0)))
+            _relaxedSetattr(glyphObject, "height", _number(attrs.get("height", 0)))
+        elif name == "unicode":
+            v = attrs.get("hex")
+            if v is None:
+                raise GlifLibError(
+                    "A unicode element is missing its required hex attribute."
+                )
+            try:
+                v = int(v, 16)
+            except ValueError:
+                raise GlifLibError(
+                    "Illegal value for hex attribute of unicode element."
+                )
+            if v not in self.unicodes:
+                self.unicodes.append(v)
+        elif name == "guideline":
+            attrib = dict(attrs)
+            for attr in ("x", "y", "angle"):
+                if attr in attrib:
+                    attrib[attr] = _number(attrib[attr])
+            self.guidelines.append(attrib)
+        elif name == "anchor":
+            attrib = dict(attrs)
+            for attr in ("x", "y"):
+                if attr in attrib:
+                    attrib[attr] = _number(attrib[attr])
+            self.anchors.append(attrib)
+        elif name == "image":
+            imageData = dict(attrs)
+            for attr, default in _transformationInfo:
+                imageData[attr] = _number(imageData.get(attr, default))
+            _relaxedSetattr(glyphObject, "image", imageData)
+        elif name == "note":
+            self.parser.CharacterDataHandler = self.characterDataHandler
+        elif name == "lib":
+            self.plistTarget = plistlib.PlistTarget()
+            self.parser.CharacterDataHandler = self.plistDataHandler
+        else:
+            raise GlifLibError("Unknown element in GLIF: %s" % name)
+        return True
+
+    # outline
+
+    def startOutlineElementHandler(self, name: str, attrs: dict[str, str]) -> None:
+        depth = self.outlineDepth
+        self.outlineDepth = depth + 1
+        if depth == 1:
+            if self.inContour:
+                if name != "point":
+                    raise GlifLibError(
+                        "Unknown child element (%s) of contour element." % name
+                    )
+                self.addPoint(attrs)
+        elif depth == 0:
+            if name == "contour":
+                self.inContour = True
+                self.beginPath(attrs)
+            elif name == "component":
+                self.inContour = False
+                self.addComponent(attrs)
+            else:
+                raise GlifLibError("Unknown element in outline element: %s" % name)
+
+    def endOutlineElementHandler(self, name: str) -> None:
+        depth = self.outlineDepth - 1
+        self.outlineDepth = depth
+        if depth == 0:
+            if self.inContour:
+                self.pointPen.endPath()
+                self.inContour = False
+        elif depth < 0:
+            # end of the outline
+            self.outlineDepth = 0
+            self.parser.StartElementHandler = self.startElementHandler
+            self.parser.EndElementHandler = self.endElementHandler
+            self.endElementHandler(name)
+
+    def beginPath(self, attrs: dict[str, str]) -> None:
+        identifier = attrs.get("identifier")
+        try:
+            self.pointPen.beginPath(identifier=identifier)
+        except TypeError:
+            self.pointPen.beginPath()
+            warn(
+                "The beginPath method needs an identifier kwarg. The contour's identifier value has been discarded.",
+                DeprecationWarning,
+            )
+
+    def addPoint(self, attrs: dict[str, str]) -> None:
+        try:
+            x = attrs["x"]
+            y = attrs["y"]
+        except KeyError as e:
+            raise GlifLibError(
+                f"Required {e.args[0]} attribute is missing in point element."
+            ) from e
+        # most coordinates are integers
+        try:
+            x = int(x)
+        except ValueError:
+            x = _number(x)
+        try:
+            y = int(y)
+        except ValueError:
+            y = _number(y)
+        segmentType = attrs.get("type")
+        if segmentType == "offcurve":
+            segmentType = None
+        smooth = attrs.get("smooth") == "yes"
+        name = attrs.get("name")
+        try:
+            self.pointPen.addPoint(
+                (x, y),
+                segmentType=segmentType,
+                smooth=smooth,
+                name=name,
+                identifier=attrs.get("identifier"),
+            )
+        except TypeError:
+            self.pointPen.addPoint(
+                (x, y), segmentType=segmentType, smooth=smooth, name=name
+            )
+            warn(
+                "The addPoint method needs an identifier kwarg. The point's identifier value has been discarded.",
+                DeprecationWarning,
+            )
+
+    def addComponent(self, attrs: dict[str, str]) -> None:
+        baseGlyphName = attrs.get("base")
+        transformation = tuple(
+            _number(attrs.get(attr) or default) for attr, default in _transformationInfo
+        )
+        identifier = attrs.get("identifier")
+        try:
+            self.pointPen.addComponent(
+                baseGlyphName, transformation, identifier=identifier
+            )
+        except TypeError:
+            self.pointPen.addComponent(baseGlyphName, transformation)
+            warn(
+                "The addComponent method needs an identifier kwarg. The component's identifier value has been discarded.",
+                DeprecationWarning,
+            )
+
+
 # --------------
 # GLIF Point Pen
 # --------------
@@ -54,6 +54,7 @@ from collections import OrderedDict, defaultdict, namedtuple
 import os.path
 import logging
 from copy import deepcopy
+from io import BytesIO
 from pprint import pformat
 from re import fullmatch
 from .errors import VarLibError, VarLibValidationError
@@ -1159,6 +1160,7 @@ def build_many(
     skip_vf=lambda vf_name: False,
     colr_layer_reuse=True,
     drop_implied_oncurves=False,
+    jobs=1,
 ):
     """
     Build variable fonts from a designspace file, version 5 which can define
@@ -1172,9 +1174,18 @@ def build_many(
     the input designspace. It's a predicate that takes as argument the name
     of the variable font and returns `bool`.
 
+    The master fonts are loaded only once, and shared by all the variable
+    fonts that use them (unless drop_implied_oncurves is set, as that
+    modifies the masters).
+
+    If jobs is greater than 1, the variable fonts are built concurrently by
+    as many worker processes. The workers are forked, so they share the
+    masters loaded by the parent process, and each returns its variable font
+    compiled as soon as it is built; these are loaded lazily. Where worker
+    processes can't be forked, the variable fonts are built sequentially.
+
     Always returns a Dict[str, TTFont] keyed by VariableFontDescriptor.name
     """
-    res = {}
     # varLib.build (used further below) by default only builds an incomplete 'STAT'
     # with an empty AxisValueArray--unless the VF inherited 'STAT' from its base master.
     # Designspace version 5 can also be used to define 'STAT' labels or customize
@@ -1191,25 +1202,110 @@ def build_many(
             or designspace.locationLabels
         )
     )
+    vfDocs = []
     for _location, subDoc in splitInterpolable(designspace):
         for name, vfDoc in splitVariableFonts(subDoc):
             if skip_vf(name):
                 log.debug(f"Skipping variable TTF font: {name}")
                 continue
-            vf = build(
-                vfDoc,
+            vfDocs.append((name, vfDoc))
+
+    if not drop_implied_oncurves:
+        _share_masters([vfDoc for _, vfDoc in vfDocs], master_finder)
+
+    options = dict(
+        exclude=exclude,
+        optimize=optimize,
+        colr_layer_reuse=colr_layer_reuse,
+        drop_implied_oncurves=drop_implied_oncurves,
+    )
+    if jobs > 1 and len(vfDocs) > 1:
+        import multiprocessing
+
+        try:
+            mp_context = multiprocessing.get_context("fork")
+        except ValueError:
+            log.warning("Can't fork worker processes, building variable fonts serially")
+        else:
+            return _build_many_parallel(
+                designspace,
+                vfDocs,
                 master_finder,
-                exclude=exclude,
-                optimize=optimize,
-                colr_layer_reuse=colr_layer_reuse,
-                drop_implied_oncurves=drop_implied_oncurves,
-            )[0]
-            if doBuildStatFromDSv5:
-                buildVFStatTable(vf, designspace, name)
-            res[name] = vf
+                doBuildStatFromDSv5,
+                options,
+                min(jobs, len(vfDocs)),
+                mp_context,
+            )
+
+    res = {}
+    for name, vfDoc in vfDocs:
+        res[name] = _build_vf(
+            designspace, name, vfDoc, master_finder, doBuildStatFromDSv5, options
+        )
     return res
 
 
+def _share_masters(vfDocs, master_finder):
+    # Open each master font only once, and set it as the 'font' of all the
+    # sources that use it; build() will then use the same TTFont, and its
+    # tables will be decompiled once.
+    fonts = {}
+    for vfDoc in vfDocs:
+        for source in vfDoc.sources:
+            if source.font is not None or source.layerName or source.path is None:
+                # load_masters() takes care of these
+                continue
+            if source.path not in fonts:
+                fonts[source.path] = _open_font(source.path, master_finder)
+            source.font = fonts[source.path]
+
+
+def _build_vf(designspace, name, vfDoc, master_finder, doBuildStat, options):
+    vf = build(vfDoc, master_finder, **options)[0]
+    if doBuildStat:
+        buildVFStatTable(vf, designspace, name)
+    return vf
+
+
+# The arguments of _build_many_parallel, inherited by the forked workers
+_buildManyState = None
+
+
+def _build_vf_in_worker(i):
+    designspace, vfDocs, master_finder, doBuildStat, options = _buildManyState
+    name, vfDoc = vfDocs[i]
+    vf = _build_vf(designspace, name, vfDoc, master_finder, doBuildStat, options)
+    buf = BytesIO()
+    vf.save(buf)
+    return buf.getvalue()
+
+
+def _build_many_parallel(
+    designspace, vfDocs, master_finder, doBuildStat, options, jobs, mp_context
+):
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    global _buildManyState
+
+    log.info("Building %d variable fonts in %d processes", len(vfDocs), jobs)
+    built = {}
+    _buildManyState = (designspace, vfDocs, master_finder, doBuildStat, options)
+    try:
+        with ProcessPoolExecutor(jobs, mp_context=mp_context) as executor:
+            futures = {
+                executor.submit(_build_vf_in_worker, i): name
+                for i, (name, _) in enumerate(vfDocs)
+            }
+            for future in as_completed(futures):
+                name = futures[future]
+                built[name] = TTFont(BytesIO(future.result()))
+                log.info("Built variable font %s", name)
+    finally:
+        _buildManyState = None
+    # return the variable fonts in the same order as when built serially
+    return {name: built[name] for name, _ in vfDocs}
+
+
 def build(
     designspace,
     master_finder=lambda s: s,
@@ -1494,6 +1590,15 @@ def main(args=None):
             '"MyFontVF_WeightOnly"; or --variable-fonts "MyFontVFItalic_.*".'
         ),
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help="build the variable fonts using N parallel processes (default: "
+        "%(default)s; 0 means the number of CPUs)",
+    )
     logging_group = parser.add_mutually_exclusive_group(required=False)
     logging_group.add_argument(
         "-v", "--verbose", action="store_true", help="Run more verbosely."
@@ -1557,6 +1662,7 @@ def main(args=None):
         skip_vf=lambda name: name not in vf_names_to_build,
         colr_layer_reuse=options.colr_layer_reuse,
         drop_implied_oncurves=options.drop_implied_oncurves,
+        jobs=options.jobs or os.cpu_count() or 1,
     )
 
     for vf_name, vf in vfs.items():
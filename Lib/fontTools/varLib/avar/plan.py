@@ -2,7 +2,7 @@ from fontTools.ttLib import newTable
 from fontTools.ttLib.tables._f_v_a_r import Axis as fvarAxis
 from fontTools.pens.areaPen import AreaPen
 from fontTools.pens.basePen import NullPen
-from fontTools.pens.statisticsPen import StatisticsPen
+from fontTools.pens.statisticsPen import calcGlyphStatistics
 from fontTools.varLib.models import piecewiseLinearMap, normalizeValue
 from fontTools.misc.cliTools import makeOutputFileName
 import math
@@ -199,23 +199,18 @@ def measureSlant(glyphset, glyphs=None):
     else:
         frequencies = {g: 1 for g in glyphs}
 
+    glyphs = [g for g in glyphs if frequencies.get(g, 0) != 0]
+    statistics = calcGlyphStatistics(glyphset, glyphs)
+
     slnt_sum = 0
     freq_sum = 0
     for glyph_name in glyphs:
-        if frequencies is not None:
-            frequency = frequencies.get(glyph_name, 0)
-            if frequency == 0:
-                continue
-        else:
-            frequency = 1
+        frequency = frequencies[glyph_name]
 
         glyph = glyphset[glyph_name]
 
-        pen = StatisticsPen(glyphset=glyphset)
-        glyph.draw(pen)
-
         mult = glyph.width * frequency
-        slnt_sum += mult * pen.slant
+        slnt_sum += mult * statistics[glyph_name].slant
         freq_sum += mult
 
     return -math.degrees(math.atan(slnt_sum / freq_sum))
@@ -12,9 +12,11 @@ from .interpolatableTestStartingPoint import test_starting_point
 from fontTools.pens.recordingPen import (
     RecordingPen,
     DecomposingRecordingPen,
+    RecordingPointPen,
     lerpRecordings,
 )
 from fontTools.pens.transformPen import TransformPen
+from fontTools.pens.basePen import MissingComponentError
 from fontTools.pens.statisticsPen import StatisticsPen, StatisticsControlPen
 from fontTools.pens.momentsPen import OpenContourError
 from fontTools.varLib.models import piecewiseLinearMap, normalizeLocation
@@ -25,8 +27,11 @@ from types import SimpleNamespace
 from functools import wraps
 from pprint import pformat
 from math import sqrt, atan2, pi
+import hashlib
 import logging
 import os
+import pickle
+import tempfile
 
 log = logging.getLogger("fontTools.varLib.interpolatable")
 
@@ -49,23 +54,43 @@ class Glyph:
         "openContours",
     )
 
-    def __init__(self, glyphname, glyphset):
+    # The statistics pens can't be cached, only the vectors computed from them
+    CACHED_ITEMS = tuple(item for item in ITEMS if not item.endswith("Stats"))
+
+    def __init__(self, glyphname, glyphset, cache=None):
         self.name = glyphname
         for item in self.ITEMS:
             setattr(self, item, [])
-        self._populate(glyphset)
+        self._populate(glyphset, cache)
 
     def _fill_in(self, ix):
         for item in self.ITEMS:
             if len(getattr(self, item)) == ix:
                 getattr(self, item).append(None)
 
-    def _populate(self, glyphset):
+    def _populate(self, glyphset, cache=None):
         glyph = glyphset[self.name]
         self.doesnt_exist = glyph is None
         if self.doesnt_exist:
             return
 
+        key = None
+        if cache is not None:
+            key = cache.key(glyph, glyphset)
+            data = cache.get(key) if key is not None else None
+            if data is not None:
+                for item, value in data.items():
+                    setattr(self, item, value)
+                self.greenStats = [None] * len(self.recordings)
+                self.controlStats = [None] * len(self.recordings)
+                return
+
+        self._compute(glyph, glyphset)
+
+        if key is not None:
+            cache.set(key, {item: getattr(self, item) for item in self.CACHED_ITEMS})
+
+    def _compute(self, glyph, glyphset):
         perContourPen = PerContourOrComponentPen(RecordingPen, glyphset=glyphset)
         try:
             glyph.draw(perContourPen, outputImpliedClosingLine=True)
@@ -124,6 +149,82 @@ class Glyph:
             self.recordings[contour_idx].draw(pen)
 
 
+class _GlyphCacheKeyPen(RecordingPointPen):
+    # Like HashPointPen, records the components' outlines between markers that
+    # keep the component structure, but with the exact coordinates.
+
+    def __init__(self, glyphset):
+        super().__init__()
+        self.glyphset = glyphset
+
+    def addComponent(self, baseGlyphName, transformation, identifier=None, **kwargs):
+        self.value.append(("[",))
+        try:
+            glyph = self.glyphset[baseGlyphName]
+        except KeyError:
+            raise MissingComponentError(baseGlyphName)
+        glyph.drawPoints(self)
+        self.value.append(("]", tuple(transformation)))
+
+
+class GlyphCache:
+    """An on-disk cache of the per-master glyph data computed by :class:`Glyph`.
+
+    The entries are keyed by a hash of the exact glyph outline, including the
+    outlines and transformations of its components, so they are only
+    recomputed for the glyphs that changed. Each entry is a pickle file in the
+    ``path`` directory; these can be written concurrently by several
+    processes. Only use a cache directory that you trust, as loading a pickle
+    can execute arbitrary code.
+    """
+
+    # bump this when the data computed by Glyph, or the keys, change
+    VERSION = 2
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+    def key(self, glyph, glyphset):
+        """Return the cache key of ``glyph``, or None if it can't be hashed."""
+        # not HashPointPen, whose hash rounds the coordinates
+        pen = _GlyphCacheKeyPen(glyphset)
+        try:
+            glyph.drawPoints(pen)
+        except (AttributeError, KeyError, MissingComponentError):
+            return None
+        data = "%d %s %r" % (self.VERSION, type(glyph).__name__, pen.value)
+        return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.path, key[:2], key + ".pickle")
+
+    def get(self, key):
+        try:
+            with open(self._path(key), "rb") as f:
+                return pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            log.warning("Ignoring invalid cache entry %s: %s", key, e)
+            return None
+
+    def set(self, key, data):
+        path = self._path(key)
+        dirname = os.path.dirname(path)
+        os.makedirs(dirname, exist_ok=True)
+        # write to a temporary file first, so that concurrent readers never
+        # see a partially written entry
+        fd, tmp = tempfile.mkstemp(dir=dirname, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(data, f, pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, path)
+        except BaseException:
+            os.remove(tmp)
+            raise
+
+
 def test_gen(
     glyphsets,
     glyphs=None,
@@ -136,7 +237,29 @@ def test_gen(
     upem=DEFAULT_UPEM,
     show_all=False,
     discrete_axes=[],
+    jobs=1,
+    cache=None,
 ):
+    if jobs > 1:
+        yield from _test_gen_parallel(
+            glyphsets,
+            glyphs,
+            names,
+            ignore_missing,
+            locations=locations,
+            tolerance=tolerance,
+            kinkiness=kinkiness,
+            upem=upem,
+            show_all=show_all,
+            discrete_axes=discrete_axes,
+            jobs=jobs,
+            cache=cache,
+        )
+        return
+
+    if cache is not None and not isinstance(cache, GlyphCache):
+        cache = GlyphCache(cache)
+
     if tolerance >= 10:
         tolerance *= 0.01
     assert 0 <= tolerance <= 1
@@ -167,7 +290,7 @@ def test_gen(
 
     for glyph_name in glyphs:
         log.info("Testing glyph %s", glyph_name)
-        allGlyphs = [Glyph(glyph_name, glyphset) for glyphset in glyphsets]
+        allGlyphs = [Glyph(glyph_name, glyphset, cache) for glyphset in glyphsets]
         if len([1 for glyph in allGlyphs if not glyph.doesnt_exist]) <= 1:
             continue
         for master_idx, (glyph, glyphset, name) in enumerate(
@@ -582,6 +705,52 @@ def test_gen(
                 )
 
 
+# The arguments of _test_gen_parallel, inherited by the forked workers
+_testGenState = None
+
+
+def _test_glyphs_in_worker(glyphs):
+    args, kwargs = _testGenState
+    return list(test_gen(*args, glyphs=glyphs, **kwargs))
+
+
+def _test_gen_parallel(glyphsets, glyphs, names, ignore_missing, *, jobs, **kwargs):
+    # Check chunks of glyphs in forked worker processes, which share the
+    # glyphsets of the parent; the problems are yielded in the same order as
+    # when checking the glyphs serially.
+    import multiprocessing
+
+    if glyphs is None:
+        glyphs = {g for glyphset in glyphsets for g in glyphset.keys()}
+    glyphs = list(glyphs)
+    try:
+        mp_context = multiprocessing.get_context("fork")
+    except ValueError:
+        log.warning("Can't fork worker processes, checking glyphs serially")
+        jobs = 1
+    if jobs <= 1 or len(glyphs) <= 1:
+        yield from test_gen(glyphsets, glyphs, names, ignore_missing, **kwargs)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    global _testGenState
+
+    chunkSize = max(1, min(64, len(glyphs) // (4 * jobs)))
+    chunks = [glyphs[i : i + chunkSize] for i in range(0, len(glyphs), chunkSize)]
+    log.info("Checking %d glyphs in %d processes", len(glyphs), jobs)
+    _testGenState = (
+        (glyphsets,),
+        dict(names=names, ignore_missing=ignore_missing, **kwargs),
+    )
+    try:
+        with ProcessPoolExecutor(jobs, mp_context=mp_context) as executor:
+            for problems in executor.map(_test_glyphs_in_worker, chunks):
+                yield from problems
+    finally:
+        _testGenState = None
+
+
 @wraps(test_gen)
 def test(*args, **kwargs):
     problems = defaultdict(list)
@@ -686,6 +855,21 @@ def main(args=None):
         action="append",
         help="Name of the master to use in the report. If not provided, all are used.",
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Check the glyphs using N parallel processes (default: %(default)s; "
+        "0 means the number of CPUs)",
+    )
+    parser.add_argument(
+        "--cache",
+        metavar="DIR",
+        help="Directory where to cache the glyph statistics, to only recompute "
+        "them for the glyphs that changed since the previous run",
+    )
     parser.add_argument("-v", "--verbose", action="store_true", help="Run verbosely.")
     parser.add_argument("--debug", action="store_true", help="Run with debug output.")
 
@@ -973,6 +1157,8 @@ def main(args=None):
             kinkiness=kinkiness,
             show_all=args.show_all,
             discrete_axes=discrete_axes,
+            jobs=args.jobs or os.cpu_count() or 1,
+            cache=args.cache,
         )
         problems = defaultdict(list)
 
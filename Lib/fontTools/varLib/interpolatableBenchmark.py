@@ -0,0 +1,172 @@
+"""Benchmark the pure-Python and the NumPy implementations of the contour
+matching helpers of varLib.interpolatable.
+
+Two masters of a synthetic glyph with many contours (like a CJK ideograph
+or a Devanagari conjunct) are used, with the contour order and the starting
+points of the second master shuffled.
+
+Usage: python -m fontTools.varLib.interpolatableBenchmark [CONTOURS] [REPEAT]
+"""
+
+from fontTools.pens.recordingPen import RecordingPen
+from fontTools.varLib.interpolatable import Glyph
+from fontTools.varLib.interpolatableHelpers import (
+    matching_costs_numpy,
+    min_cost_perfect_bipartite_matching_munkres,
+    min_cost_perfect_bipartite_matching_numpy,
+    points_complex_vector_numpy,
+    points_complex_vector_python,
+    vdiff_hypot2,
+    vdiff_hypot2_complex,
+    vdiff_hypot2_complex_many_numpy,
+)
+from math import cos, sin, pi
+import random
+import sys
+import timeit
+
+
+class _Glyph:
+    def __init__(self, recording):
+        self.recording = recording
+
+    def draw(self, pen):
+        self.recording.replay(pen)
+
+
+def makeGlyphs(contourCount):
+    rnd = random.Random(0)
+    contours = []
+    for i in range(contourCount):
+        cx, cy = rnd.randint(0, 1000), rnd.randint(0, 1000)
+        r = rnd.randint(20, 100)
+        n = 2 * rnd.randint(4, 24)
+        contours.append(
+            [
+                (cx + r * cos(2 * pi * j / n), cy + r * sin(2 * pi * j / n))
+                for j in range(n)
+            ]
+        )
+
+    glyphs = []
+    for master in range(2):
+        pen = RecordingPen()
+        if master:
+            rnd.shuffle(contours)
+        for points in contours:
+            if master:
+                # bolder, and with a different starting point
+                points = [(x * 1.05, y * 1.05 + 10) for x, y in points]
+                start = 2 * rnd.randint(0, len(points) // 2 - 1)
+                points = points[start:] + points[:start]
+            points = [(round(x), round(y)) for x, y in points]
+            # on-curve points at even indices, off-curve points at odd ones
+            pen.moveTo(points[0])
+            for j in range(1, len(points), 2):
+                pen.qCurveTo(points[j], points[(j + 1) % len(points)])
+            pen.closePath()
+        glyphs.append(_Glyph(pen))
+    glyphset0 = {"glyph": glyphs[0]}
+    glyphset1 = {"glyph": glyphs[1]}
+    return Glyph("glyph", glyphset0), Glyph("glyph", glyphset1)
+
+
+_glyphs = {}
+
+
+def setup_glyphs(contourCount):
+    if contourCount not in _glyphs:
+        _glyphs[contourCount] = makeGlyphs(contourCount)
+    return _glyphs[contourCount]
+
+
+def setup_costs(contourCount):
+    glyph0, glyph1 = setup_glyphs(contourCount)
+    m0, m1 = glyph0.controlVectors, glyph1.controlVectors
+    return [[vdiff_hypot2(v0, v1) for v1 in m1] for v0 in m0]
+
+
+def setup_contours(contourCount):
+    # the isomorphisms of the matching contours of both masters
+    glyph0, glyph1 = setup_glyphs(contourCount)
+    matching, _ = min_cost_perfect_bipartite_matching_numpy(setup_costs(contourCount))
+    return [
+        (glyph0.isomorphisms[i], glyph1.isomorphisms[j]) for i, j in enumerate(matching)
+    ]
+
+
+def costs_python(glyphs):
+    glyph0, glyph1 = glyphs
+    m0, m1 = glyph0.controlVectors, glyph1.controlVectors
+    [[vdiff_hypot2(v0, v1) for v1 in m1] for v0 in m0]
+
+
+def costs_numpy(glyphs):
+    glyph0, glyph1 = glyphs
+    matching_costs_numpy(glyph0.controlVectors, glyph1.controlVectors)
+
+
+def matching_munkres(costs):
+    min_cost_perfect_bipartite_matching_munkres(costs)
+
+
+def matching_numpy(costs):
+    min_cost_perfect_bipartite_matching_numpy(costs)
+
+
+def points_vectors_python(glyphs):
+    for points in glyphs[1].points:
+        points_complex_vector_python(points)
+
+
+def points_vectors_numpy(glyphs):
+    for points in glyphs[1].points:
+        points_complex_vector_numpy(points)
+
+
+def starting_points_python(contours):
+    for contour0, contour1 in contours:
+        [vdiff_hypot2_complex(contour0[0][0], c1[0]) for c1 in contour1]
+
+
+def starting_points_numpy(contours):
+    for contour0, contour1 in contours:
+        vdiff_hypot2_complex_many_numpy(contour0[0][0], [c1[0] for c1 in contour1])
+
+
+def run_benchmark(contourCount, function, setup, repeat=3):
+    print("%s:" % function, end="")
+    function = globals()[function]
+    setup = globals()["setup_" + setup]
+    results = []
+    for _ in range(repeat):
+        data = setup(contourCount)
+        results.append(timeit.timeit(lambda: function(data), number=1))
+    print("\t%8.1fms" % (min(results) * 1000.0))
+
+
+def main(args=None):
+    if args is None:
+        args = sys.argv[1:]
+    if args and not args[0].isdigit():
+        print(__doc__, file=sys.stderr)
+        return 2
+    contourCount = int(args[0]) if args else 100
+    repeat = int(args[1]) if len(args) > 1 else 3
+    run_benchmark(contourCount, "costs_python", "glyphs", repeat)
+    run_benchmark(contourCount, "costs_numpy", "glyphs", repeat)
+    try:
+        import munkres
+    except ImportError:
+        pass
+    else:
+        run_benchmark(contourCount, "matching_munkres", "costs", repeat)
+    run_benchmark(contourCount, "matching_numpy", "costs", repeat)
+    run_benchmark(contourCount, "points_vectors_python", "glyphs", repeat)
+    run_benchmark(contourCount, "points_vectors_numpy", "glyphs", repeat)
+    run_benchmark(contourCount, "starting_points_python", "contours", repeat)
+    run_benchmark(contourCount, "starting_points_numpy", "contours", repeat)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
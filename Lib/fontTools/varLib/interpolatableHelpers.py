@@ -9,6 +9,11 @@ import itertools
 
 import logging
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 log = logging.getLogger("fontTools.varLib.interpolatable")
 
 
@@ -133,6 +138,25 @@ def vdiff_hypot2_complex(v0, v1):
     return s
 
 
+# Below these sizes, the NumPy code paths are slower than the pure-Python ones.
+_NUMPY_MIN_VECTORS = 8
+_NUMPY_MIN_POINTS = 128
+_NUMPY_MIN_ITEMS = 128
+
+
+def vdiff_hypot2_complex_many(v0, vectors):
+    """Return the list of vdiff_hypot2_complex(v0, v1) for v1 in vectors."""
+    if np is not None and len(v0) * len(vectors) >= _NUMPY_MIN_ITEMS:
+        return vdiff_hypot2_complex_many_numpy(v0, vectors)
+    return [vdiff_hypot2_complex(v0, v1) for v1 in vectors]
+
+
+def vdiff_hypot2_complex_many_numpy(v0, vectors):
+    # All the vectors are compared to v0 at once, as rows of a matrix.
+    d = np.array(vectors, dtype=complex) - np.array(v0, dtype=complex)
+    return (d.real * d.real + d.imag * d.imag).sum(axis=1).tolist()
+
+
 def matching_cost(G, matching):
     return sum(G[i][j] for i, j in enumerate(matching))
 
@@ -148,6 +172,8 @@ def min_cost_perfect_bipartite_matching_scipy(G):
 
 
 def min_cost_perfect_bipartite_matching_munkres(G):
+    from munkres import Munkres
+
     n = len(G)
     cols = [None] * n
     for row, col in Munkres().compute(G):
@@ -155,6 +181,52 @@ def min_cost_perfect_bipartite_matching_munkres(G):
     return cols, matching_cost(G, cols)
 
 
+def min_cost_perfect_bipartite_matching_numpy(G):
+    # The Hungarian algorithm, in its O(n^3) shortest augmenting path form,
+    # with the scans over the columns done on arrays.
+    n = len(G)
+    if not n:
+        return [], 0
+    cost = np.asarray(G, dtype=float)
+    # Row and column potentials; rows and columns are 1-based, column 0 is
+    # the virtual one from which each augmenting path starts.
+    u = np.zeros(n + 1)
+    v = np.zeros(n + 1)
+    rowOfCol = np.zeros(n + 1, dtype=int)
+    way = np.zeros(n + 1, dtype=int)
+    for row in range(1, n + 1):
+        rowOfCol[0] = row
+        col0 = 0
+        minv = np.full(n + 1, np.inf)
+        used = np.zeros(n + 1, dtype=bool)
+        while True:
+            used[col0] = True
+            row0 = rowOfCol[col0]
+            free = ~used
+            reduced = cost[row0 - 1] - u[row0] - v[1:]
+            better = free[1:] & (reduced < minv[1:])
+            minv[1:][better] = reduced[better]
+            way[1:][better] = col0
+            candidates = np.where(free, minv, np.inf)
+            col1 = int(np.argmin(candidates))
+            delta = candidates[col1]
+            u[rowOfCol[used]] += delta
+            v[used] -= delta
+            minv[free] -= delta
+            col0 = col1
+            if rowOfCol[col0] == 0:
+                break
+        # Augment the matching along the path found
+        while col0:
+            col1 = way[col0]
+            rowOfCol[col0] = rowOfCol[col1]
+            col0 = col1
+    cols = [None] * n
+    for col in range(1, n + 1):
+        cols[rowOfCol[col] - 1] = col - 1
+    return cols, matching_cost(G, cols)
+
+
 def min_cost_perfect_bipartite_matching_bruteforce(G):
     n = len(G)
 
@@ -173,23 +245,27 @@ def min_cost_perfect_bipartite_matching_bruteforce(G):
 
 
 # Prefer `scipy.optimize.linear_sum_assignment` for performance.
+# With NumPy alone, use our own implementation of the Hungarian algorithm.
 # `Munkres` is also supported as a fallback for minimalistic systems
-# where installing SciPy is not feasible.
+# where installing SciPy or NumPy is not feasible.
 try:
     from scipy.optimize import linear_sum_assignment
 
     min_cost_perfect_bipartite_matching = min_cost_perfect_bipartite_matching_scipy
 except ImportError:
-    try:
-        from munkres import Munkres
+    if np is not None:
+        min_cost_perfect_bipartite_matching = min_cost_perfect_bipartite_matching_numpy
+    else:
+        try:
+            import munkres
 
-        min_cost_perfect_bipartite_matching = (
-            min_cost_perfect_bipartite_matching_munkres
-        )
-    except ImportError:
-        min_cost_perfect_bipartite_matching = (
-            min_cost_perfect_bipartite_matching_bruteforce
-        )
+            min_cost_perfect_bipartite_matching = (
+                min_cost_perfect_bipartite_matching_munkres
+            )
+        except ImportError:
+            min_cost_perfect_bipartite_matching = (
+                min_cost_perfect_bipartite_matching_bruteforce
+            )
 
 
 def contour_vector_from_stats(stats):
@@ -207,10 +283,24 @@ def contour_vector_from_stats(stats):
     )
 
 
+def matching_costs(m0, m1):
+    """Return the matrix of vdiff_hypot2 between all pairs of vectors."""
+    if np is not None and len(m0) >= _NUMPY_MIN_VECTORS:
+        return matching_costs_numpy(m0, m1)
+    return [[vdiff_hypot2(v0, v1) for v1 in m1] for v0 in m0]
+
+
+def matching_costs_numpy(m0, m1):
+    m0 = np.array(m0, dtype=float)
+    m1 = np.array(m1, dtype=float)
+    d = m0[:, np.newaxis, :] - m1[np.newaxis, :, :]
+    return (d * d).sum(axis=2).tolist()
+
+
 def matching_for_vectors(m0, m1):
     n = len(m0)
 
-    costs = [[vdiff_hypot2(v0, v1) for v1 in m1] for v0 in m0]
+    costs = matching_costs(m0, m1)
     (
         matching,
         matching_cost,
@@ -230,6 +320,12 @@ _NUM_ITEMS_PER_POINTS_COMPLEX_VECTOR = 4
 
 
 def points_complex_vector(points):
+    if np is not None and len(points) >= _NUMPY_MIN_POINTS:
+        return points_complex_vector_numpy(points)
+    return points_complex_vector_python(points)
+
+
+def points_complex_vector_python(points):
     vector = []
     if not points:
         return vector
@@ -265,6 +361,23 @@ def points_complex_vector(points):
     return vector
 
 
+def points_complex_vector_numpy(points):
+    # Same as points_complex_vector_python, for all points at once.
+    if not points:
+        return []
+    p0 = np.array([complex(*pt) for pt, _ in points])
+    p1 = np.roll(p0, -1)
+    p2 = np.roll(p0, -2)
+    d0 = p1 - p0
+    d1 = p2 - p1
+    cross = d0.real * d1.imag - d0.imag * d1.real
+    cross = np.copysign(np.sqrt(np.abs(cross)), cross)
+    items = zip(
+        p0.tolist(), (d0 * 3).tolist(), (d1 - d0).tolist(), (cross * 4).tolist()
+    )
+    return [x for item in items for x in item]
+
+
 def add_isomorphisms(points, isomorphisms, reverse):
     reference_bits = points_characteristic_bits(points)
     n = len(points)
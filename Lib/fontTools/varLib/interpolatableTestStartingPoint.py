@@ -11,7 +11,7 @@ def test_starting_point(glyph0, glyph1, ix, tolerance, matching):
 
     c0 = contour0[0]
     # Next few lines duplicated below.
-    costs = [vdiff_hypot2_complex(c0[0], c1[0]) for c1 in contour1]
+    costs = vdiff_hypot2_complex_many(c0[0], [c1[0] for c1 in contour1])
     min_cost_idx, min_cost = min(enumerate(costs), key=lambda x: x[1])
     first_cost = costs[0]
     proposed_point = contour1[min_cost_idx][1]
@@ -89,9 +89,9 @@ def test_starting_point(glyph0, glyph1, ix, tolerance, matching):
                 new_contour1.append(new_c1)
 
             # Next few lines duplicate from above.
-            costs = [
-                vdiff_hypot2_complex(new_c0[0], new_c1[0]) for new_c1 in new_contour1
-            ]
+            costs = vdiff_hypot2_complex_many(
+                new_c0[0], [new_c1[0] for new_c1 in new_contour1]
+            )
             min_cost_idx, min_cost = min(enumerate(costs), key=lambda x: x[1])
             first_cost = costs[0]
             if min_cost < first_cost * tolerance:
@@ -121,6 +121,54 @@ class CffLibTest(DataFilesHandler):
         glyphOrder = font2.getGlyphOrder()
         self.assertEqual(len(glyphOrder), len(set(glyphOrder)))
 
+    def _getCharStringsBytecode(self, font):
+        charStrings = font["CFF "].cff.topDictIndex[0].CharStrings
+        return {name: charStrings[name].bytecode for name in charStrings.keys()}
+
+    def _saveAndReload(self, font):
+        buf = BytesIO()
+        font.save(buf)
+        buf.seek(0)
+        return TTFont(buf)
+
+    def test_compile_unloaded_charstrings(self):
+        font_path = self.getpath("LinLibertine_RBI.otf")
+        expected = self._getCharStringsBytecode(TTFont(font_path))
+        font = TTFont(font_path, recalcBBoxes=False, recalcTimestamp=False)
+        font["CFF "].cff.topDictIndex[0].FontName = "Renamed"
+
+        font2 = self._saveAndReload(font)
+
+        # charstrings are copied over without being loaded
+        charStringsIndex = font["CFF "].cff.topDictIndex[0].CharStrings.charStringsIndex
+        self.assertEqual(charStringsIndex.items, [None] * len(charStringsIndex))
+        self.assertEqual(self._getCharStringsBytecode(font2), expected)
+
+    def test_compile_unmodified_charstrings(self):
+        font_path = self.getpath("LinLibertine_RBI.otf")
+        expected = self._getCharStringsBytecode(TTFont(font_path))
+        font = TTFont(font_path)
+        topDict = font["CFF "].cff.topDictIndex[0]
+        topDict.decompileAllCharStrings()
+        charString = topDict.CharStrings["A"]
+        self.assertIsNone(charString.bytecode)
+        charString.program[0] += 1
+        # changes that leave the program's hash unchanged are detected too
+        # (-1 and -2 hash the same)
+        charString = topDict.CharStrings["B"]
+        self.assertIsNone(charString.bytecode)
+        program = list(charString.program)
+        charString.program[program.index(-2)] = -1
+        self.assertEqual(hash(tuple(charString.program)), hash(tuple(program)))
+
+        font2 = self._saveAndReload(font)
+
+        # decompiled but unmodified charstrings keep their original bytecode
+        actual = self._getCharStringsBytecode(font2)
+        self.assertNotEqual(actual.pop("A"), expected.pop("A"))
+        self.assertNotEqual(actual.pop("B"), expected.pop("B"))
+        self.assertEqual(actual, expected)
+
     def test_reading_supplement_encoding(self):
         cff_path = self.getpath("TestSupplementEncoding.cff")
         topDict = None
@@ -0,0 +1,113 @@
+from fontTools.cffLib.subroutinizer import subroutinize
+from fontTools.pens.recordingPen import RecordingPen
+from fontTools.ttLib import TTFont
+from io import BytesIO
+import os
+import pytest
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+
+
+def _recordGlyphs(font):
+    cff = font["CFF2" if "CFF2" in font else "CFF "].cff
+    charStrings = cff.topDictIndex[0].CharStrings
+    glyphs = {}
+    for glyphName in font.getGlyphOrder():
+        pen = RecordingPen()
+        charString = charStrings[glyphName]
+        charString.draw(pen)
+        glyphs[glyphName] = (pen.value, getattr(charString, "width", None))
+    return glyphs
+
+
+def _saveAndReload(font):
+    buf = BytesIO()
+    font.save(buf)
+    buf.seek(0)
+    return TTFont(buf), len(buf.getvalue())
+
+
+def _allSubrs(cff):
+    topDict = cff.topDictIndex[0]
+    subrs = list(cff.GlobalSubrs)
+    if hasattr(topDict, "FDArray"):
+        privates = [fd.Private for fd in topDict.FDArray]
+    else:
+        privates = [topDict.Private]
+    for private in privates:
+        subrs.extend(getattr(private, "Subrs", []))
+    return subrs
+
+
+@pytest.fixture
+def otf():
+    font = TTFont(os.path.join(DATA_DIR, "LinLibertine_RBI.otf"))
+    font, _ = _saveAndReload(font)
+    return font
+
+
+def test_subroutinize_roundtrip(otf):
+    expected = _recordGlyphs(otf)
+    otf["CFF "].cff.desubroutinize()
+    _, desubroutinizedSize = _saveAndReload(otf)
+
+    otf["CFF "].cff.subroutinize()
+    font, size = _saveAndReload(otf)
+
+    assert size < desubroutinizedSize
+    assert _recordGlyphs(font) == expected
+    assert _allSubrs(font["CFF "].cff)
+
+
+def test_subroutinize_maxNesting(otf):
+    expected = _recordGlyphs(otf)
+    cff = otf["CFF "].cff
+    subroutinize(cff, maxNesting=1)
+    font, _ = _saveAndReload(otf)
+
+    assert _recordGlyphs(font) == expected
+    subrs = _allSubrs(font["CFF "].cff)
+    assert subrs
+    for subr in subrs:
+        subr.decompile()
+        assert "callsubr" not in subr.program
+        assert "callgsubr" not in subr.program
+
+
+def test_subroutinize_maxSubrs(otf):
+    cff = otf["CFF "].cff
+    subroutinize(cff, maxSubrs=10)
+    assert 0 < len(_allSubrs(cff)) <= 10
+
+
+def test_subroutinize_hints_stay_in_glyphs(otf):
+    cff = otf["CFF "].cff
+    cff.subroutinize()
+    for subr in _allSubrs(cff):
+        for op in ("hstem", "vstem", "hstemhm", "vstemhm", "hintmask", "endchar"):
+            assert op not in subr.program
+
+
+def test_subroutinize_cff2():
+    font = TTFont()
+    font.importXML(os.path.join(DATA_DIR, "TestSparseCFF2VF.ttx"))
+    font, _ = _saveAndReload(font)
+    location = {axis.axisTag: axis.maxValue for axis in font["fvar"].axes}
+
+    def drawAll(font):
+        glyphSet = font.getGlyphSet(location=location)
+        result = {}
+        for glyphName in font.getGlyphOrder():
+            pen = RecordingPen()
+            glyphSet[glyphName].draw(pen)
+            result[glyphName] = pen.value
+        return result
+
+    expected = drawAll(font)
+    font["CFF2"].cff.subroutinize()
+    font, _ = _saveAndReload(font)
+
+    assert drawAll(font) == expected
+    for subr in _allSubrs(font["CFF2"].cff):
+        subr.decompile()
+        assert "return" not in subr.program
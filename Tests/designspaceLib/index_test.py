@@ -0,0 +1,124 @@
+import pytest
+from fontTools.designspaceLib import (
+    AxisDescriptor,
+    DesignSpaceDocument,
+    DiscreteAxisDescriptor,
+)
+from fontTools.designspaceLib.index import DesignSpaceIndex
+from fontTools.designspaceLib.split import splitInterpolable
+
+from .fixtures import datadir
+
+DESIGNSPACES = [
+    "test_v5.designspace",
+    "test_v5_aktiv.designspace",
+    "test_v5_discrete.designspace",
+    "test_v5_MutatorSans_and_Serif.designspace",
+    "test_v5_sourceserif.designspace",
+    "test_v4_original.designspace",
+]
+
+
+@pytest.fixture(params=DESIGNSPACES)
+def doc(request, datadir):
+    return DesignSpaceDocument.fromfile(datadir / request.param)
+
+
+def test_axes_and_labels(doc):
+    index = DesignSpaceIndex(doc)
+
+    assert index.getAxisOrder() == doc.getAxisOrder()
+    for axis in doc.axes:
+        assert index.getAxis(axis.name) is doc.getAxis(axis.name)
+        assert index.getAxisByTag(axis.tag) is doc.getAxisByTag(axis.tag)
+    assert index.getAxis("nope") is None
+    for label in doc.locationLabels:
+        assert index.getLocationLabel(label.name) is doc.getLocationLabel(label.name)
+        assert index.labelForUserLocation(
+            label.userLocation
+        ) is doc.labelForUserLocation(label.userLocation)
+    assert index.labelForUserLocation({"nope": 0}) is None
+
+
+def test_locations(doc):
+    index = DesignSpaceIndex(doc)
+
+    assert index.newDefaultLocation() == doc.newDefaultLocation()
+    for instance in doc.instances:
+        designLocation = instance.getFullDesignLocation(doc)
+        assert index.getFullDesignLocation(instance) == designLocation
+        assert index.getFullUserLocation(instance) == instance.getFullUserLocation(doc)
+        userLocation = doc.map_backward(designLocation)
+        assert index.map_backward(designLocation) == userLocation
+        assert index.map_forward(userLocation) == doc.map_forward(userLocation)
+    for source in doc.sources:
+        assert index.getFullDesignLocation(source) == source.getFullDesignLocation(doc)
+    for label in doc.locationLabels:
+        assert index.getFullUserLocation(label) == label.getFullUserLocation(doc)
+
+
+def test_sources(doc):
+    index = DesignSpaceIndex(doc)
+
+    default = doc.findDefault()
+    doc.default = None
+    assert index.findDefault() is default
+    # the index doesn't modify the document
+    assert doc.default is None
+    for source in doc.sources:
+        found = index.findSource(source.getFullDesignLocation(doc))
+        assert found.getFullDesignLocation(doc) == source.getFullDesignLocation(doc)
+
+
+def test_splitInterpolable(doc):
+    index = DesignSpaceIndex(doc)
+
+    expected = [
+        (location, subDoc.tostring())
+        for location, subDoc in splitInterpolable(doc, makeNames=False)
+    ]
+    result = [
+        (location, subDoc.tostring())
+        for location, subDoc in index.splitInterpolable(makeNames=False)
+    ]
+    assert result == expected
+    # the sub-spaces are extracted only once
+    assert [subDoc for _, subDoc in index.splitInterpolable(makeNames=False)] == [
+        subDoc for _, subDoc in index.splitInterpolable(makeNames=False)
+    ]
+
+
+def test_axis_maps():
+    doc = DesignSpaceDocument()
+    doc.addAxis(
+        AxisDescriptor(
+            name="Weight",
+            tag="wght",
+            minimum=100,
+            default=400,
+            maximum=900,
+            map=[(100, 20), (400, 80), (400, 80), (700, 150), (900, 150)],
+        )
+    )
+    doc.addAxis(
+        AxisDescriptor(name="Width", tag="wdth", minimum=50, default=100, maximum=200)
+    )
+    doc.addAxis(
+        DiscreteAxisDescriptor(
+            name="Italic", tag="ital", values=[0, 1], default=0, map=[(0, 0), (1, 5)]
+        )
+    )
+    index = DesignSpaceIndex(doc)
+
+    for weight in (0, 100, 250, 400, 550, 700, 800, 900, 1000):
+        for italic in (0, 1, 2):
+            userLocation = {"Weight": weight, "Width": weight / 5, "Italic": italic}
+            assert index.map_forward(userLocation) == doc.map_forward(userLocation)
+    for weight in (0, 20, 50, 80, 100, 150, 200):
+        for italic in (0, 5, 7):
+            designLocation = {"Weight": weight, "Width": (weight, 0), "Italic": italic}
+            assert index.map_backward(designLocation) == doc.map_backward(
+                designLocation
+            )
+    location = {"Weight": 50, "Width": (100, 80)}
+    assert index.normalizeLocation(location) == doc.normalizeLocation(location)
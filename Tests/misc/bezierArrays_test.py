@@ -0,0 +1,147 @@
+import random
+
+from fontTools.misc import bezierArrays
+from fontTools.misc.bezierArrays import (
+    approximateCubicArcLengthArray,
+    approximateQuadraticArcLengthArray,
+    calcCubicArcLengthArray,
+    calcCubicBoundsArray,
+    calcQuadraticBoundsArray,
+    cubicPointAtTArray,
+    quadraticPointAtTArray,
+    splitCubicAtTArray,
+    splitQuadraticAtTArray,
+)
+from fontTools.misc.bezierTools import (
+    approximateCubicArcLength,
+    approximateQuadraticArcLength,
+    calcCubicArcLength,
+    calcCubicBounds,
+    calcQuadraticBounds,
+    cubicPointAtT,
+    quadraticPointAtT,
+    splitCubicAtT,
+    splitQuadraticAtT,
+)
+import pytest
+
+
+def makeSegments(pointCount, count=50):
+    rnd = random.Random(pointCount)
+    segments = [
+        [(rnd.randint(-500, 500), rnd.randint(-500, 500)) for _ in range(pointCount)]
+        for _ in range(count)
+    ]
+    # some degenerate ones: lines, points, axis-aligned and symmetric handles
+    segments.append([(0, 0)] * pointCount)
+    segments.append([(i * 10, 0) for i in range(pointCount)])
+    segments.append([(0, 0), (100, 0), (100, 100), (0, 100)][:pointCount])
+    segments.append([(50, 0), (0, 100), (100, 100), (50, 0)][:pointCount])
+    return segments
+
+
+QUADRATICS = makeSegments(3)
+CUBICS = makeSegments(4)
+TS = [i / (len(CUBICS) - 1) for i in range(len(CUBICS))]
+
+
+@pytest.fixture(params=["numpy", "python"])
+def backend(request, monkeypatch):
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(bezierArrays, "np", None)
+    return request.param
+
+
+def assertPointsAlmostEqual(result, expected):
+    assert len(result) == len(expected)
+    for r, e in zip(result, expected):
+        assert [float(v) for v in r] == pytest.approx(list(e), abs=1e-9)
+
+
+@pytest.mark.parametrize(
+    "function, scalar, segments",
+    [
+        (calcQuadraticBoundsArray, calcQuadraticBounds, QUADRATICS),
+        (calcCubicBoundsArray, calcCubicBounds, CUBICS),
+    ],
+)
+def test_bounds(backend, function, scalar, segments):
+    result = function(segments)
+    expected = [scalar(*segment) for segment in segments]
+    # same computations, same results
+    assert [tuple(float(v) for v in r) for r in result] == expected
+
+
+@pytest.mark.parametrize(
+    "function, scalar, segments",
+    [
+        (calcCubicArcLengthArray, calcCubicArcLength, CUBICS),
+        (approximateCubicArcLengthArray, approximateCubicArcLength, CUBICS),
+        (approximateQuadraticArcLengthArray, approximateQuadraticArcLength, QUADRATICS),
+    ],
+)
+def test_arc_length(backend, function, scalar, segments):
+    result = function(segments)
+    expected = [scalar(*segment) for segment in segments]
+    assert [float(v) for v in result] == pytest.approx(expected, rel=1e-12)
+
+
+def test_calcCubicArcLengthArray_tolerance(backend):
+    result = calcCubicArcLengthArray(CUBICS, tolerance=0.1)
+    expected = [calcCubicArcLength(*segment, tolerance=0.1) for segment in CUBICS]
+    assert [float(v) for v in result] == pytest.approx(expected, rel=1e-12)
+
+
+@pytest.mark.parametrize(
+    "function, scalar, segments",
+    [
+        (splitQuadraticAtTArray, splitQuadraticAtT, QUADRATICS),
+        (splitCubicAtTArray, splitCubicAtT, CUBICS),
+    ],
+)
+def test_split(backend, function, scalar, segments):
+    ts = TS[: len(segments)]
+    first, second = function(segments, ts)
+    for segment, t, one, two in zip(segments, ts, first, second):
+        expected = scalar(*segment, t)
+        if len(expected) == 1:
+            # t is 0 or 1
+            expected = [expected[0], expected[0]] if t else expected * 2
+            expected[1 if t else 0] = [segment[-1 if t else 0]] * len(segment)
+        assertPointsAlmostEqual(one, expected[0])
+        assertPointsAlmostEqual(two, expected[1])
+
+
+@pytest.mark.parametrize(
+    "function, scalar, segments",
+    [
+        (quadraticPointAtTArray, quadraticPointAtT, QUADRATICS),
+        (cubicPointAtTArray, cubicPointAtT, CUBICS),
+    ],
+)
+def test_point_at_t(backend, function, scalar, segments):
+    ts = TS[: len(segments)]
+    result = function(segments, ts)
+    assertPointsAlmostEqual(result, [scalar(*s, t) for s, t in zip(segments, ts)])
+    # a single t for all the segments
+    result = function(segments, 0.25)
+    assertPointsAlmostEqual(result, [scalar(*s, 0.25) for s in segments])
+
+
+def test_empty():
+    np = pytest.importorskip("numpy")
+    assert calcCubicBoundsArray([]).shape == (0, 4)
+    assert calcCubicArcLengthArray([]).shape == (0,)
+    first, second = splitCubicAtTArray(np.zeros((0, 4, 2)), 0.5)
+    assert first.shape == second.shape == (0, 4, 2)
+
+
+def test_calcCubicArcLengthArray_not_finite():
+    pytest.importorskip("numpy")
+    result = calcCubicArcLengthArray(
+        [[(0, 0), (float("nan"), 0), (0, 0), (1, 1)], [(0, 0), (0, 0), (3, 4), (3, 4)]]
+    )
+    assert result[0] != result[0]
+    assert result[1] == pytest.approx(5)
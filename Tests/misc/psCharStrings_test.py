@@ -76,6 +76,13 @@ class T2CharStringTest(unittest.TestCase):
             cs2.program, [100, "rmoveto", -50, -150, 200.5, 0, -50, 150, "rrcurveto"]
         )
 
+    def test_decompile_all_int_encodings(self):
+        numbers = list(range(-1131, 1132)) + [-32768, -1132, 1132, 32767]
+        cs = T2CharString(program=numbers + ["endchar"], private=PrivateDict())
+        cs.compile()
+        cs.decompile()
+        self.assertEqual(cs.program, numbers + ["endchar"])
+
     def test_encodeFloat(self):
         testNums = [
             # value                expected result
@@ -0,0 +1,107 @@
+from fontTools.misc.roundTools import otRound
+from fontTools.misc.transform import Transform
+from fontTools.pens.cu2quPen import Cu2QuPen
+from fontTools.pens.filterPen import FilterPen
+from fontTools.pens.pipelinePen import PipelinePen, compilePenPipeline
+from fontTools.pens.recordingPen import RecordingPen
+from fontTools.pens.reverseContourPen import ReverseContourPen
+from fontTools.pens.roundingPen import RoundingPen
+from fontTools.pens.transformPen import TransformPen
+import pytest
+
+from .utils import CUBIC_GLYPHS
+
+
+def _transformPen(outPen):
+    return TransformPen(outPen, (2, 0, 0, 0.5, 100, -50))
+
+
+def _chain(*stages):
+    def makePen(outPen, stats):
+        for stage in reversed(stages):
+            if stage is Cu2QuPen:
+                outPen = Cu2QuPen(outPen, 1.0, stats=stats)
+            elif stage == "reverseCu2Qu":
+                outPen = Cu2QuPen(
+                    outPen, 1.0, reverse_direction=True, all_quadratic=False
+                )
+            elif stage == "transform":
+                outPen = _transformPen(outPen)
+            else:
+                outPen = stage(outPen)
+        return outPen
+
+    return makePen
+
+
+PIPELINES = [
+    _chain("transform"),
+    _chain("transform", "transform", FilterPen),
+    _chain(FilterPen, ReverseContourPen),
+    _chain("transform", Cu2QuPen, ReverseContourPen),
+    _chain("transform", "reverseCu2Qu", RoundingPen),
+    _chain(RoundingPen, "transform", ReverseContourPen, "transform"),
+]
+
+
+@pytest.mark.parametrize("makePen", PIPELINES)
+@pytest.mark.parametrize("glyphName", sorted(CUBIC_GLYPHS.keys()))
+def test_compilePenPipeline(makePen, glyphName):
+    glyph = CUBIC_GLYPHS[glyphName]
+    expected = RecordingPen()
+    expectedStats = {}
+    glyph.draw(makePen(expected, expectedStats))
+
+    actual = RecordingPen()
+    actualStats = {}
+    pen = compilePenPipeline(makePen(actual, actualStats))
+    assert isinstance(pen, PipelinePen)
+    glyph.draw(pen)
+
+    assert actual.value == expected.value
+    assert actualStats == expectedStats
+
+
+def test_compilePenPipeline_fuses_transforms():
+    rec = RecordingPen()
+    pen = compilePenPipeline(
+        TransformPen(
+            FilterPen(TransformPen(ReverseContourPen(rec), (1, 0, 0, 1, 10, 20))),
+            (2, 0, 0, 3, 0, 0),
+        )
+    )
+    assert len(pen.filters) == 2
+    assert pen.filters[0].transformation == Transform(2, 0, 0, 3, 10, 20)
+    assert pen._outPen is rec
+
+    pen.moveTo((1, 1))
+    pen.lineTo((2, 1))
+    pen.endPath()
+    pen.qCurveTo((1, 2), (0, 0), None)
+    pen.closePath()
+    pen.addComponent("a", (1, 0, 0, 1, 1, 1))
+    assert rec.value == [
+        ("moveTo", ((14, 23),)),
+        ("lineTo", ((12, 23),)),
+        ("endPath", ()),
+        ("qCurveTo", ((12, 26), (10, 20), None)),
+        ("closePath", ()),
+        ("addComponent", ("a", Transform(2, 0, 0, 3, 12, 23))),
+    ]
+
+
+def test_compilePenPipeline_rounding_components():
+    rec = RecordingPen()
+    pen = compilePenPipeline(
+        RoundingPen(
+            TransformPen(rec, (1, 0, 0, 1, 0.25, 0)), transformRoundFunc=otRound
+        )
+    )
+    pen.addComponent("a", (1.4, 0, 0, 1, 10.6, 0))
+    assert rec.value == [("addComponent", ("a", Transform(1, 0, 0, 1, 11.25, 0)))]
+
+
+def test_compilePenPipeline_nothing_to_compile():
+    rec = RecordingPen()
+    assert compilePenPipeline(rec) is rec
+    assert compilePenPipeline(FilterPen(FilterPen(rec))) is rec
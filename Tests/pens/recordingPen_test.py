@@ -2,7 +2,12 @@ from fontTools.pens.recordingPen import (
     RecordingPen,
     DecomposingRecordingPen,
     RecordingPointPen,
+    CompactRecordingPen,
+    DecomposingCompactRecordingPen,
+    lerpRecordings,
 )
+from fontTools.pens.transformPen import TransformPen
+import pickle
 import pytest
 
 
@@ -48,6 +53,125 @@ class DecomposingRecordingPenTest(object):
         assert excinfo.value.args[0] == "a"
 
 
+class _TestQuadGlyph(object):
+    def draw(self, pen):
+        pen.moveTo((10, 0))
+        pen.qCurveTo((20, 30), (40, 30), (50, 0))
+        pen.lineTo((30, -10))
+        pen.closePath()
+        pen.qCurveTo((0, 0), (0, 10), (10, 10), None)
+        pen.closePath()
+        pen.moveTo((-5, -5))
+        pen.lineTo((-5, 5))
+        pen.endPath()
+
+
+class CompactRecordingPenTest(object):
+    def test_record_and_replay(self):
+        expected = RecordingPen()
+        _TestQuadGlyph().draw(expected)
+        expected.addComponent("a", (2, 0, 0, 3, -10, 5))
+        pen = CompactRecordingPen()
+        _TestQuadGlyph().draw(pen)
+        pen.addComponent("a", (2, 0, 0, 3, -10, 5))
+
+        assert pen.value == expected.value
+        assert len(pen) == len(expected.value)
+        assert len(pen.coordinates) == 2 * 10
+        pen2 = RecordingPen()
+        pen.replay(pen2)
+        assert pen2.value == expected.value
+
+        pen3 = CompactRecordingPen()
+        pen3.value = expected.value
+        assert pen3 == pen
+        assert pickle.loads(pickle.dumps(pen)) == pen
+
+    def test_eq(self):
+        pen1 = CompactRecordingPen()
+        _TestGlyph().draw(pen1)
+        pen2 = CompactRecordingPen()
+        _TestGlyph().draw(pen2)
+        assert pen1 == pen2
+        pen2.lineTo((0, 0))
+        assert pen1 != pen2
+        assert pen1 != RecordingPen()
+
+    def test_transform(self):
+        transformation = (2, 0.5, -0.5, 3, -10, 5)
+        expected = RecordingPen()
+        _TestQuadGlyph().draw(TransformPen(expected, transformation))
+        TransformPen(expected, transformation).addComponent("a", (1, 0, 0, 1, 5, 5))
+        pen = CompactRecordingPen()
+        _TestQuadGlyph().draw(pen)
+        pen.addComponent("a", (1, 0, 0, 1, 5, 5))
+
+        transformed = pen.transform(transformation)
+        assert transformed.value == expected.value
+        assert isinstance(transformed, CompactRecordingPen)
+        # the original isn't modified
+        assert pen.value[0] == ("moveTo", ((10, 0),))
+
+    def test_lerp(self):
+        rec1, rec2 = RecordingPen(), RecordingPen()
+        pen1, pen2 = CompactRecordingPen(), CompactRecordingPen()
+        _TestGlyph().draw(rec1)
+        _TestGlyph().draw(pen1)
+        _TestGlyph().draw(TransformPen(rec2, (2, 0, 0, 2, 0, 0)))
+        _TestGlyph().draw(TransformPen(pen2, (2, 0, 0, 2, 0, 0)))
+
+        for factor in (0, 0.25, 0.5, 1, 2):
+            expected = [
+                (op, tuple(args))
+                for op, args in lerpRecordings(rec1.value, rec2.value, factor)
+            ]
+            assert pen1.lerp(pen2, factor).value == expected
+
+    def test_lerp_implied_oncurve(self):
+        pen1 = CompactRecordingPen()
+        _TestQuadGlyph().draw(pen1)
+        pen2 = pen1.transform((3, 0, 0, 3, 0, 0))
+        assert pen1.lerp(pen2).value == pen1.transform((2, 0, 0, 2, 0, 0)).value
+
+    def test_lerp_errors(self):
+        pen1, pen2 = CompactRecordingPen(), CompactRecordingPen()
+        _TestGlyph().draw(pen1)
+        _TestGlyph().draw(pen2)
+        pen2.lineTo((0, 0))
+        with pytest.raises(ValueError, match="Mismatched lengths"):
+            pen1.lerp(pen2)
+        pen2 = CompactRecordingPen()
+        pen2.moveTo((0, 0))
+        pen2.lineTo((0, 100))
+        pen2.lineTo((50, 0))
+        pen2.closePath()
+        with pytest.raises(ValueError, match="Mismatched operations: curveTo, lineTo"):
+            pen1.lerp(pen2)
+        pen1.addComponent("a", (1, 0, 0, 1, 0, 0))
+        pen2.addComponent("a", (1, 0, 0, 1, 0, 0))
+        with pytest.raises(ValueError, match="Cannot interpolate components"):
+            pen1.lerp(pen2)
+
+
+class DecomposingCompactRecordingPenTest(object):
+    def test_addComponent_decomposed(self):
+        pen = DecomposingCompactRecordingPen({"a": _TestGlyph()})
+        pen.addComponent("a", (2, 0, 0, 3, -10, 5))
+        assert pen.value == [
+            ("moveTo", ((-10.0, 5.0),)),
+            ("lineTo", ((-10.0, 305.0),)),
+            ("curveTo", ((90.0, 230.0), (110.0, 155.0), (90.0, 5.0))),
+            ("closePath", ()),
+        ]
+        assert not pen.components
+
+    def test_addComponent_missing_raises(self):
+        pen = DecomposingCompactRecordingPen(dict())
+        with pytest.raises(KeyError) as excinfo:
+            pen.addComponent("a", (1, 0, 0, 1, 0, 0))
+        assert excinfo.value.args[0] == "a"
+
+
 class RecordingPointPenTest:
     def test_record_and_replay(self):
         pen = RecordingPointPen()
@@ -0,0 +1,126 @@
+import math
+
+from fontTools.pens import statisticsPen
+from fontTools.pens.basePen import OpenContourError
+from fontTools.pens.recordingPen import RecordingPen
+from fontTools.pens.statisticsPen import (
+    GlyphStatistics,
+    StatisticsControlPen,
+    StatisticsPen,
+    calcGlyphStatistics,
+)
+from fontTools.pens.transformPen import TransformPen
+import pytest
+
+from .utils import CUBIC_GLYPHS, QUAD_GLYPHS
+
+ATTRIBUTES = [
+    "area",
+    "meanX",
+    "meanY",
+    "varianceX",
+    "varianceY",
+    "stddevX",
+    "stddevY",
+    "covariance",
+    "correlation",
+    "slant",
+]
+
+
+def _assertSameStatistics(stats, pen, attributes=ATTRIBUTES):
+    for attr in attributes:
+        expected = getattr(pen, attr)
+        if math.isnan(expected):
+            assert math.isnan(getattr(stats, attr)), attr
+        else:
+            assert getattr(stats, attr) == pytest.approx(
+                expected, rel=1e-9, abs=1e-9
+            ), attr
+
+
+@pytest.fixture(params=[True, False], ids=["numpy", "no-numpy"])
+def useNumpy(request, monkeypatch):
+    if request.param:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(statisticsPen, "np", None)
+    return request.param
+
+
+@pytest.mark.parametrize("glyphset", [CUBIC_GLYPHS, QUAD_GLYPHS])
+@pytest.mark.parametrize("control", [False, True])
+@pytest.mark.parametrize("transformation", [None, (0.5, 0, 0.2, 2, 10, -10)])
+def test_calcGlyphStatistics(useNumpy, glyphset, control, transformation):
+    glyphNames = sorted(glyphset.keys())
+    statistics = calcGlyphStatistics(
+        glyphset, glyphNames, control=control, transformation=transformation
+    )
+    assert list(statistics) == glyphNames
+    for glyphName in glyphNames:
+        pen = (StatisticsControlPen if control else StatisticsPen)(glyphset=glyphset)
+        if transformation is not None:
+            glyphset[glyphName].draw(TransformPen(pen, transformation))
+        else:
+            glyphset[glyphName].draw(pen)
+        stats = statistics[glyphName]
+        assert isinstance(stats, GlyphStatistics)
+        assert stats.glyphName == glyphName
+        attributes = ATTRIBUTES
+        if not control:
+            attributes = ATTRIBUTES + [
+                "momentX",
+                "momentY",
+                "momentXX",
+                "momentXY",
+                "momentYY",
+            ]
+        _assertSameStatistics(stats, pen, attributes)
+
+
+def _drawSquare(pen, offset=0):
+    pen.moveTo((offset, 0))
+    pen.lineTo((offset + 100, 0))
+    pen.lineTo((offset + 100, 100))
+    pen.lineTo((offset, 100))
+    pen.closePath()
+
+
+def test_calcGlyphStatistics_components(useNumpy):
+    square = RecordingPen()
+    _drawSquare(square)
+    composite = RecordingPen()
+    composite.addComponent("square", (1, 0, 0, 1, 0, 0))
+    composite.addComponent("square", (2, 0, 0, 1, 200, 0))
+    empty = RecordingPen()
+    glyphset = {"square": square, "composite": composite, "empty": empty}
+
+    statistics = calcGlyphStatistics(glyphset)
+    assert statistics["square"].area == pytest.approx(10000)
+    assert statistics["composite"].area == pytest.approx(30000)
+    assert statistics["composite"].meanX == pytest.approx(
+        (10000 * 50 + 20000 * 300) / 30000
+    )
+    assert statistics["empty"].area == 0
+    assert statistics["empty"].meanX == 0
+
+    controlStatistics = calcGlyphStatistics(glyphset, control=True)
+    for glyphName in glyphset:
+        pen = StatisticsControlPen(glyphset=glyphset)
+        glyphset[glyphName].draw(pen)
+        _assertSameStatistics(controlStatistics[glyphName], pen)
+
+
+def test_calcGlyphStatistics_open_contour(useNumpy):
+    glyph = RecordingPen()
+    glyph.moveTo((0, 0))
+    glyph.lineTo((100, 0))
+    glyph.lineTo((100, 100))
+    glyph.endPath()
+    square = RecordingPen()
+    _drawSquare(square)
+    glyphset = {"square": square, "open": glyph}
+
+    assert calcGlyphStatistics(glyphset, ["square"])["square"].area > 0
+    with pytest.raises(OpenContourError):
+        calcGlyphStatistics(glyphset)
@@ -1,4 +1,6 @@
-from fontTools.pens.t2CharStringPen import T2CharStringPen
+from array import array
+from fontTools.pens.t2CharStringPen import T2CharStringPen, charStringFromArrays
+from fontTools.ttLib.tables._g_l_y_f import Glyph, GlyphCoordinates
 import unittest
 
 
@@ -289,6 +291,123 @@ class T2CharStringPenTest(unittest.TestCase):
         )
 
 
+class CharStringFromArraysTest(unittest.TestCase):
+    def assertSameAsGlyphDraw(self, coordinates, flags, endPts, **kwargs):
+        glyph = Glyph()
+        glyph.numberOfContours = len(endPts)
+        glyph.coordinates = GlyphCoordinates(coordinates)
+        glyph.flags = array("B", flags)
+        glyph.endPtsOfContours = endPts
+        width = kwargs.pop("width", None)
+        pen = T2CharStringPen(
+            width,
+            None,
+            roundTolerance=kwargs.get("roundTolerance", 0.5),
+            CFF2=kwargs.get("CFF2", False),
+        )
+        glyph.draw(pen, None)
+        optimize = kwargs.get("optimize", True)
+        expected = pen.getCharString(optimize=optimize)
+
+        charString = charStringFromArrays(coordinates, flags, endPts, width, **kwargs)
+
+        self.assertEqual(expected.program, charString.program)
+        return charString
+
+    def test_lines_and_cubic_curves(self):
+        charString = self.assertSameAsGlyphDraw(
+            [(10, 0), (10, 100), (20.4, 120), (60, 120), (70, 100), (70, 0)]
+            + [(30, 30), (40, 30), (40, 40)],
+            [1, 1, 0x80, 0x80, 1, 1, 1, 1, 1],
+            [5, 8],
+            width=100,
+        )
+        self.assertEqual(
+            [
+                100,
+                10,
+                "hmoveto",
+                100,
+                "vlineto",
+                10,
+                20,
+                40,
+                0,
+                10,
+                -20,
+                "rrcurveto",
+                -100,
+                "vlineto",
+                -40,
+                30,
+                "rmoveto",
+                10,
+                10,
+                "hlineto",
+                "endchar",
+            ],
+            charString.program,
+        )
+
+    def test_contour_starting_with_off_curve(self):
+        self.assertSameAsGlyphDraw(
+            [(20, 120), (60, 120), (70, 100), (70, 0), (10, 0), (10, 100)],
+            [0x80, 0x80, 1, 1, 1, 1],
+            [5],
+        )
+
+    def test_quadratic_curves(self):
+        for roundTolerance in (0.5, 0.1, 0):
+            self.assertSameAsGlyphDraw(
+                [(0, 0), (0, 50), (50.5, 100), (100, 50), (100, 0), (75, -10)],
+                [1, 0, 0, 0, 1, 0],
+                [5],
+                roundTolerance=roundTolerance,
+            )
+
+    def test_contours_drawn_by_glyph(self):
+        # cubic off-curves with implied on-curve points, no on-curve points
+        self.assertSameAsGlyphDraw(
+            [(0, 0), (0, 50), (50, 100), (100, 100), (150, 50), (100, 0), (50, 0)]
+            + [(0, 0), (0, 100), (100, 100), (100, 0)]
+            + [(200, 0), (200, 100), (300, 100), (300, 0)],
+            [1, 0x80, 0x80, 0x80, 0x80, 0x80, 0x80, 0, 0, 0, 0]
+            + [0x80, 0x80, 0x80, 0x80],
+            [6, 10, 14],
+            width=200,
+            optimize=False,
+        )
+
+    def test_CFF2(self):
+        self.assertSameAsGlyphDraw(
+            [(0, 0), (0, 100), (100, 100)], [1, 1, 1], [2], CFF2=True
+        )
+
+    def test_numpy(self):
+        try:
+            import numpy as np
+        except ImportError:
+            self.skipTest("numpy not installed")
+        coordinates = [(0, 0), (0, 100), (50, 150), (100.6, 100), (100, 0)]
+        flags = [1, 0x80, 0x80, 1, 1]
+        expected = charStringFromArrays(coordinates, flags, [4], 100)
+
+        charString = charStringFromArrays(
+            np.array(coordinates), np.array(flags), np.array([4]), 100
+        )
+
+        self.assertEqual(expected.program, charString.program)
+        self.assertTrue(all(type(v) in (int, str) for v in charString.program))
+
+    def test_errors(self):
+        with self.assertRaisesRegex(ValueError, "Expected 2 flags"):
+            charStringFromArrays([(0, 0), (1, 1)], [1], [1], None)
+        with self.assertRaisesRegex(ValueError, "Invalid contour end points"):
+            charStringFromArrays([(0, 0), (1, 1)], [1, 1], [0], None)
+        with self.assertRaisesRegex(ValueError, "Invalid contour end points"):
+            charStringFromArrays([(0, 0), (1, 1)], [1, 1], [1, 0], None)
+
+
 if __name__ == "__main__":
     import sys
 
@@ -6,7 +6,12 @@ from fontTools import ttLib
 from fontTools.misc.roundTools import noRound
 from fontTools.pens.basePen import PenError
 from fontTools.pens.recordingPen import RecordingPen, RecordingPointPen
-from fontTools.pens.ttGlyphPen import TTGlyphPen, TTGlyphPointPen, MAX_F2DOT14
+from fontTools.pens.ttGlyphPen import (
+    TTGlyphPen,
+    TTGlyphPointPen,
+    MAX_F2DOT14,
+    glyphFromArrays,
+)
 
 
 class TTGlyphPenTestBase:
@@ -902,6 +907,74 @@ class CubicGlyfTest:
             assert rpen.value == segment_pen_commands
 
 
+class GlyphFromArraysTest:
+    def test_same_as_pen(self):
+        pen = TTGlyphPen(None)
+        pen.moveTo((0.4, 0))
+        pen.qCurveTo((0, 50.6), (50, 100), (100, 50))
+        pen.lineTo((100, 0))
+        pen.closePath()
+        pen.moveTo((10, 10))
+        pen.curveTo((20, 20), (30, 20), (40, 10))
+        pen.closePath()
+        expected = pen.glyph()
+
+        glyph = glyphFromArrays(
+            [(0.4, 0), (0, 50.6), (50, 100), (100, 50), (100, 0)]
+            + [(10, 10), (20, 20), (30, 20), (40, 10)],
+            [1, 0, 0, 1, 1, 1, 0x80, 0x80, 1],
+            [4, 8],
+        )
+
+        assert glyph == expected
+        assert glyph.compile(None) == expected.compile(None)
+
+    def test_numpy(self):
+        np = pytest.importorskip("numpy")
+        coordinates = [(0, 0), (0, 100), (50, 150), (100.6, 100), (100, 0)]
+        expected = glyphFromArrays(coordinates, [1, 1, 0, 1, 1], [4])
+
+        glyph = glyphFromArrays(
+            np.array(coordinates), np.array([1, 1, 0, 1, 1]), np.array([4])
+        )
+
+        assert glyph == expected
+        assert list(glyph.coordinates) == [
+            (0, 0),
+            (0, 100),
+            (50, 150),
+            (101, 100),
+            (100, 0),
+        ]
+
+    def test_empty(self):
+        glyph = glyphFromArrays([], [], [])
+        assert glyph.numberOfContours == 0
+        assert glyph.compile(None) == TTGlyphPen(None).glyph().compile(None)
+
+    def test_dropImpliedOnCurves(self):
+        glyph = glyphFromArrays(
+            [(0, 0), (0, 100), (50, 100), (100, 100), (100, 0)],
+            [1, 0, 1, 0, 1],
+            [4],
+            dropImpliedOnCurves=True,
+        )
+        assert list(glyph.coordinates) == [(0, 0), (0, 100), (100, 100), (100, 0)]
+
+    @pytest.mark.parametrize(
+        "coordinates, flags, endPts",
+        [
+            ([(0, 0), (1, 1)], [1], [1]),
+            ([(0, 0), (1, 1)], [1, 1], [0]),
+            ([(0, 0), (1, 1)], [1, 1], [1, 0]),
+            ([(0, 0), (1, 1)], [1, 1], [2]),
+        ],
+    )
+    def test_errors(self, coordinates, flags, endPts):
+        with pytest.raises(PenError):
+            glyphFromArrays(coordinates, flags, endPts)
+
+
 class _TestGlyph(object):
     def __init__(self, glyph):
         self.coordinates = glyph.coordinates
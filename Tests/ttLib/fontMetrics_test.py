@@ -0,0 +1,179 @@
+from io import BytesIO
+from unittest.mock import patch
+
+from fontTools.fontBuilder import FontBuilder
+from fontTools.misc.arrayTools import intRect, unionRect
+from fontTools.misc.psCharStrings import T2CharString
+from fontTools.pens.t2CharStringPen import T2CharStringPen
+from fontTools.pens.ttGlyphPen import TTGlyphPen
+from fontTools.ttLib import TTFont
+from fontTools.ttLib.fontMetrics import FontMetrics, getFontMetrics
+import pytest
+
+GLYPH_ORDER = [".notdef", "A", "B", "C", "space"]
+
+
+def drawRect(pen, xMin, yMin, xMax, yMax):
+    pen.moveTo((xMin, yMin))
+    pen.lineTo((xMin, yMax))
+    pen.lineTo((xMax, yMax))
+    pen.lineTo((xMax, yMin))
+    pen.closePath()
+
+
+def drawCurve(pen, offset):
+    pen.moveTo((offset, 0))
+    pen.curveTo((offset, 300), (offset + 400, 300), (offset + 400, 0))
+    pen.closePath()
+
+
+def _setupFontBuilder(isTTF):
+    fb = FontBuilder(1000, isTTF=isTTF)
+    fb.setupGlyphOrder(GLYPH_ORDER)
+    fb.setupCharacterMap({ord("A"): "A", ord("B"): "B", ord("C"): "C", 32: "space"})
+    return fb
+
+
+def _setupTables(fb, lsbs):
+    fb.setupHorizontalMetrics({name: (600, lsbs[name]) for name in GLYPH_ORDER})
+    fb.setupHorizontalHeader(ascent=800, descent=-200)
+    fb.setupNameTable({"familyName": "Test", "styleName": "Regular"})
+    fb.setupOS2()
+    fb.setupPost()
+
+
+def makeCFFFont(isCFF2=False):
+    fb = _setupFontBuilder(isTTF=False)
+    charStrings = {}
+    for i, name in enumerate(GLYPH_ORDER):
+        pen = T2CharStringPen(None if isCFF2 else 600, None, CFF2=isCFF2)
+        if name != "space":
+            drawCurve(pen, 10 * i)
+            drawRect(pen, 10 * i, -50 * i, 100 + 10 * i, 700 + 10 * i)
+        charStrings[name] = pen.getCharString()
+    if isCFF2:
+        fb.setupCFF2(charStrings)
+    else:
+        fb.setupCFF("Test", {}, charStrings, {})
+    lsbs = {name: (cs.calcBounds(None) or (0,))[0] for name, cs in charStrings.items()}
+    _setupTables(fb, lsbs)
+    return fb.font
+
+
+def makeTTFont():
+    fb = _setupFontBuilder(isTTF=True)
+    glyphs = {"space": TTGlyphPen(None).glyph()}
+    pen = TTGlyphPen(None)
+    drawRect(pen, 50, 0, 450, 700)
+    glyphs[".notdef"] = pen.glyph()
+    pen = TTGlyphPen(None)
+    drawRect(pen, 0, -100, 300, 500)
+    drawRect(pen, 400, 0, 500, 100)
+    glyphs["A"] = pen.glyph()
+    # nested composites
+    pen = TTGlyphPen(glyphs)
+    pen.addComponent("A", (1, 0, 0, 1, 100, 50))
+    pen.addComponent(".notdef", (1, 0, 0, 1, 0, 0))
+    glyphs["B"] = pen.glyph()
+    pen = TTGlyphPen(glyphs)
+    pen.addComponent("B", (1, 0, 0, 1, -10, 0))
+    pen.addComponent("A", (1, 0, 0, 1, 0, 200))
+    pen.addComponent("space", (1, 0, 0, 1, 0, 0))
+    glyphs["C"] = pen.glyph()
+    fb.setupGlyf(glyphs)
+    glyf = fb.font["glyf"]
+    _setupTables(
+        fb,
+        {name: getattr(glyf[name], "xMin", 0) for name in GLYPH_ORDER},
+    )
+    return fb.font
+
+
+def saveAndReload(font):
+    buf = BytesIO()
+    font.save(buf)
+    buf.seek(0)
+    return TTFont(buf)
+
+
+@pytest.mark.parametrize("isCFF2", [False, True])
+def test_cff_bounds_calculated_once(isCFF2):
+    font = makeCFFFont(isCFF2)
+    if isCFF2:
+        font.sfntVersion = "OTTO"
+    tag = "CFF2" if isCFF2 else "CFF "
+    charStrings = font[tag].cff.topDictIndex[0].CharStrings
+    expected = {name: charStrings[name].calcBounds(charStrings) for name in GLYPH_ORDER}
+    fontBBox = None
+    for bounds in expected.values():
+        if bounds is not None:
+            fontBBox = bounds if fontBBox is None else unionRect(fontBBox, bounds)
+
+    # not autospec=True, which can't introspect the methods of the compiled
+    # psCharStrings module
+    calls = []
+    originalCalcBounds = T2CharString.calcBounds
+
+    def calcBounds(self, glyphSet):
+        calls.append(self)
+        return originalCalcBounds(self, glyphSet)
+
+    with patch.object(T2CharString, "calcBounds", calcBounds):
+        font = saveAndReload(font)
+    # CFF FontBBox (or head for CFF2) and hhea share the same bounds
+    assert len(calls) == len(GLYPH_ORDER)
+    assert not hasattr(font, "_fontMetrics")
+
+    head = font["head"]
+    assert (head.xMin, head.yMin, head.xMax, head.yMax) == intRect(fontBBox)
+    if not isCFF2:
+        assert font["CFF "].cff.topDictIndex[0].FontBBox == list(intRect(fontBBox))
+    hhea = font["hhea"]
+    assert hhea.xMaxExtent == max(
+        lsb + bounds[2] - bounds[0]
+        for (_, lsb), bounds in (
+            (font["hmtx"][name], expected[name]) for name in GLYPH_ORDER
+        )
+        if bounds is not None
+    )
+
+
+def test_glyf_composite_maxp_values():
+    font = makeTTFont()
+    glyf = font["glyf"]
+    fontMetrics = FontMetrics(font)
+    for name in ("B", "C"):
+        assert fontMetrics.compositeMaxpValues(name) == tuple(
+            glyf[name].getCompositeMaxpValues(glyf)
+        )
+    assert fontMetrics.compositeMaxpValues("B") == (12, 3, 1)
+    assert fontMetrics.compositeMaxpValues("C") == (20, 5, 2)
+
+
+def test_glyf_bounds():
+    font = makeTTFont()
+    glyf = font["glyf"]
+    for name in ("B", "C"):
+        del glyf[name].xMin, glyf[name].yMin, glyf[name].xMax, glyf[name].yMax
+    fontMetrics = FontMetrics(font)
+    assert fontMetrics.glyphBounds("space") is None
+    assert fontMetrics.glyphBounds("C") == (0, -50, 590, 700)
+    assert fontMetrics.glyphBounds("B") == (50, -50, 600, 700)
+    assert fontMetrics.boundsDone == {"A", ".notdef", "B", "C", "space"}
+    assert fontMetrics.fontBounds() == (0, -100, 600, 700)
+
+    font = saveAndReload(font)
+    head, maxp = font["head"], font["maxp"]
+    assert (head.xMin, head.yMin, head.xMax, head.yMax) == (0, -100, 600, 700)
+    assert (maxp.maxCompositePoints, maxp.maxCompositeContours) == (20, 5)
+    assert maxp.maxComponentDepth == 2
+    assert font["hhea"].xMaxExtent == 600
+
+
+def test_getFontMetrics():
+    font = makeTTFont()
+    fontMetrics = getFontMetrics(font)
+    # not shared outside of save
+    assert getFontMetrics(font) is not fontMetrics
+    font._fontMetrics = fontMetrics
+    assert getFontMetrics(font) is fontMetrics
@@ -1,11 +1,25 @@
 import logging
+import multiprocessing
 import pytest
+from io import BytesIO
 from pathlib import Path
 
 pathops = pytest.importorskip("pathops")
 
+from fontTools.fontBuilder import FontBuilder
+from fontTools.pens.ttGlyphPen import TTGlyphPen
 from fontTools.ttLib import TTFont
-from fontTools.ttLib.removeOverlaps import removeOverlaps, _simplify, _round_path
+from fontTools.ttLib import removeOverlaps as removeOverlapsModule
+from fontTools.ttLib.removeOverlaps import (
+    RemoveOverlapsError,
+    main,
+    removeOverlaps,
+    _mayOverlap,
+    _recordSkPath,
+    _simplify,
+    _skPathFromRecording,
+    _round_path,
+)
 
 DATA_DIR = Path(__file__).parent / "data"
 
@@ -71,3 +85,213 @@ def test_CFF_CharString_width_nominalWidthX():
 
     font["CFF "].cff[0].CharStrings["OE"].calcBounds({})
     assert font["CFF "].cff[0].CharStrings["OE"].width == font["hmtx"]["OE"][0]
+
+
+def _path(*contours, close=True):
+    path = pathops.Path()
+    pen = path.getPen()
+    for contour in contours:
+        pen.moveTo(contour[0])
+        for pt in contour[1:]:
+            if len(pt) == 3:
+                pen.curveTo(*pt)
+            else:
+                pen.lineTo(pt)
+        if close:
+            pen.closePath()
+        else:
+            pen.endPath()
+    return path
+
+
+def _rect(xMin, yMin, xMax, yMax):
+    return [(xMin, yMin), (xMin, yMax), (xMax, yMax), (xMax, yMin)]
+
+
+@pytest.mark.parametrize(
+    "path, expected",
+    [
+        (_path(_rect(0, 0, 100, 100)), False),
+        (_path(_rect(0, 0, 100, 100), _rect(200, 0, 300, 100)), False),
+        # non-convex contours (an "L" and a "U")
+        (_path([(0, 0), (0, 200), (50, 200), (50, 50), (200, 50), (200, 0)]), False),
+        (
+            _path(
+                [
+                    (0, 0),
+                    (0, 200),
+                    (50, 200),
+                    ((50, 100), (150, 100), (150, 200)),
+                    (200, 200),
+                    (200, 0),
+                ]
+            ),
+            False,
+        ),
+        # overlapping bounds, or contours touching each other
+        (_path(_rect(0, 0, 100, 100), _rect(50, 50, 150, 150)), True),
+        (_path(_rect(0, 0, 100, 100), _rect(100, 0, 200, 100)), True),
+        # a contour inside another one, with the opposite direction
+        (_path(_rect(0, 0, 100, 100), _rect(20, 20, 80, 80)[::-1]), True),
+        # self-intersecting contours
+        (_path([(0, 0), (100, 100), (100, 0), (0, 100)]), True),
+        (_path([(0, 0), ((300, 100), (-200, 100), (100, 0))]), True),
+        # contours with different directions
+        (_path(_rect(0, 0, 100, 100), _rect(200, 0, 300, 100)[::-1]), True),
+        # open and empty contours
+        (_path(_rect(0, 0, 100, 100), close=False), True),
+        (_path([(0, 0), (100, 0), (200, 0)]), True),
+    ],
+)
+def test_mayOverlap(path, expected):
+    assert _mayOverlap(path) is expected
+    if not expected:
+        # simplifying the path doesn't change its contours
+        simplified = pathops.simplify(path, clockwise=path.clockwise)
+        assert simplified.area == path.area
+
+
+def test_recordSkPath():
+    path = _path(
+        _rect(0, 0, 100, 100), [(0, 0), ((0, 50), (50, 100), (100, 100))], close=False
+    )
+    path.quadTo(100, 50, 50, 0)
+    path.close()
+    assert _skPathFromRecording(_recordSkPath(path)) == path
+
+
+def _drawContours(*contours):
+    pen = TTGlyphPen(None)
+    for contour in contours:
+        pen.moveTo(contour[0])
+        for pt in contour[1:]:
+            pen.lineTo(pt)
+        pen.closePath()
+    return pen.glyph()
+
+
+def _makeTTFont():
+    fb = FontBuilder(1000, isTTF=True)
+    glyphs = {
+        ".notdef": _drawContours(),
+        # two overlapping rectangles
+        "overlap": _drawContours(_rect(0, 0, 300, 300), _rect(100, 100, 400, 400)),
+        # two disjoint rectangles, one with a redundant point
+        "disjoint": _drawContours(
+            _rect(0, 0, 100, 100),
+            [(200, 0), (200, 100), (300, 100), (300, 50), (300, 0)],
+        ),
+        "bowtie": _drawContours([(0, 0), (100, 100), (100, 0), (0, 100)]),
+    }
+    pen = TTGlyphPen(glyphs)
+    pen.addComponent("overlap", (1, 0, 0, 1, 0, 0))
+    pen.addComponent("disjoint", (1, 0, 0, 1, 350, 350))
+    glyphs["composite"] = pen.glyph()
+    pen = TTGlyphPen(glyphs)
+    pen.addComponent("composite", (1, 0, 0, 1, 0, 0))
+    pen.addComponent("disjoint", (1, 0, 0, 1, 100, 0))
+    glyphs["nested"] = pen.glyph()
+    fb.setupGlyphOrder(list(glyphs))
+    fb.setupCharacterMap({})
+    fb.setupGlyf(glyphs)
+    glyfTable = fb.font["glyf"]
+    fb.setupHorizontalMetrics(
+        {name: (500, getattr(glyfTable[name], "xMin", 0)) for name in glyphs}
+    )
+    fb.setupHorizontalHeader(ascent=800, descent=-200)
+    fb.setupPost()
+    return _reload(fb.font)
+
+
+def _reload(font):
+    buf = BytesIO()
+    font.save(buf)
+    buf.seek(0)
+    return TTFont(buf, recalcTimestamp=False)
+
+
+def _glyphPoints(font, glyphName):
+    glyph = font["glyf"][glyphName]
+    if glyph.isComposite():
+        return [c.glyphName for c in glyph.components]
+    return list(getattr(glyph, "coordinates", ()))
+
+
+@pytest.mark.parametrize("skipNonOverlapping", [False, True])
+def test_removeOverlaps_jobs(skipNonOverlapping):
+    expected = _makeTTFont()
+    removeOverlaps(expected, skipNonOverlapping=skipNonOverlapping)
+    font = _makeTTFont()
+    removeOverlaps(font, skipNonOverlapping=skipNonOverlapping, jobs=2)
+    for glyphName in font.getGlyphOrder():
+        assert _glyphPoints(font, glyphName) == _glyphPoints(expected, glyphName)
+        assert font["hmtx"][glyphName] == expected["hmtx"][glyphName]
+    assert _reload(font)["glyf"].compile(font) == _reload(expected)["glyf"].compile(
+        expected
+    )
+
+    original = _makeTTFont()
+    for glyphName in ("overlap", "bowtie", "composite"):
+        assert _glyphPoints(font, glyphName) != _glyphPoints(original, glyphName)
+    assert not font["glyf"]["composite"].isComposite()
+    assert not font["glyf"]["nested"].isComposite()
+    # the redundant point is only removed if the glyph is simplified
+    assert (
+        _glyphPoints(font, "disjoint") == _glyphPoints(original, "disjoint")
+    ) is skipNonOverlapping
+
+
+def _failingSimplify(path, debugGlyphName, **kwargs):
+    if debugGlyphName == "overlap":
+        raise RemoveOverlapsError(debugGlyphName)
+    return _simplify(path, debugGlyphName, **kwargs)
+
+
+# the worker processes only see the patched _simplify if they are forked
+@pytest.mark.skipif(
+    multiprocessing.get_start_method() != "fork", reason="requires fork"
+)
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_removeOverlaps_ignoreErrors_keeps_hinting(monkeypatch, jobs):
+    monkeypatch.setattr(removeOverlapsModule, "_simplify", _failingSimplify)
+    font = _makeTTFont()
+    for glyphName in ("overlap", "bowtie"):
+        font["glyf"][glyphName].program.fromBytecode(b"\xb0\x01")
+
+    removeOverlaps(font, ignoreErrors=True, jobs=jobs)
+
+    # the glyph that failed is left unchanged, hinting included
+    assert _glyphPoints(font, "overlap") == _glyphPoints(_makeTTFont(), "overlap")
+    assert font["glyf"]["overlap"].program.getBytecode() == b"\xb0\x01"
+    assert font["glyf"]["bowtie"].program.getBytecode() == b""
+
+
+def test_main_jobs(tmp_path):
+    input_path = str(tmp_path / "input.ttf")
+    _makeTTFont().save(input_path)
+    expected = _makeTTFont()
+    removeOverlaps(expected)
+
+    # 0 means the number of CPUs
+    output_path = str(tmp_path / "output.ttf")
+    main([input_path, output_path, "-j", "0"])
+
+    font = TTFont(output_path)
+    for glyphName in font.getGlyphOrder():
+        assert _glyphPoints(font, glyphName) == _glyphPoints(expected, glyphName)
+
+
+@pytest.mark.parametrize("skipNonOverlapping", [False, True])
+def test_removeOverlaps_jobs_CFF(skipNonOverlapping):
+    font_path = DATA_DIR / "IBMPlexSans-Bold.subset.otf"
+    expected = TTFont(str(font_path))
+    removeOverlaps(expected, skipNonOverlapping=skipNonOverlapping)
+    font = TTFont(str(font_path))
+    removeOverlaps(font, skipNonOverlapping=skipNonOverlapping, jobs=2)
+
+    charStrings = font["CFF "].cff[0].CharStrings
+    expectedCharStrings = expected["CFF "].cff[0].CharStrings
+    for glyphName in font.getGlyphOrder():
+        assert (
+            charStrings[glyphName].compile() == expectedCharStrings[glyphName].compile()
+        )
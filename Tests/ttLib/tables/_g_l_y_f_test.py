@@ -430,6 +430,56 @@ class GlyfTableTest(unittest.TestCase):
         self.assertEqual(glyfData, b"\x00")
         self.assertEqual(list(font["loca"]), [0] * (font["maxp"].numGlyphs + 1))
 
+    def test_compile_optimizeSize(self):
+        font = TTFont(sfntVersion="\x00\x01\x00\x00")
+        font.importXML(GLYF_TTX)
+        glyfTable = font["glyf"]
+        sizeData = glyfTable.compile(font)
+        glyfTable.optimizeSize = False
+        speedData = glyfTable.compile(font)
+        self.assertLess(len(sizeData), len(speedData))
+        # the table attribute takes precedence over the font config
+        glyfTable.optimizeSize = True
+        font.cfg["fontTools.ttLib:OPTIMIZE_FONT_SPEED"] = True
+        self.assertEqual(glyfTable.compile(font), sizeData)
+        glyfTable.optimizeSize = None
+        self.assertEqual(glyfTable.compile(font), speedData)
+
+    def test_compile_cacheCompiledGlyphs(self):
+        font = TTFont(sfntVersion="\x00\x01\x00\x00")
+        font.importXML(GLYF_TTX)
+        glyfTable = font["glyf"]
+        glyfTable.cacheCompiledGlyphs = True
+        self.assertEqual(glyfTable.compile(font), self.glyfData)
+        self.assertEqual(glyfTable.compile(font), self.glyfData)
+
+        # editing a glyph in place invalidates its cached data
+        glyph = glyfTable["glyph00003"]
+        glyph.coordinates[0] = (1000, 1000)
+        data = glyfTable.compile(font)
+        self.assertNotEqual(data, self.glyfData)
+        glyfTable.cacheCompiledGlyphs = False
+        self.assertEqual(glyfTable.compile(font), data)
+        self.assertFalse(hasattr(glyfTable, "_compiledGlyphs"))
+
+    def test_compile_cacheCompiledGlyphs_eq(self):
+        tables = []
+        for cacheCompiledGlyphs in (True, False):
+            font = TTFont(sfntVersion="\x00\x01\x00\x00")
+            font.importXML(GLYF_TTX)
+            glyfTable = font["glyf"]
+            glyfTable.cacheCompiledGlyphs = cacheCompiledGlyphs
+            glyfTable.compile(font)
+            glyfTable.cacheCompiledGlyphs = True
+            tables.append(glyfTable)
+        self.assertTrue(hasattr(tables[0], "_compiledGlyphs"))
+        self.assertFalse(hasattr(tables[1], "_compiledGlyphs"))
+        # the cache does not take part in comparisons
+        self.assertEqual(tables[0], tables[1])
+        self.assertEqual(tables[1], tables[0])
+        tables[0]["glyph00003"].coordinates[0] = (1000, 1000)
+        self.assertNotEqual(tables[0], tables[1])
+
     def test_decompile_empty_table(self):
         font = TTFont()
         glyphNames = [".notdef", "space"]
@@ -5,6 +5,7 @@ from fontTools.pens.recordingPen import (
     RecordingPen,
     RecordingPointPen,
     DecomposingRecordingPen,
+    DecomposingRecordingPointPen,
 )
 from fontTools.misc.roundTools import otRound
 from fontTools.misc.transform import DecomposedTransform
@@ -673,3 +674,68 @@ class TTGlyphSetTest(object):
         glyphset["four"].drawPoints(pen)
         print(pen.value)
         assert pen.value == expectedPoints
+
+    @pytest.mark.parametrize(
+        "fontfile, location",
+        [
+            ("I.ttf", None),
+            ("I.ttf", {"wght": 700}),
+            ("I.otf", None),
+            ("I.otf", {"wght": 700}),
+            ("varc-ac00-ac01.ttf", None),
+            ("varc-ac00-ac01.ttf", {"wght": 600}),
+        ],
+    )
+    def test_outline_cache(self, fontfile, location):
+        font = TTFont(self.getpath(fontfile))
+        glyphset = font.getGlyphSet(location=location)
+        cache = ttGlyphSet.GlyphOutlineCache()
+        cachedGlyphset = font.getGlyphSet(location=location, outlineCache=cache)
+
+        for _ in range(2):
+            for glyphName in glyphset.keys():
+                glyph = glyphset[glyphName]
+                for draw, penClass in (
+                    ("draw", DecomposingRecordingPen),
+                    ("drawPoints", DecomposingRecordingPointPen),
+                ):
+                    expected = penClass(glyphset)
+                    getattr(glyph, draw)(expected)
+                    cachedGlyph = cachedGlyphset[glyphName]
+                    actual = penClass(cachedGlyphset)
+                    getattr(cachedGlyph, draw)(actual)
+                    assert actual.value == expected.value
+                    assert (cachedGlyph.width, cachedGlyph.lsb) == (
+                        glyph.width,
+                        glyph.lsb,
+                    )
+
+        assert cache.hits
+        assert cache.misses
+        assert len(cache) and cache.size
+        assert not cache.evictions
+
+    def test_outline_cache_varComponents(self):
+        # pens that support VarComponents are not served from the cache
+        font = TTFont(self.getpath("varc-ac00-ac01.ttf"))
+        cache = ttGlyphSet.GlyphOutlineCache()
+        glyphset = font.getGlyphSet(outlineCache=cache)
+
+        for _ in range(2):
+            pen = RecordingPen()
+            glyphset["uniAC00"].draw(pen)
+            assert {op for op, _ in pen.value} == {"addVarComponent"}
+        assert not cache.hits and not cache.misses
+
+    def test_outline_cache_eviction(self):
+        font = TTFont(self.getpath("varc-ac00-ac01.ttf"))
+        cache = ttGlyphSet.GlyphOutlineCache(maxSize=2000)
+        glyphset = font.getGlyphSet(outlineCache=cache)
+
+        for glyphName in glyphset.keys():
+            glyphset[glyphName].draw(DecomposingRecordingPen(glyphset))
+        assert cache.evictions
+        assert 0 < cache.size <= cache.maxSize
+
+        cache.clear()
+        assert len(cache) == 0 and cache.size == 0
@@ -0,0 +1,56 @@
+from fontTools.ttLib import TTLibError
+from fontTools.ttLib.woff2Triplets import decodeTriplets, encodeTriplets
+import itertools
+import random
+import pytest
+
+# deltas around each boundary between the triplet encodings
+DELTAS = [0, 1, 63, 64, 65, 767, 768, 769, 1279, 1280, 4095, 4096, 65535]
+DELTAS += [-d for d in DELTAS if d]
+
+
+def _absolute(deltas):
+    return list(itertools.accumulate(deltas))
+
+
+@pytest.mark.parametrize("onCurve", [0, 1])
+def test_roundtrip_all_encodings(onCurve):
+    deltas = [d for dx in DELTAS for dy in DELTAS for d in (dx, dy)]
+    coordinates = _absolute(deltas[0::2]), _absolute(deltas[1::2])
+    coordinates = [v for point in zip(*coordinates) for v in point]
+    onCurves = [onCurve] * (len(coordinates) // 2)
+
+    flags, data = encodeTriplets(coordinates, onCurves)
+    decoded, decodedOnCurves, size = decodeTriplets(flags, data, len(onCurves))
+
+    assert list(decoded) == coordinates
+    assert list(decodedOnCurves) == onCurves
+    assert size == len(data)
+
+
+def test_roundtrip_random():
+    rnd = random.Random(0)
+    nPoints = 1000
+    coordinates = [rnd.randint(-5000, 5000) for _ in range(2 * nPoints)]
+    # only bit 0 of the 'glyf' flags is used
+    onCurves = [rnd.choice([0, 1, 0x40, 0x41]) for _ in range(nPoints)]
+
+    flags, data = encodeTriplets(coordinates, onCurves)
+    decoded, decodedOnCurves, size = decodeTriplets(flags, data + b"\0", nPoints)
+
+    assert list(decoded) == coordinates
+    assert list(decodedOnCurves) == [flag & 1 for flag in onCurves]
+    assert size == len(data)
+
+
+def test_decode_not_enough_data():
+    flags, data = encodeTriplets([5000, 5000, 0, 0], [1, 1])
+    with pytest.raises(TTLibError, match="not enough 'flagStream' data"):
+        decodeTriplets(flags, data, 3)
+    with pytest.raises(TTLibError, match="not enough 'glyphStream' data"):
+        decodeTriplets(flags, data[:-1], 2)
+
+
+def test_encode_wrong_number_of_coordinates():
+    with pytest.raises(ValueError):
+        encodeTriplets([0, 0, 0], [1, 1])
@@ -22,14 +22,18 @@ from fontTools.ttLib.woff2 import (
     unpackBase128,
     unpack255UShort,
     pack255UShort,
+    BROTLI_QUALITY,
+    BROTLI_WINDOW,
 )
 import unittest
 from fontTools.misc import sstruct
+from fontTools.misc.loggingTools import CapturingLogHandler
 from fontTools.misc.textTools import Tag, bytechr, byteord
 from fontTools import fontBuilder
 from fontTools.pens.ttGlyphPen import TTGlyphPen
 from fontTools.pens.recordingPen import RecordingPen
 from io import BytesIO
+import logging
 import struct
 import os
 import random
@@ -152,6 +156,15 @@ class WOFF2ReaderTest(unittest.TestCase):
         with self.assertRaisesRegex(ttLib.TTLibError, "transform for table .* unknown"):
             reader.reconstructTable("head")
 
+    def test_lazy_decompress(self):
+        reader = WOFF2Reader(BytesIO(self.file.getvalue()))
+        lazyReader = WOFF2Reader(self.file, lazy=True)
+        for tag in reversed(lazyReader.keys()):
+            self.assertEqual(lazyReader[tag], reader[tag])
+        self.assertEqual(
+            lazyReader.transformBuffer.getvalue(), reader.transformBuffer.getvalue()
+        )
+
 
 class WOFF2ReaderTTFTest(WOFF2ReaderTest):
     """Tests specific to TT-flavored fonts."""
@@ -185,6 +198,17 @@ class WOFF2ReaderTTFTest(WOFF2ReaderTest):
         ):
             reader.reconstructTable("loca")
 
+    def test_lazy_glyf(self):
+        font = ttLib.TTFont(self.file, lazy=True)
+        glyfTable = font["glyf"]
+        self.assertIsInstance(glyfTable, WOFF2GlyfTable)
+        expected = self.font["glyf"]
+        for glyphName in reversed(font.getGlyphOrder()):
+            self.assertEqual(
+                glyfTable[glyphName].compile(glyfTable),
+                expected[glyphName].compile(expected),
+            )
+
 
 def normalise_table(font, tag, padding=4):
     """Return normalised table data. Keep 'font' instance unmodified."""
@@ -446,6 +470,25 @@ class WOFF2FlavorDataTest(unittest.TestCase):
         with self.assertRaisesRegex(ValueError, msg):
             WOFF2FlavorData(transformedTables={"loca"})
 
+    def test_brotli_options(self):
+        flavorData = WOFF2FlavorData()
+        self.assertEqual(flavorData.brotliQuality, BROTLI_QUALITY)
+        self.assertEqual(flavorData.brotliWindow, BROTLI_WINDOW)
+
+        flavorData = WOFF2FlavorData(brotliQuality=4, brotliWindow=16)
+        self.assertEqual(flavorData.brotliQuality, 4)
+        self.assertEqual(flavorData.brotliWindow, 16)
+
+        # copied from 'data', unless overridden
+        flavorData = WOFF2FlavorData(data=flavorData, brotliQuality=5)
+        self.assertEqual(flavorData.brotliQuality, 5)
+        self.assertEqual(flavorData.brotliWindow, 16)
+
+        with self.assertRaisesRegex(ValueError, "brotliQuality"):
+            WOFF2FlavorData(brotliQuality=12)
+        with self.assertRaisesRegex(ValueError, "brotliWindow"):
+            WOFF2FlavorData(brotliWindow=25)
+
 
 class WOFF2WriterTest(unittest.TestCase):
     @classmethod
@@ -495,6 +538,30 @@ class WOFF2WriterTest(unittest.TestCase):
         with self.assertRaisesRegex(ttLib.TTLibError, "missing required table"):
             font.save(BytesIO())
 
+    def test_brotli_options(self):
+        sizes = {}
+        tables = {}
+        for quality in (0, 11):
+            font = ttLib.TTFont(BytesIO(self.file.getvalue()))
+            font.flavorData = WOFF2FlavorData(
+                data=font.flavorData, brotliQuality=quality, brotliWindow=10
+            )
+            buf = BytesIO()
+            font.save(buf)
+            sizes[quality] = len(buf.getvalue())
+            buf.seek(0)
+            font = ttLib.TTFont(buf)
+            tables[quality] = {tag: font.getTableData(tag) for tag in font.keys()[1:]}
+        self.assertLess(sizes[11], sizes[0])
+        self.assertEqual(tables[0], tables[11])
+
+    def test_encode_timings_logged(self):
+        font = ttLib.TTFont(BytesIO(self.file.getvalue()))
+        with CapturingLogHandler("fontTools.ttLib.woff2.timer", "DEBUG") as captor:
+            font.save(BytesIO())
+        captor.assertRegex("to transform tables")
+        captor.assertRegex(r"to compress font data \(brotli quality=11, window=22\)")
+
     def test_head_transform_flag(self):
         headData = self.font.getTableData("head")
         origFlags = byteord(headData[16])
@@ -801,6 +868,15 @@ class WOFF2GlyfTableTest(unittest.TestCase):
         data = glyfTable.compile(self.font)
         self.assertEqual(self.tables["glyf"], data)
 
+    def test_reconstruct_glyf_lazy(self):
+        glyfTable = WOFF2GlyfTable()
+        glyfTable.reconstruct(self.transformedGlyfData, self.font, lazy=True)
+        glyphOrder = self.font.getGlyphOrder()
+        # glyphs can be decoded in any order
+        glyfTable[glyphOrder[-1]]
+        data = glyfTable.compile(self.font)
+        self.assertEqual(self.tables["glyf"], data)
+
     def test_reconstruct_glyf_incorrect_glyphOrder(self):
         glyfTable = WOFF2GlyfTable()
         badGlyphOrder = self.font.getGlyphOrder()[:-1]
@@ -862,6 +938,21 @@ class WOFF2GlyfTableTest(unittest.TestCase):
         data = glyfTable.transform(self.font)
         self.assertEqual(self.transformedGlyfData, data)
 
+    def test_transform_glyf_rounds_coordinates(self):
+        glyfTable = self.font["glyf"]
+        glyphName = next(
+            name
+            for name in self.font.getGlyphOrder()
+            if glyfTable[name].numberOfContours > 0
+        )
+        glyph = glyfTable[glyphName]
+        expected = glyph.coordinates.copy()
+        glyph.coordinates[0] = (expected[0][0] + 0.4, expected[0][1] - 0.4)
+        transformedData = glyfTable.transform(self.font)
+        newGlyfTable = WOFF2GlyfTable()
+        newGlyfTable.reconstruct(transformedData, self.font)
+        self.assertEqual(newGlyfTable[glyphName].coordinates, expected)
+
     def test_roundtrip_glyf_reconstruct_and_transform(self):
         glyfTable = WOFF2GlyfTable()
         glyfTable.reconstruct(self.transformedGlyfData, self.font)
@@ -1274,6 +1365,11 @@ class WOFF2RoundtripTest(object):
         assert ttFont2["glyf"]["A"].flags[0] & _g_l_y_f.flagOverlapSimple != 0
 
 
+def _crashingCompressFile(input_file, output_file, **kwargs):
+    # simulate a worker process killed by the OS, e.g. when out of memory
+    os._exit(1)
+
+
 class MainTest(object):
     @staticmethod
     def make_ttf(tmpdir):
@@ -1352,6 +1448,146 @@ class MainTest(object):
         assert new_woff2_font.flavorData.transformedTables == {"glyf", "loca", "hmtx"}
         assert new_woff2_font.flavorData.privData == b"FOOBAR"
 
+    @pytest.mark.parametrize("jobs", [1, 2, 0])
+    def test_compress_many(self, tmpdir, caplog, jobs):
+        input_files = []
+        for i in range(3):
+            ttFont = ttLib.TTFont(recalcBBoxes=False, recalcTimestamp=False)
+            ttFont.importXML(TTX)
+            input_files.append(str(tmpdir / f"TestTTF-{i}.ttf"))
+            ttFont.save(input_files[-1])
+        output_dir = tmpdir / "output"
+        output_dir.mkdir()
+
+        with caplog.at_level(logging.INFO, logger="fontTools.ttLib.woff2"):
+            assert (
+                woff2.main(
+                    ["compress", "-j", str(jobs), "-d", str(output_dir)] + input_files
+                )
+                is None
+            )
+
+        for i in range(3):
+            output_file = output_dir / f"TestTTF-{i}.woff2"
+            assert output_file.check(file=True)
+            assert ttLib.TTFont(str(output_file)).flavor == "woff2"
+        assert "Compressed 3 files" in caplog.text
+
+    def test_compress_woff(self, tmpdir):
+        input_file = self.make_ttf(tmpdir)
+
+        assert woff2.main(["compress", "--flavor", "woff", input_file]) is None
+
+        output_file = tmpdir / "TestTTF-Regular.woff"
+        assert output_file.check(file=True)
+        assert ttLib.TTFont(str(output_file)).flavor == "woff"
+
+    def test_compress_fast(self, tmpdir):
+        input_file = self.make_ttf(tmpdir)
+        output_file = tmpdir / "TestTTF-Regular.woff2"
+
+        assert woff2.main(["compress", "--fast", input_file]) is None
+
+        font = ttLib.TTFont(str(output_file))
+        assert font.flavorData.transformedTables == set()
+        assert font.getTableData("glyf") == ttLib.TTFont(input_file).getTableData(
+            "glyf"
+        )
+
+    def test_compress_brotli_options(self, tmpdir):
+        input_file = self.make_ttf(tmpdir)
+        output_file = tmpdir / "TestTTF-Regular.woff2"
+
+        assert (
+            woff2.main(["compress", "--quality", "1", "--window", "16", input_file])
+            is None
+        )
+        assert output_file.check(file=True)
+
+        with pytest.raises(SystemExit):
+            woff2.main(["compress", "--quality", "12", input_file])
+
+    def test_compress_many_output_file(self, tmpdir):
+        input_file = self.make_ttf(tmpdir)
+
+        with pytest.raises(SystemExit):
+            woff2.main(["compress", "-o", "out.woff2", input_file, input_file])
+
+    def test_compress_many_duplicate_output_files(self, tmpdir):
+        input_files = []
+        for name in ("a", "b"):
+            (tmpdir / name).mkdir()
+            ttFont = ttLib.TTFont(recalcBBoxes=False, recalcTimestamp=False)
+            ttFont.importXML(TTX)
+            input_files.append(str(tmpdir / name / "TestTTF.ttf"))
+            ttFont.save(input_files[-1])
+        output_dir = tmpdir / "output"
+        output_dir.mkdir()
+
+        with pytest.raises(ValueError, match="duplicate output file"):
+            woff2.compress_many(
+                input_files,
+                [str(output_dir / "out.woff2"), str(output_dir / "out.woff2")],
+                jobs=2,
+            )
+        # the output files are named after the inputs' basenames
+        with pytest.raises(SystemExit):
+            woff2.main(["compress", "-j", "2", "-d", str(output_dir)] + input_files)
+        assert output_dir.listdir() == []
+
+    def test_compress_many_skips_errors(self, tmpdir):
+        input_file = self.make_ttf(tmpdir)
+        bad_file = tmpdir / "Bad.ttf"
+        bad_file.write_binary(b"\0" * 12)
+
+        results = woff2.compress_many(
+            [str(bad_file), input_file],
+            [str(tmpdir / "Bad.woff2"), str(tmpdir / "Good.woff2")],
+        )
+
+        assert [r[0] for r in results] == [input_file]
+        assert (tmpdir / "Good.woff2").check(file=True)
+
+    @pytest.mark.parametrize("jobs", [1, 2])
+    def test_compress_many_skips_corrupt_font(self, tmpdir, caplog, jobs):
+        input_file = self.make_ttf(tmpdir)
+        # a font with garbage in its glyf table
+        with open(input_file, "rb") as f:
+            reader = ttLib.sfnt.SFNTReader(f)
+            tables = {tag: reader[tag] for tag in reader.keys()}
+        tables["glyf"] = random.Random(0).randbytes(len(tables["glyf"]))
+        corrupt_file = str(tmpdir / "Corrupt.ttf")
+        with open(corrupt_file, "wb") as f:
+            writer = ttLib.sfnt.SFNTWriter(f, len(tables), reader.sfntVersion)
+            for tag, data in tables.items():
+                writer[tag] = data
+            writer.close()
+
+        with caplog.at_level(logging.ERROR, logger="fontTools.ttLib.woff2"):
+            results = woff2.compress_many(
+                [corrupt_file, input_file],
+                [str(tmpdir / "Corrupt.woff2"), str(tmpdir / "Good.woff2")],
+                jobs=jobs,
+            )
+
+        assert [r[0] for r in results] == [input_file]
+        assert (tmpdir / "Good.woff2").check(file=True)
+        assert "Failed to compress %s" % corrupt_file in caplog.text
+        assert "Failed to compress 1 files" in caplog.text
+
+    def test_compress_many_broken_process_pool(self, tmpdir, caplog, monkeypatch):
+        monkeypatch.setattr(woff2, "_compressFile", _crashingCompressFile)
+        input_file = self.make_ttf(tmpdir)
+        # more fonts than compress_many submits at once
+        input_files = [input_file] * 6
+        output_files = [str(tmpdir / f"TestTTF-{i}.woff2") for i in range(6)]
+
+        with caplog.at_level(logging.ERROR, logger="fontTools.ttLib.woff2"):
+            results = woff2.compress_many(input_files, output_files, jobs=2)
+
+        assert results == []
+        assert "Failed to compress 6 files" in caplog.text
+
     def test_decompress_ttf(self, tmpdir):
         input_file = tmpdir / "TestTTF-Regular.woff2"
         input_file.write_binary(TT_WOFF2.getvalue())
@@ -1,9 +1,11 @@
 import os
 import sys
+import zipfile
 
 import pytest
 
 from fontTools.misc import filesystem as fs
+from fontTools.misc.filesystem._zipfs import ReadZipFS
 from fontTools.misc.textTools import tostr
 from fontTools.ufoLib import UFOFileStructure, UFOReader, UFOWriter, haveFS
 
@@ -63,6 +65,79 @@ class TestUFOZ:
         with UFOReader(testufoz) as reader:
             assert reader.readLib() == {"hello world": 123}
 
+    @pytest.mark.parametrize("exists", [False, True])
+    def test_write_stored(self, tmp_path, testufoz, exists):
+        path = testufoz if exists else str(tmp_path / "test.ufoz")
+        with UFOWriter(
+            path, structure=UFOFileStructure.ZIP, compression=zipfile.ZIP_STORED
+        ) as writer:
+            writer.writeLib({"hello world": 123})
+        with zipfile.ZipFile(path) as zf:
+            assert {info.compress_type for info in zf.infolist()} == {
+                zipfile.ZIP_STORED
+            }
+        with UFOReader(path) as reader:
+            assert reader.readLib() == {"hello world": 123}
+
+
+class TestReadZipFS:
+    @pytest.fixture
+    def zipfs(self, tmp_path):
+        path = tmp_path / "test.zip"
+        with zipfile.ZipFile(path, "w") as zf:
+            zf.writestr("root/", b"")
+            zf.writestr("root/a.txt", b"a" * 1000, zipfile.ZIP_DEFLATED)
+            zf.writestr("root/sub/b.txt", b"b", zipfile.ZIP_STORED)
+            zf.writestr("c.txt", b"c" * 1000, zipfile.ZIP_BZIP2)
+        with ReadZipFS(path) as zipfs:
+            yield zipfs
+
+    def test_index(self, zipfs):
+        assert sorted(zipfs.listdir("/")) == ["c.txt", "root"]
+        assert zipfs.listdir("root") == ["a.txt", "sub"]
+        assert zipfs.listdir("/root/sub/") == ["b.txt"]
+        assert zipfs.isdir("root/sub") and not zipfs.isfile("root/sub")
+        assert zipfs.isfile("root/sub/b.txt") and not zipfs.isdir("root/sub/b.txt")
+        assert not zipfs.exists("root/missing.txt")
+        with pytest.raises(fs.errors.ResourceNotFound):
+            zipfs.listdir("missing")
+        with pytest.raises(fs.errors.DirectoryExpected):
+            zipfs.listdir("c.txt")
+        with pytest.raises(fs.errors.ResourceNotFound):
+            zipfs.getinfo("missing")
+
+        info = zipfs.getinfo("root/a.txt", namespaces=["details"])
+        assert info.name == "a.txt" and not info.is_dir and info.size == 1000
+        assert zipfs.getinfo("root/sub").is_dir
+
+    def test_readbytes(self, zipfs):
+        assert zipfs.readbytes("root/a.txt") == b"a" * 1000
+        assert zipfs.opendir("root").readbytes("sub/b.txt") == b"b"
+        # other compression methods are read by the zipfile module
+        assert zipfs.readbytes("c.txt") == b"c" * 1000
+        with zipfs.open("root/a.txt") as f:
+            assert f.read() == b"a" * 1000
+        with pytest.raises(fs.errors.ResourceNotFound):
+            zipfs.readbytes("root")
+
+    def test_readbytes_concurrent(self, zipfs):
+        from concurrent.futures import ThreadPoolExecutor
+
+        paths = ["root/a.txt", "root/sub/b.txt", "c.txt"] * 100
+        with ThreadPoolExecutor(4) as executor:
+            results = list(executor.map(zipfs.readbytes, paths))
+        assert results == [zipfs.readbytes(path) for path in paths]
+
+    def test_readbytes_bad_crc(self, tmp_path):
+        path = tmp_path / "test.zip"
+        with zipfile.ZipFile(path, "w") as zf:
+            zf.writestr("a.txt", b"hello", zipfile.ZIP_STORED)
+        data = path.read_bytes()
+        path.write_bytes(data.replace(b"hello", b"jello"))
+        with ReadZipFS(path) as zipfs:
+            with pytest.raises(zipfile.BadZipFile, match="Bad CRC-32"):
+                zipfs.readbytes("a.txt")
+
 
 def test_pathlike(testufo):
     class PathLike:
@@ -3,6 +3,7 @@ import os
 import shutil
 import tempfile
 import unittest
+import warnings
 from io import open
 from pathlib import Path
 
@@ -16,7 +17,9 @@ from fontTools.ufoLib.errors import (
     UnsupportedUFOFormat,
 )
 from fontTools.ufoLib.glifLib import (
+    GLIFFormatVersion,
     GlyphSet,
+    _readGlyphFromStringFast,
     glyphNameToFileName,
     readGlyphFromString,
     writeGlyphToString,
@@ -414,3 +417,368 @@ def test_readGlyphFromString_with_pointPen_and_no_glyphObject():
     assert "beginPath" in operations
     assert "addPoint" in operations
     assert "endPath" in operations
+
+
+def _readAllGlyphs(gs):
+    glyphs = {}
+    for glyphName in gs.keys():
+        glyph, pen = _Glyph(), RecordingPointPen()
+        gs.readGlyph(glyphName, glyph, pen)
+        glyphs[glyphName] = (glyph.__dict__, pen.value)
+    return glyphs
+
+
+def _readGlyphs(gs, **kwargs):
+    glyphs = {glyphName: _Glyph() for glyphName in gs.keys()}
+    pens = {glyphName: RecordingPointPen() for glyphName in gs.keys()}
+    gs.readGlyphs(glyphObjects=glyphs, pointPens=pens, **kwargs)
+    return {
+        glyphName: (glyphs[glyphName].__dict__, pens[glyphName].value)
+        for glyphName in gs.keys()
+    }
+
+
+@pytest.mark.parametrize("maxWorkers", [1, 4, None])
+def test_readGlyphs(maxWorkers):
+    gs = GlyphSet(GLYPHSETDIR)
+    assert _readGlyphs(gs, maxWorkers=maxWorkers) == _readAllGlyphs(gs)
+
+
+def test_readGlyphs_subset():
+    gs = GlyphSet(GLYPHSETDIR)
+    pen = RecordingPointPen()
+    # glyphs without glyph object or pen are only parsed
+    gs.readGlyphs(["a", "A"], pointPens={"A": pen})
+
+    expected = RecordingPointPen()
+    gs.readGlyph("A", pointPen=expected)
+    assert pen.value == expected.value
+
+
+def test_readGlyphs_cache(tmp_path):
+    shutil.copytree(GLYPHSETDIR, tmp_path / "glyphs")
+    gs = GlyphSet(tmp_path / "glyphs")
+    expected = _readAllGlyphs(gs)
+    cache = {}
+
+    assert _readGlyphs(gs, cache=cache) == expected
+    assert len(cache) == len(gs)
+    assert _readGlyphs(gs, cache=cache) == expected
+
+    # cached values are not shared with the glyph objects
+    glyph = _Glyph()
+    gs.readGlyphs(["A"], glyphObjects={"A": glyph}, cache=cache)
+    glyph.anchors.clear()
+    assert _readGlyphs(gs, cache=cache) == expected
+
+    # modified glyphs are parsed again
+    path = os.path.join(gs.fs.getsyspath("/"), gs.contents["A"])
+    glyph = _Glyph()
+    gs.readGlyph("A", glyph)
+    glyph.width = 1234
+    gs.writeGlyph("A", glyph)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000))
+    glyph = _Glyph()
+    gs.readGlyphs(["A"], glyphObjects={"A": glyph}, cache=cache)
+    assert glyph.width == 1234
+
+
+class _OldStylePointPen:
+    # a pen predating the identifier arguments of the point pen protocol
+    def __init__(self):
+        self.value = []
+
+    def beginPath(self):
+        self.value.append(("beginPath",))
+
+    def endPath(self):
+        self.value.append(("endPath",))
+
+    def addPoint(self, pt, segmentType=None, smooth=False, name=None):
+        self.value.append(("addPoint", pt, segmentType, smooth, name))
+
+    def addComponent(self, baseGlyphName, transformation):
+        self.value.append(("addComponent", baseGlyphName, transformation))
+
+
+def test_readGlyphs_cache_old_style_pen(tmp_path):
+    shutil.copytree(GLYPHSETDIR, tmp_path / "glyphs")
+    gs = GlyphSet(tmp_path / "glyphs")
+
+    def drawPoints(pen):
+        pen.beginPath(identifier="contour1")
+        pen.addPoint((0, 0), "line", identifier="point1")
+        pen.addPoint((100, 0), "line")
+        pen.addPoint((100, 100), "line")
+        pen.endPath()
+        pen.addComponent("A", (1, 0, 0, 1, 0, 0), identifier="component1")
+
+    gs.writeGlyph("identifiers", _Glyph(), drawPoints, formatVersion=2)
+
+    expected = {}
+    for glyphName in gs.keys():
+        pen = expected[glyphName] = _OldStylePointPen()
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", DeprecationWarning)
+            gs.readGlyph(glyphName, pointPen=pen)
+
+    cache = {}
+    for _ in range(2):
+        pens = {glyphName: _OldStylePointPen() for glyphName in gs.keys()}
+        with pytest.warns(DeprecationWarning, match="identifier"):
+            gs.readGlyphs(pointPens=pens, cache=cache)
+        assert {k: pen.value for k, pen in pens.items()} == {
+            k: pen.value for k, pen in expected.items()
+        }
+
+    # glyphs without identifiers are drawn without warnings
+    pen = _OldStylePointPen()
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        gs.readGlyphs(["A"], pointPens={"A": pen}, cache=cache)
+    assert pen.value == expected["A"].value
+
+
+def test_readGlyphs_cache_shelve(tmp_path):
+    import shelve
+
+    gs = GlyphSet(GLYPHSETDIR)
+    expected = _readAllGlyphs(gs)
+    with shelve.open(str(tmp_path / "cache")) as cache:
+        assert _readGlyphs(gs, cache=cache) == expected
+    with shelve.open(str(tmp_path / "cache")) as cache:
+        assert len(cache) == len(gs)
+        assert _readGlyphs(gs, cache=cache) == expected
+
+
+def test_readGlyphs_cache_validate():
+    gs = GlyphSet(GLYPHSETDIR, validateRead=False)
+    cache = {}
+    gs.readGlyphs(["A"], cache=cache)
+    (key,) = cache
+    cacheKey, validated, data = cache[key]
+    assert not validated
+
+    # data cached without validation is parsed again when validating
+    cache[key] = (cacheKey, validated, ([("width", -1)], []))
+    glyph = _Glyph()
+    gs.readGlyphs(["A"], glyphObjects={"A": glyph}, validate=True, cache=cache)
+    assert glyph.width != -1
+    assert cache[key][1]
+
+
+def test_readGlyphs_error_location(tmp_path):
+    shutil.copytree(GLYPHSETDIR, tmp_path / "glyphs")
+    gs = GlyphSet(tmp_path / "glyphs")
+    path = os.path.join(gs.fs.getsyspath("/"), gs.contents["A"])
+    with open(path, "w") as f:
+        f.write("<glyph name='A' format='2'>")
+
+    with pytest.raises(GlifLibError) as exc_info:
+        gs.readGlyphs(maxWorkers=2)
+    assert "The issue is in glyph 'A'" in str(exc_info.value)
+
+
+def _readGlyphFromTree(aString, glyph, pen):
+    from fontTools.ufoLib.glifLib import _glifTreeFromString, _readGlyphFromTree
+
+    _readGlyphFromTree(
+        _glifTreeFromString(aString),
+        glyph,
+        pen,
+        formatVersions=GLIFFormatVersion.supported_versions(),
+        validate=False,
+    )
+
+
+def test_readGlyphFromStringFast():
+    # the demo font glyphs are GLIF format 1
+    path = os.path.join(os.path.dirname(__file__), "testdata", "TestFont1 (UFO3).ufo")
+    gs = GlyphSet(os.path.join(path, "glyphs"))
+    for glyphName in gs.keys():
+        text = gs.getGLIF(glyphName)
+        glyph, pen = _Glyph(), RecordingPointPen()
+        assert _readGlyphFromStringFast(text, glyph, pen)
+        expectedGlyph, expectedPen = _Glyph(), RecordingPointPen()
+        _readGlyphFromTree(text, expectedGlyph, expectedPen)
+        assert glyph.__dict__ == expectedGlyph.__dict__
+        assert pen.value == expectedPen.value
+
+    assert _readGlyphs(gs, validate=False) == _readAllGlyphs(gs)
+
+
+def test_readGlyphFromStringFast_all_elements():
+    s = """<?xml version='1.0' encoding='utf-8'?>
+    <glyph name="a" format="2">
+      <advance width="500.5" height="1000"/>
+      <unicode hex="0061"/>
+      <unicode hex="0041"/>
+      <unicode hex="0061"/>
+      <image fileName="a.png" xOffset="10" color="1,0,0,1"/>
+      <guideline x="1" y="2" angle="45" name="diagonal"/>
+      <anchor x="250" y="0.5" name="bottom"/>
+      <note>
+        line 1
+          line 2
+      </note>
+      <outline>
+        <contour identifier="c0">
+          <point x="0" y="0" type="move" name="start"/>
+          <point x="10.5" y="20" type="line" smooth="yes" identifier="p1"/>
+          <point x="30" y="40"/>
+          <point x="50" y="60" type="offcurve"/>
+          <point x="70" y="0" type="curve"/>
+        </contour>
+        <contour/>
+        <component base="b" xScale="0.5" yOffset="-10" identifier="c1"/>
+      </outline>
+      <lib>
+        <dict>
+          <key>com.example.list</key>
+          <array>
+            <integer>1</integer>
+            <string>two</string>
+          </array>
+          <key>com.example.flag</key>
+          <true/>
+        </dict>
+      </lib>
+    </glyph>
+    """
+    for withGlyph, withPen in [(True, True), (True, False), (False, True)]:
+        glyph = _Glyph() if withGlyph else None
+        pen = RecordingPointPen() if withPen else None
+        assert _readGlyphFromStringFast(s, glyph, pen)
+        expectedGlyph = _Glyph() if withGlyph else None
+        expectedPen = RecordingPointPen() if withPen else None
+        _readGlyphFromTree(s, expectedGlyph, expectedPen)
+        if withGlyph:
+            assert glyph.__dict__ == expectedGlyph.__dict__
+        if withPen:
+            assert pen.value == expectedPen.value
+
+    glyph = _Glyph()
+    readGlyphFromString(s, glyph, validate=False)
+    assert glyph.unicodes == [0x61, 0x41]
+    assert glyph.note == "line 1\nline 2"
+    assert glyph.lib == {"com.example.list": [1, "two"], "com.example.flag": True}
+
+
+def test_readGlyphFromStringFast_fallback():
+    s = """<?xml version='1.0' encoding='utf-8'?>
+    <glyph name="A" format="1">
+      <advance width="500"/>
+    </glyph>
+    """
+    glyph = _Glyph()
+    assert not _readGlyphFromStringFast(s, glyph)
+    assert not glyph.__dict__
+
+    # GLIF format 1 is read with the element tree based reader
+    readGlyphFromString(s, glyph, validate=False)
+    assert glyph.width == 500
+
+    s = s.replace('format="1"', 'format="2"')
+    assert not _readGlyphFromStringFast(
+        s, glyph, formatVersions={GLIFFormatVersion.FORMAT_1_0}
+    )
+
+
+@pytest.mark.parametrize(
+    "s, message",
+    [
+        ("<glyph format='2'><advance></glyph>", "GLIF contains invalid XML"),
+        ("<glyph format='2'>text<advance/></glyph>", "Invalid GLIF structure"),
+        ("<glyph format='2'><foo/></glyph>", "Unknown element in GLIF: foo"),
+        (
+            "<glyph format='2'><outline><foo/></outline></glyph>",
+            "Unknown element in outline element: foo",
+        ),
+        (
+            "<glyph format='2'><outline><contour><foo/></contour></outline></glyph>",
+            "Unknown child element",
+        ),
+        (
+            "<glyph format='2'><outline><contour><point y='0'/></contour></outline></glyph>",
+            "Required x attribute",
+        ),
+    ],
+)
+def test_readGlyphFromStringFast_errors(s, message):
+    with pytest.raises(GlifLibError, match=message):
+        _readGlyphFromStringFast(s, _Glyph(), RecordingPointPen())
+    with pytest.raises(GlifLibError, match=message):
+        readGlyphFromString(s, _Glyph(), RecordingPointPen(), validate=False)
+
+
+def _readGlyphsForWriting(path):
+    gs = GlyphSet(path)
+    glyphs = {glyphName: _Glyph() for glyphName in gs.keys()}
+    pens = {glyphName: RecordingPointPen() for glyphName in gs.keys()}
+    gs.readGlyphs(glyphObjects=glyphs, pointPens=pens)
+    return glyphs, {glyphName: pen.replay for glyphName, pen in pens.items()}
+
+
+def _readGlifs(path):
+    return {fileName: (path / fileName).read_bytes() for fileName in os.listdir(path)}
+
+
+@pytest.mark.parametrize("maxWorkers", [1, 4])
+def test_writeGlyphs(tmp_path, maxWorkers):
+    glyphs, drawPointsFuncs = _readGlyphsForWriting(GLYPHSETDIR)
+    (tmp_path / "expected").mkdir()
+    (tmp_path / "glyphs").mkdir()
+    gs = GlyphSet(tmp_path / "expected")
+    for glyphName, glyph in glyphs.items():
+        gs.writeGlyph(glyphName, glyph, drawPointsFuncs[glyphName])
+    gs.writeContents()
+
+    gs = GlyphSet(tmp_path / "glyphs")
+    written = gs.writeGlyphs(glyphs, drawPointsFuncs, maxWorkers=maxWorkers)
+
+    assert written == list(glyphs)
+    assert _readGlifs(tmp_path / "glyphs") == _readGlifs(tmp_path / "expected")
+
+
+def test_writeGlyphs_manifest(tmp_path):
+    glyphs, drawPointsFuncs = _readGlyphsForWriting(GLYPHSETDIR)
+    gs = GlyphSet(tmp_path)
+    assert gs.writeGlyphs(glyphs, drawPointsFuncs) == list(glyphs)
+
+    # unchanged glyphs are not written, nor read back
+    def readbytes(fileName):
+        assert fileName == "contents.plist"
+        return originalReadbytes(fileName)
+
+    originalReadbytes = gs.fs.readbytes
+    gs.fs.readbytes = readbytes
+    assert gs.writeGlyphs(glyphs, drawPointsFuncs) == []
+    glyphs["A"].width += 1
+    assert gs.writeGlyphs(glyphs, drawPointsFuncs) == ["A"]
+    del gs.fs.readbytes
+
+    # files modified by other means are compared with the new data again
+    path = tmp_path / gs.contents["a"]
+    data = path.read_bytes()
+    path.write_bytes(b"")
+    assert gs.writeGlyphs(glyphs, drawPointsFuncs) == ["a"]
+    assert path.read_bytes() == data
+
+
+def test_writeGlyphs_manifest_shelve(tmp_path):
+    import shelve
+
+    glyphs, drawPointsFuncs = _readGlyphsForWriting(GLYPHSETDIR)
+    (tmp_path / "glyphs").mkdir()
+    with shelve.open(str(tmp_path / "manifest")) as manifest:
+        gs = GlyphSet(tmp_path / "glyphs")
+        gs.writeGlyphs(glyphs, drawPointsFuncs, manifest=manifest)
+    with shelve.open(str(tmp_path / "manifest")) as manifest:
+        assert len(manifest) == len(glyphs)
+        gs = GlyphSet(tmp_path / "glyphs")
+        assert gs.writeGlyphs(glyphs, drawPointsFuncs, manifest=manifest) == []
+
+    # without a manifest, unchanged files are compared but not written
+    gs = GlyphSet(tmp_path / "glyphs")
+    assert gs.writeGlyphs(glyphs, drawPointsFuncs) == []
@@ -1,9 +1,27 @@
+from fontTools.fontBuilder import FontBuilder
+from fontTools.pens.recordingPen import RecordingPointPen
+from fontTools.pens.ttGlyphPen import TTGlyphPen
 from fontTools.ttLib import TTFont
+from fontTools.varLib import interpolatable
+from fontTools.varLib.interpolatable import Glyph, GlyphCache
 from fontTools.varLib.interpolatable import main as interpolatable_main
+from fontTools.varLib.interpolatableHelpers import (
+    matching_costs,
+    min_cost_perfect_bipartite_matching_bruteforce,
+    min_cost_perfect_bipartite_matching_numpy,
+    points_complex_vector,
+    points_complex_vector_numpy,
+    points_complex_vector_python,
+    vdiff_hypot2,
+    vdiff_hypot2_complex,
+    vdiff_hypot2_complex_many,
+)
 import os
+import random
 import shutil
 import sys
 import tempfile
+from types import SimpleNamespace
 import unittest
 import pytest
 
@@ -18,6 +36,17 @@ except ImportError:
     munkres = None
 
 
+class _TestGlyph:
+    def __init__(self, glyph):
+        self.glyph = glyph
+
+    def draw(self, pen):
+        self.glyph.draw(pen, None)
+
+    def drawPoints(self, pen):
+        self.glyph.drawPoints(pen, None)
+
+
 @unittest.skipUnless(scipy or munkres, "scipy or munkres not installed")
 class InterpolatableTest(unittest.TestCase):
     def __init__(self, methodName):
@@ -121,6 +150,139 @@ class InterpolatableTest(unittest.TestCase):
             ],
         )
 
+    def test_interpolatable_cff2_jobs_and_cache(self):
+        suffix = ".otf"
+        ttx_dir = self.get_test_input("variable_ttx_interpolatable_cff2")
+        ttx_path = os.path.abspath(os.path.join(ttx_dir, "interpolatable-test.ttx"))
+
+        self.temp_dir()
+        self.compile_font(ttx_path, suffix, self.tempdir)
+        otf_path = self.get_file_list(self.tempdir, suffix)[0]
+        cache_dir = os.path.join(self.tempdir, "cache")
+
+        expected = interpolatable_main(["--quiet", otf_path])
+        self.assertIn("uni0408", expected)
+
+        # the cache is filled by the first run, and used by the second one;
+        # -j 0 uses the number of CPUs
+        for jobs in ("2", "0"):
+            problems = interpolatable_main(
+                ["--quiet", "-j", jobs, "--cache", cache_dir, otf_path]
+            )
+            self.assertEqual(problems, expected)
+            self.assertEqual(list(problems), list(expected))
+            self.assertTrue(os.listdir(cache_dir))
+
+    def test_glyph_cache(self):
+        self.temp_dir()
+        cache = GlyphCache(os.path.join(self.tempdir, "cache"))
+        glyphset = {}
+        for glyphName, x in (("a", 100), ("b", 200)):
+            pen = TTGlyphPen(None)
+            pen.moveTo((0, 0))
+            pen.lineTo((x, 0))
+            pen.qCurveTo((x, 100), (0, 100))
+            pen.closePath()
+            glyphset[glyphName] = _TestGlyph(pen.glyph())
+
+        key = cache.key(glyphset["a"], glyphset)
+        self.assertIsNotNone(key)
+        self.assertNotEqual(key, cache.key(glyphset["b"], glyphset))
+        self.assertIsNone(cache.get(key))
+
+        glyph = Glyph("a", glyphset, cache)
+        self.assertIsNotNone(cache.get(key))
+        cached = Glyph("a", glyphset, cache)
+        for item in Glyph.CACHED_ITEMS:
+            if item == "recordings":
+                self.assertEqual(
+                    [r.value for r in cached.recordings],
+                    [r.value for r in glyph.recordings],
+                )
+            else:
+                self.assertEqual(getattr(cached, item), getattr(glyph, item))
+
+        # invalid entries are ignored
+        with open(cache._path(key), "wb") as f:
+            f.write(b"garbage")
+        self.assertIsNone(cache.get(key))
+
+    def test_glyph_cache_key_exact_coordinates(self):
+        self.temp_dir()
+        cache = GlyphCache(os.path.join(self.tempdir, "cache"))
+        glyphset = {}
+        for glyphName, x in (("a", 100.0000001), ("b", 100.0000002)):
+            pen = RecordingPointPen()
+            pen.beginPath()
+            pen.addPoint((0, 0), "line")
+            pen.addPoint((x, 0), "line")
+            pen.addPoint((x, 100), "line")
+            pen.endPath()
+            glyphset[glyphName] = SimpleNamespace(drawPoints=pen.replay)
+        for glyphName, baseGlyphName in (("c", "a"), ("d", "b")):
+            pen = RecordingPointPen()
+            pen.addComponent(baseGlyphName, (1, 0, 0, 1, 0, 0))
+            glyphset[glyphName] = SimpleNamespace(drawPoints=pen.replay)
+
+        # coordinates that only differ past HashPointPen's precision, including
+        # those of components, get distinct keys
+        self.assertNotEqual(
+            cache.key(glyphset["a"], glyphset), cache.key(glyphset["b"], glyphset)
+        )
+        self.assertNotEqual(
+            cache.key(glyphset["c"], glyphset), cache.key(glyphset["d"], glyphset)
+        )
+        # a composite has another key than the same outline drawn as contours
+        self.assertNotEqual(
+            cache.key(glyphset["a"], glyphset), cache.key(glyphset["c"], glyphset)
+        )
+
+        pen = RecordingPointPen()
+        pen.addComponent("missing", (1, 0, 0, 1, 0, 0))
+        self.assertIsNone(cache.key(SimpleNamespace(drawPoints=pen.replay), glyphset))
+
+    def test_cache_composite_and_contour_glyphs(self):
+        # "c" is a component of "a" in one master and a copy of its contours
+        # in the other; the two must not share cached data
+        def drawTriangle(pen):
+            pen.moveTo((0, 0))
+            pen.lineTo((100, 0))
+            pen.lineTo((100, 100))
+            pen.closePath()
+
+        glyphsets = []
+        for composite in (True, False):
+            glyphs = {".notdef": TTGlyphPen(None).glyph()}
+            pen = TTGlyphPen(glyphs)
+            drawTriangle(pen)
+            glyphs["a"] = pen.glyph()
+            if composite:
+                pen.addComponent("a", (1, 0, 0, 1, 0, 0))
+            else:
+                drawTriangle(pen)
+            glyphs["c"] = pen.glyph()
+            fb = FontBuilder(1000, isTTF=True)
+            fb.setupGlyphOrder(list(glyphs))
+            fb.setupGlyf(glyphs)
+            fb.setupHorizontalMetrics({glyphName: (500, 0) for glyphName in glyphs})
+            glyphsets.append(fb.font.getGlyphSet())
+
+        def problems(**kwargs):
+            return [
+                (glyphName, problem["type"])
+                for glyphName, problem in interpolatable.test_gen(
+                    glyphsets, glyphs=["a", "c"], **kwargs
+                )
+            ]
+
+        expected = [("c", "node_count")]
+        self.assertEqual(problems(), expected)
+        self.temp_dir()
+        cache_dir = os.path.join(self.tempdir, "cache")
+        # the first run fills the cache, and the second one reads from it
+        self.assertEqual(problems(cache=cache_dir), expected)
+        self.assertEqual(problems(cache=cache_dir), expected)
+
     def test_interpolatable_ufo(self):
         ttx_dir = self.get_test_input("master_ufo")
         ufo_paths = self.get_file_list(ttx_dir, ".ufo", "TestFamily2-")
@@ -289,5 +451,49 @@ class InterpolatableTest(unittest.TestCase):
         interpolatable_main((input_path,))
 
 
+@pytest.mark.parametrize("n", range(7))
+def test_min_cost_perfect_bipartite_matching_numpy(n):
+    pytest.importorskip("numpy")
+    rnd = random.Random(n)
+    for _ in range(20):
+        G = [
+            [rnd.choice([rnd.random(), rnd.randint(0, 3)]) for _ in range(n)]
+            for _ in range(n)
+        ]
+        cols, cost = min_cost_perfect_bipartite_matching_numpy(G)
+        assert sorted(cols) == list(range(n))
+        assert all(type(col) is int for col in cols)
+        _, expected = min_cost_perfect_bipartite_matching_bruteforce(G)
+        assert cost == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("n", [0, 1, 2, 3, 10, 200])
+def test_points_complex_vector_numpy(n):
+    pytest.importorskip("numpy")
+    rnd = random.Random(n)
+    points = [
+        ((rnd.randint(-500, 500), rnd.uniform(-500, 500)), rnd.random() < 0.5)
+        for _ in range(n)
+    ]
+    expected = points_complex_vector_python(points)
+    assert points_complex_vector_numpy(points) == expected
+    assert points_complex_vector(points) == expected
+
+
+def test_vdiff_hypot2_numpy():
+    pytest.importorskip("numpy")
+    rnd = random.Random(0)
+    m0 = [tuple(rnd.random() for _ in range(6)) for _ in range(10)]
+    m1 = [tuple(rnd.random() for _ in range(6)) for _ in range(10)]
+    costs = matching_costs(m0, m1)
+    assert costs == [[pytest.approx(vdiff_hypot2(v0, v1)) for v1 in m1] for v0 in m0]
+
+    v0 = [complex(rnd.random(), rnd.random()) for _ in range(100)]
+    vectors = [[complex(rnd.random(), rnd.random()) for _ in range(100)]] * 3
+    assert vdiff_hypot2_complex_many(v0, vectors) == [
+        pytest.approx(vdiff_hypot2_complex(v0, v1)) for v1 in vectors
+    ]
+
+
 if __name__ == "__main__":
     sys.exit(unittest.main())
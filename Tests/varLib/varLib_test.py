@@ -16,6 +16,7 @@ import fontTools.varLib.errors as varLibErrors
 from fontTools.varLib.models import VariationModel
 from fontTools.varLib.mutator import instantiateVariableFont
 from fontTools.varLib import main as varLib_main, load_masters
+from fontTools import varLib
 from fontTools.varLib import set_default_weight_width_slant
 from fontTools.designspaceLib import (
     AxisDescriptor,
@@ -32,6 +33,7 @@ import shutil
 import sys
 import tempfile
 import unittest
+from unittest.mock import patch
 import pytest
 
 
@@ -636,6 +638,25 @@ class BuildTest(unittest.TestCase):
         self.assertTrue(os.path.isdir(outdir))
         self.assertTrue(os.path.exists(os.path.join(outdir, "BuildMain-VF.ttf")))
 
+    def test_varLib_main_jobs(self):
+        self.temp_dir()
+        outdir = os.path.join(self.tempdir, "jobs_test")
+        ds_path = os.path.join(self.tempdir, "BuildMain.designspace")
+        shutil.copy2(self.get_test_input("Build.designspace"), ds_path)
+        shutil.copytree(
+            self.get_test_input("master_ttx_interpolatable_ttf"),
+            os.path.join(outdir, "master_ttx"),
+        )
+        finder = "%s/jobs_test/master_ttx/{stem}.ttx" % self.tempdir
+        cmd = [ds_path, "--output-dir", outdir, "--master-finder", finder]
+
+        # -j always takes a number, 0 means the number of CPUs
+        with pytest.raises(SystemExit):
+            varLib_main(cmd + ["-j"])
+        varLib_main(cmd + ["-j", "0"])
+
+        self.assertTrue(os.path.exists(os.path.join(outdir, "BuildMain-VF.ttf")))
+
     def test_varLib_main_filter_variable_fonts(self):
         self.temp_dir()
         outdir = os.path.join(self.tempdir, "filter_variable_fonts_test")
@@ -1200,6 +1221,68 @@ Expected to see .ScriptCount==1, instead saw 0""",
             os.path.exists(os.path.join(self.tempdir, "..", "forbidden", "evil.ttf"))
         )
 
+    def test_varLib_build_many_shared_masters(self):
+        self.temp_dir()
+        ttx_dir = self.get_test_input("master_ttx_interpolatable_ttf")
+        ttf_dir = os.path.join(self.tempdir, "masters")
+        os.makedirs(ttf_dir)
+        for i in range(3):
+            path = os.path.join(ttx_dir, "TestFamily-Master%d.ttx" % i)
+            self.compile_font(path, ".ttf", ttf_dir)
+
+        ds_path = os.path.join(self.tempdir, "test.designspace")
+        with open(ds_path, "w", encoding="utf-8") as f:
+            f.write("""<?xml version='1.0' encoding='UTF-8'?>
+<designspace format="5.0">
+    <axes>
+        <axis tag="wght" name="Weight" minimum="0" maximum="1000" default="368"/>
+    </axes>
+    <sources>
+        <source filename="masters/TestFamily-Master0.ttf" name="Light">
+            <location><dimension name="Weight" xvalue="0"/></location>
+        </source>
+        <source filename="masters/TestFamily-Master1.ttf" name="Regular">
+            <location><dimension name="Weight" xvalue="368"/></location>
+        </source>
+        <source filename="masters/TestFamily-Master2.ttf" name="Bold">
+            <location><dimension name="Weight" xvalue="1000"/></location>
+        </source>
+    </sources>
+    <variable-fonts>
+        <variable-font name="TestFamily">
+            <axis-subsets>
+                <axis-subset name="Weight"/>
+            </axis-subsets>
+        </variable-font>
+        <variable-font name="TestFamilyLight">
+            <axis-subsets>
+                <axis-subset name="Weight" userminimum="0" userdefault="368" usermaximum="368"/>
+            </axis-subsets>
+        </variable-font>
+        <variable-font name="TestFamilyBold">
+            <axis-subsets>
+                <axis-subset name="Weight" userminimum="368" userdefault="368" usermaximum="1000"/>
+            </axis-subsets>
+        </variable-font>
+    </variable-fonts>
+</designspace>""")
+
+        # each master is opened only once, though shared by several VFs
+        with patch.object(varLib, "_open_font", wraps=varLib._open_font) as opener:
+            vfs = build_many(DesignSpaceDocument.fromfile(ds_path))
+        self.assertEqual(opener.call_count, 3)
+        self.assertEqual(list(vfs), ["TestFamily", "TestFamilyLight", "TestFamilyBold"])
+
+        # building them in parallel gives the same fonts, in the same order
+        parallel_vfs = build_many(DesignSpaceDocument.fromfile(ds_path), jobs=2)
+        self.assertEqual(list(parallel_vfs), list(vfs))
+        for name, vf in vfs.items():
+            vf = reload_font(vf)
+            tables = [tag for tag in vf.keys() if tag != "head"]
+            expected = self.temp_path(suffix=".ttx")
+            vf.saveXML(expected, tables=tables)
+            self.expect_ttx(parallel_vfs[name], expected, tables)
+
 
 def test_load_masters_layerName_without_required_font():
     ds = DesignSpaceDocument()
@@ -107,6 +107,21 @@ if with_cython is True or (with_cython is None and has_cython):
     ext_modules.append(
         Extension("fontTools.varLib.iup", ["Lib/fontTools/varLib/iup.py"]),
     )
+    ext_modules.append(
+        Extension(
+            "fontTools.misc.psCharStrings", ["Lib/fontTools/misc/psCharStrings.py"]
+        ),
+    )
+    ext_modules.append(
+        Extension(
+            "fontTools.cffLib.specializer", ["Lib/fontTools/cffLib/specializer.py"]
+        ),
+    )
+    ext_modules.append(
+        Extension(
+            "fontTools.ttLib.woff2Triplets", ["Lib/fontTools/ttLib/woff2Triplets.py"]
+        ),
+    )
     ext_modules.append(
         Extension("fontTools.feaLib.lexer", ["Lib/fontTools/feaLib/lexer.py"]),
     )